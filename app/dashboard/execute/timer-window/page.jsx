@@ -12,6 +12,8 @@ import { motion, AnimatePresence } from "framer-motion";
 import { FaInfoCircle, FaPause, FaStop, FaBell, FaSun, FaMoon, FaCheckCircle, FaQuoteLeft } from "react-icons/fa";
 
 const API_BASE_URL = (process.env.NEXT_PUBLIC_API_BASE_URL ?? "http://127.0.0.1:5000").replace(/\/$/, "");
+// Longer gaps between processed frames are pauses, breaks or outages, not tracked time
+const MAX_FRAME_GAP_SECONDS = 5;
 
 // Custom Background Component for Nudge Alert Card
 const TimerBackground = ({ mode }) => {
@@ -94,7 +96,9 @@ function TimerWindow() {
   const [currentFocusLevel, setCurrentFocusLevel] = useState(0);
   const [focusLog, setFocusLog] = useState([]);
   const [nudgeLog, setNudgeLog] = useState([]);
-  const last30Ref = useRef([]);
+  const focusSessionIdRef = useRef(`${Date.now()}-${Math.random().toString(36).slice(2, 10)}`);
+  const focusSocketRef = useRef(null);
+  const lastFrameTimeRef = useRef(null);
   const overrideMessageRef = useRef("");
   const overrideMessageTimeRef = useRef(0);
   const [focusSeconds, setFocusSeconds] = useState(0);
@@ -112,7 +116,6 @@ function TimerWindow() {
   const consecutiveFaceNotVisibleRef = useRef(0);
   const [currentMessageIndex, setCurrentMessageIndex] = useState(0);
   const [isFocusBarsHovered, setIsFocusBarsHovered] = useState(false);
-  const [isAbsentMode, setIsAbsentMode] = useState(false);
   const [currentQuoteIndex, setCurrentQuoteIndex] = useState(0);
 
   const staticMessages = [
@@ -189,15 +192,6 @@ function TimerWindow() {
     setMode((prev) => (prev === "night" ? "day" : "night"));
   };
 
-  const mapReasonToCategory = (reason) => {
-    if (!reason) return null;
-    if (reason === "Absent") return "Absent";
-    if (reason === "Phone") return "Phone";
-    if (reason === "Likely Distraction: Full face not visible") return "NotVisible";
-    if (reason === "Likely distraction: drowsy/lookingaway/badposture") return "Likely";
-    return null;
-  };
-
   const getDisplayMessage = () => {
     if (focusLog.length === 0) {
       return `⏳ Waiting for focus status...`;
@@ -229,12 +223,65 @@ function TimerWindow() {
   };
 
   const getLiveStatusMessage = () => {
-    if (last30Ref.current.length === 0) {
+    if (focusStatus === "Waiting...") {
       return `⏳ Waiting for live status...`;
     }
     return `${focusStatus} ${statusReason !== "-" ? `(${statusReason})` : ""}`;
   };
 
+  const handleFocusResponse = (data) => {
+    const { focusState, reason, focusLevel, override_message, window: windowSummary } = data;
+    console.log("API Response:", { focusState, reason, focusLevel, override_message });
+
+    if (!focusState || !["Focused", "Distracted"].includes(focusState)) {
+      console.warn("Invalid focusState received:", focusState);
+      return;
+    }
+
+    setFocusStatus(focusState);
+    setStatusReason(reason || "-");
+    setCurrentFocusLevel(focusLevel || 0);
+
+    if (override_message) {
+      overrideMessageRef.current = override_message;
+      overrideMessageTimeRef.current = Date.now();
+    }
+
+    // The server's L3 engine (backend/temporal.py) completes a window every 15 frames
+    if (windowSummary) applyWindowSummary(windowSummary);
+  };
+
+  // Persistent stream for webcam frames; falls back to per-frame POST when closed
+  useEffect(() => {
+    if (typeof WebSocket === "undefined") return;
+    const wsUrl = `${API_BASE_URL.replace(/^http/, "ws")}/deepwork_focus/stream?session_id=${encodeURIComponent(focusSessionIdRef.current)}`;
+    let socket;
+    try {
+      socket = new WebSocket(wsUrl);
+    } catch (err) {
+      console.warn("Focus stream unavailable, using HTTP:", err.message);
+      return;
+    }
+    socket.binaryType = "arraybuffer";
+    socket.onopen = () => {
+      focusSocketRef.current = socket;
+    };
+    socket.onmessage = (event) => {
+      try {
+        handleFocusResponse(JSON.parse(event.data));
+      } catch (err) {
+        console.error("❌ Stream message error:", err.message);
+      }
+    };
+    socket.onclose = () => {
+      if (focusSocketRef.current === socket) focusSocketRef.current = null;
+    };
+    return () => {
+      focusSocketRef.current = null;
+      socket.close();
+    };
+  }, []);
+
   const sendWebcamFrame = async () => {
     if (!webcamRef.current || isBreakTime || isPaused) return;
     const screenshot = webcamRef.current.getScreenshot();
@@ -244,158 +291,88 @@ function TimerWindow() {
     }
 
     const blob = await fetch(screenshot).then((res) => res.blob());
+
+    const socket = focusSocketRef.current;
+    if (socket && socket.readyState === WebSocket.OPEN) {
+      socket.send(blob);
+      return;
+    }
+
     const formData = new FormData();
     formData.append("image", blob, "webcam.jpg");
+    formData.append("session_id", focusSessionIdRef.current);
 
     try {
       const res = await axios.post(`${API_BASE_URL}/deepwork_focus`, formData, {
         headers: { "Content-Type": "multipart/form-data" },
       });
-
-      const { focusState, reason, focusLevel, override_message } = res.data;
-      console.log("API Response:", { focusState, reason, focusLevel, override_message });
-
-      if (!focusState || !["Focused", "Distracted"].includes(focusState)) {
-        console.warn("Invalid focusState received:", focusState);
-        return;
-      }
-
-      setFocusStatus(focusState);
-      setStatusReason(reason || "-");
-      setCurrentFocusLevel(focusLevel || 0);
-
-      if (override_message) {
-        overrideMessageRef.current = override_message;
-        overrideMessageTimeRef.current = Date.now();
-      }
-
-      last30Ref.current.push({
-        focusState,
-        reason: mapReasonToCategory(reason),
-        originalReason: reason || "-",
-        focusLevel: focusLevel || 0,
-        timestamp: new Date().toISOString(),
-      });
-
-      if (last30Ref.current.length > 15) last30Ref.current.shift();
+      handleFocusResponse(res.data);
     } catch (err) {
+      // A failed frame never reaches the server's L3 window, so it is not
+      // counted as distracted time (the browser-side windows used to log it
+      // as an "Inactive Focus Model" entry); it only shows as the live status
       console.error("❌ API Error:", err.message);
-      last30Ref.current.push({
-        focusState: "Distracted",
-        reason: "Inactive Focus Model",
-        originalReason: "Inactive Focus Model",
-        focusLevel: 0,
-        timestamp: new Date().toISOString(),
-      });
+      setFocusStatus("Distracted");
+      setStatusReason("Inactive Focus Model");
     }
   };
 
-  const summarize15Seconds = () => {
-    const window = last30Ref.current;
-    if (window.length < 15) return;
-
-    const focusCount = window.filter((x) => x.focusState === "Focused").length;
-    const phoneCount = window.filter((x) => x.reason === "Phone").length;
-    const absentCount = window.filter((x) => x.reason === "Absent").length;
-    const faceNotVisibleCount = window.filter((x) => x.reason === "NotVisible").length;
-    const likelyCount = window.filter((x) => x.reason === "Likely").length;
-
-    let focusState = "Focused";
-    let reason = null;
-    let finalFocusLevel = 10;
-    let isFaceNotVisibleTransition = false;
-
-    const isFaceNotVisibleFor45Seconds = focusLog.slice(-3).length >= 3 && focusLog.slice(-3).every(
-      (log) => log.reason === "Likely Distraction: Full face not visible"
-    );
-
-    if (phoneCount >= 3) {
-      focusState = "Distracted";
-      reason = "Phone";
-      finalFocusLevel = 2;
-      consecutiveFaceNotVisibleRef.current = 0;
-      setIsAbsentMode(false);
-    } else if (
-      isAbsentMode ||
-      (faceNotVisibleCount >= 6 && isFaceNotVisibleFor45Seconds) ||
-      absentCount >= 4
-    ) {
-      focusState = "Distracted";
-      reason = "Absent";
-      finalFocusLevel = 0;
-      consecutiveFaceNotVisibleRef.current = 0;
-      if (faceNotVisibleCount >= 6 && isFaceNotVisibleFor45Seconds) {
-        setIsAbsentMode(true);
-        isFaceNotVisibleTransition = true;
-      }
-    } else if (faceNotVisibleCount >= 6) {
-      focusState = "Distracted";
-      reason = "Likely Distraction: Full face not visible";
-      finalFocusLevel = 7;
-      consecutiveFaceNotVisibleRef.current += 1;
-    } else if (likelyCount >= 8) {
-      focusState = "Distracted";
-      reason = "Likely distraction: drowsy/lookingaway/badposture";
-      finalFocusLevel = 6;
-      consecutiveFaceNotVisibleRef.current = 0;
-      setIsAbsentMode(false);
-    } else {
-      consecutiveFaceNotVisibleRef.current = 0;
-      setIsAbsentMode(false);
+  // Wall time a window covers, from its per-frame server timestamps. The stream
+  // drops stale frames, so a window can span more seconds than it has frames.
+  const windowSeconds = (details) => {
+    let seconds = 0;
+    let previous = lastFrameTimeRef.current;
+    for (const { timestamp } of details) {
+      const time = Date.parse(timestamp);
+      seconds += previous === null ? 1 : Math.min(Math.max((time - previous) / 1000, 0), MAX_FRAME_GAP_SECONDS);
+      previous = time;
     }
+    lastFrameTimeRef.current = previous;
+    return Math.round(seconds);
+  };
+
+  const applyWindowSummary = (windowSummary) => {
+    const { focusState, reason, focusLevel, isFaceNotVisibleTransition, frames, focusCount, counts, details } = windowSummary;
+    const seconds = windowSeconds(details);
 
     if (focusState === "Focused") {
       consecutiveFocusedRef.current += 1;
       consecutiveLowFocusRef.current = 0;
-      consecutiveFaceNotVisibleRef.current = 0;
-      setIsAbsentMode(false);
     } else {
       consecutiveFocusedRef.current = 0;
       consecutiveLowFocusRef.current += 1;
     }
+    consecutiveFaceNotVisibleRef.current =
+      reason === "Likely Distraction: Full face not visible" ? consecutiveFaceNotVisibleRef.current + 1 : 0;
 
     const summary = {
-      timestamp: new Date().toISOString(),
+      timestamp: windowSummary.timestamp,
       focusState,
       reason,
-      focusLevel: finalFocusLevel,
+      focusLevel,
       isFaceNotVisibleTransition,
-      details: window.map(({ focusState, originalReason, focusLevel, timestamp }) => ({
-        focusState,
-        reason: originalReason || "-",
-        focusLevel,
-        timestamp,
-      })),
+      seconds,
+      details,
     };
 
-    console.log("Summarize 15s:", {
-      focusState,
-      reason,
-      focusLevel: finalFocusLevel,
-      focusCount,
-      phoneCount,
-      absentCount,
-      faceNotVisibleCount,
-      likelyCount,
-      isAbsentMode,
-      isFaceNotVisibleTransition,
-      detailsReasons: summary.details.map((d) => d.reason),
+    console.log("L3 window:", {
+      ...windowSummary,
+      detailsReasons: details.map((d) => d.reason),
       consecutiveFaceNotVisible: consecutiveFaceNotVisibleRef.current,
     });
 
     setFocusLog((prev) => [...prev, summary]);
-    last30Ref.current = [];
 
     setFinalStatus(focusState === "Focused" ? "FOCUSED ✅" : `DISTRACTED ❌ — ${isFaceNotVisibleTransition ? "Likely Distraction: Full face not visible" : reason || "-"}`);
     setFinalReason(isFaceNotVisibleTransition ? "Likely Distraction: Full face not visible" : reason || "-");
     setSummaryMsg(
-      `🧮 Last 15s → ${focusState} (${focusCount}/15 Focused) | Phone: ${phoneCount} | Absent: ${absentCount} | FaceNotVisible: ${faceNotVisibleCount} | Likely: ${likelyCount}`
+      `🧮 Last ${seconds}s → ${focusState} (${focusCount}/${frames} Focused) | Phone: ${counts.Phone} | Absent: ${counts.Absent} | FaceNotVisible: ${counts.NotVisible} | Likely: ${counts.Likely}`
     );
 
     if (focusState === "Focused") {
-      setFocusSeconds((prev) => prev + 15);
+      setFocusSeconds((prev) => prev + seconds);
     } else {
-      setDistractedSeconds((prev) => prev + 15);
+      setDistractedSeconds((prev) => prev + seconds);
     }
   };
 
@@ -417,13 +394,14 @@ function TimerWindow() {
   const handleSessionEnd = async (terminationReason = "Manual stop") => {
     setIsProcessing(true);
     stop();
-    if (last30Ref.current.length > 0) summarize15Seconds();
 
     const startTime = new Date();
     const focused = focusLog.filter((log) => log.focusState === "Focused").length;
     const distracted = focusLog.length - focused;
     const totalFocusLevel = focusLog.reduce((sum, log) => sum + (log.focusLevel || 0), 0);
     const averageFocusLevel = focusLog.length ? Math.round(totalFocusLevel / focusLog.length) : 0;
+    const windowSecondsWhere = (matches) =>
+      focusLog.filter(matches).reduce((sum, log) => sum + log.seconds, 0);
 
     const sessionSummary = {
       projectId: parseInt(projectId),
@@ -435,14 +413,13 @@ function TimerWindow() {
       focus_percentage: focusLog.length ? Math.round((focused / focusLog.length) * 100) : 0,
       average_focus_level: averageFocusLevel,
       distraction_breakdown: {
-        phone: focusLog.filter((log) => log.reason === "Phone").length * 15,
-        absent: focusLog.filter((log) => log.reason === "Absent").length * 15,
-        likely:
-          focusLog.filter(
-            (log) =>
-              log.reason === "Likely Distraction: Full face not visible" ||
-              log.reason === "Likely distraction: drowsy/lookingaway/badposture"
-          ).length * 15,
+        phone: windowSecondsWhere((log) => log.reason === "Phone"),
+        absent: windowSecondsWhere((log) => log.reason === "Absent"),
+        likely: windowSecondsWhere(
+          (log) =>
+            log.reason === "Likely Distraction: Full face not visible" ||
+            log.reason === "Likely distraction: drowsy/lookingaway/badposture"
+        ),
       },
       focus_trend: focusLog.map((log) => (log.focusState === "Focused" ? 100 : 0)),
       nudge_interactions: nudgeLog,
@@ -551,7 +528,6 @@ function TimerWindow() {
               return 0;
             }
           }
-          if ((prev - 1) % 15 === 0) summarize15Seconds();
           return prev - 1;
         });
       }
@@ -797,18 +773,8 @@ function TimerWindow() {
             <p className={`${mode === "night" ? "text-teal-300" : "text-teal-600"}`}>Focus Level: {currentFocusLevel}/10</p>
             <p className={`text-left ${mode === "night" ? "text-green-300" : "text-green-600"}`}>{summaryMsg}</p>
             <div className="flex gap-1 flex-wrap">
-              {last30Ref.current.map((log, idx) => {
-                console.log(`Live Status Log[${idx}]:`, {
-                  focusState: log.focusState,
-                  reason: log.reason,
-                  originalReason: log.originalReason,
-                  mappedReason: mapReasonToCategory(log.originalReason),
-                });
-                const isLikelyDistraction =
-                  log.reason === "NotVisible" ||
-                  log.reason === "Likely" ||
-                  log.originalReason?.includes("Likely Distraction") ||
-                  log.originalReason?.includes("drowsy/lookingaway/badposture");
+              {(focusLog[focusLog.length - 1]?.details || []).map((log, idx) => {
+                const isLikelyDistraction = /^Likely distraction/i.test(log.reason || "");
                 return (
                   <motion.div
                     key={idx}
@@ -828,7 +794,7 @@ function TimerWindow() {
                     <div
                       className={`absolute invisible group-hover:visible ${mode === "night" ? "bg-black/80 text-white" : "bg-gray-800 text-gray-100"} text-xs rounded px-2 py-1 -top-8 left-1/2 -translate-x-1/2 whitespace-nowrap shadow-lg border border-white/10 z-50`}
                     >
-                      {log.focusState === "Focused" ? "Focused" : `Distracted: ${log.originalReason}`}
+                      {log.focusState === "Focused" ? "Focused" : `Distracted: ${log.reason}`}
                     </div>
                   </motion.div>
                 );
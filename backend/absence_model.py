@@ -1,27 +1,38 @@
-
 import cv2
 import numpy as np
-from collections import deque
-import time
+import threading
+import config
+from face_presence import FaceTracker, detect_face, detect_face_legacy
+from frame_context import as_context
+from frame_ingest import decoded_area
 
-# Haar Cascade for Face Detection
-haar_cascade_frontal = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-haar_cascade_profile = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_profileface.xml')
 
-# Globals for motion detection and smoothing
-prev_gray = None
-absence_buffer = deque(maxlen=100)  # Store (state, timestamp) pairs
+class PresenceState:
+    """Per-session state for motion detection and face tracking."""
 
-def check_presence(frame):
-    global prev_gray, absence_buffer
-    
-    # Convert to grayscale
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.prev_gray = None
+        self.face_tracker = FaceTracker()
+
+    @property
+    def nbytes(self):
+        return self.prev_gray.nbytes if self.prev_gray is not None else 0
+
+
+# Fallback state for callers that do not track sessions
+_default_state = PresenceState()
+
+def check_presence(frame, state=None):
+    if state is None:
+        state = _default_state
+
+    # Grayscale (shared with the other stages when given a FrameContext)
+    gray = as_context(frame).gray
     
     # Initialize prev_gray if None (first frame)
-    if prev_gray is None:
-        prev_gray = gray.copy()
-        absence_buffer.append(("Present with Face", time.time()))
+    if state.prev_gray is None:
+        state.prev_gray = gray
         return "Present with Face", 0.95, None
     
     # 1. Frame Variance
@@ -33,18 +44,19 @@ def check_presence(frame):
     intensity_absent = mean_intensity < 10
     
     # 3. Motion Detection
-    frame_diff = cv2.absdiff(gray, prev_gray)
+    frame_diff = cv2.absdiff(gray, state.prev_gray)
     thresh = cv2.threshold(frame_diff, 25, 255, cv2.THRESH_BINARY)[1]
     motion_pixels = np.sum(thresh) / 255
-    motion_absent = motion_pixels < 1000
+    motion_absent = motion_pixels < decoded_area(1000)  # 1000 px at full resolution
     
-    # 4. Haar Cascade Face Detection
-    frontal_faces = haar_cascade_frontal.detectMultiScale(gray, scaleFactor=1.03, minNeighbors=3, minSize=(30, 30))
-    profile_faces = haar_cascade_profile.detectMultiScale(gray, scaleFactor=1.03, minNeighbors=3, minSize=(30, 30))
-    faces_detected = len(frontal_faces) > 0 or len(profile_faces) > 0
+    # 4. Haar Cascade Face Detection (downscaled + ROI tracking, see face_presence.py)
+    if config.FAST_FACE_DETECTION:
+        faces_detected = detect_face(gray, state.face_tracker)
+    else:
+        faces_detected = detect_face_legacy(gray)
     
-    # Update prev_gray
-    prev_gray = gray.copy()
+    # Update prev_gray (views are never modified in place, no copy needed)
+    state.prev_gray = gray
     
     # Determine current state
     if variance_absent or intensity_absent or (motion_absent and not faces_detected):
@@ -64,16 +76,13 @@ def check_presence(frame):
         current_conf = 0.99
         current_reason = None
     
-    # Add to absence buffer
-    absence_buffer.append((current_state, time.time()))
-    
-    # Clear buffer if non-Absent to reset smoothing
-    if current_state != "Absent":
-        absence_buffer.clear()
-        absence_buffer.append((current_state, time.time()))
-    
+    # Temporal smoothing happens once, in the L3 engine (temporal.py)
     return current_state, current_conf, current_reason
 
+def replay_presence(frame, state):
+    """Result cache hit: keep the motion reference on the newest frame without running the checks."""
+    state.prev_gray = as_context(frame).gray
+
 # import cv2
 # import numpy as np
 # from collections import deque
@@ -8,32 +8,33 @@ Project: DeepWork AI
 Architecture:
     L1: YOLOv11n-cls primary classifier (6 classes)
     L2: Auxiliary validation (absence, phone, gaze)
-    L3: Temporal heuristics (handled in frontend)
+    L3: Temporal aggregation (temporal.py; summaries in the 'window' field)
     L4: Response/nudging (handled in frontend)
 """
 
-from flask import Flask, request, jsonify
+import time
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-import cv2
-import numpy as np
-from PIL import Image
-import io
-from ultralytics import YOLO
-import mediapipe as mp
-from absence_model import check_presence
-from cellphone_model import check_cellphone
+import config
+import metrics
+from frame_context import as_context
+from frame_ingest import read_request_frame
+import model_registry
+from model_registry import get_phone_detector, get_face_mesh, inference_lock
+from pipeline import process_frame, classifier_batcher, stage_executor, cascade_report
+from result_cache import cache_stats
+from session_store import sessions
+from streaming import register_streaming
 
 # === Flask App Setup ===
 app = Flask(__name__)
 CORS(app)
+register_streaming(app)  # WebSocket: /deepwork_focus/stream
 
-# === Load Models ===
-classifier = YOLO("best.pt")       # L1: YOLOv11n-cls (primary classifier)
-phone_detector = YOLO("yolov8n.pt") # L2: YOLOv8n (phone validation backup)
-
-# === MediaPipe Setup (L2: Gaze Tracking) ===
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(refine_landmarks=True)
+# === Models ===
+# Loaded lazily and shared with the L2 modules through model_registry:
+#   L1: YOLOv11n-cls (primary classifier)
+#   L2: YOLOv8n (phone validation), MediaPipe FaceMesh (gaze), Hands
 
 
 # =============================================================================
@@ -51,7 +52,8 @@ def detect_phone_yolov8(frame, conf_thres=0.25):
     Returns:
         tuple: (phone_detected: bool, max_confidence: float)
     """
-    result = phone_detector(frame)[0]
+    with inference_lock("phone_detector"):
+        result = get_phone_detector()(frame)[0]
     max_conf = 0.0
     for box in result.boxes:
         if int(box.cls[0]) == 67:  # COCO class 67 = 'cell phone'
@@ -65,13 +67,13 @@ def gaze_is_away(image):
     Uses MediaPipe Face Mesh iris tracking.
     
     Args:
-        image: Input image (numpy array, BGR format)
+        image: Input image (numpy array, BGR format) or FrameContext
     
     Returns:
         bool: True if gaze is away (iris position outside 0.35-0.65 range)
     """
-    rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    results = face_mesh.process(rgb)
+    with inference_lock("face_mesh"):
+        results = get_face_mesh().process(as_context(image).rgb)
     
     if results.multi_face_landmarks:
         for face in results.multi_face_landmarks:
@@ -90,25 +92,18 @@ def gaze_is_away(image):
     return False
 
 
-def get_focus_level(class_name):
+def get_session_id():
     """
-    Map classification result to focus level (0-10 scale).
+    Resolve the webcam session a request belongs to.
     
-    Focus Levels:
-        10 = Fully focused
-        8-9 = Minor issues (bad posture)
-        5-6 = Likely distracted (drowsy, looking away)
-        0-2 = Confirmed distracted (absent, phone)
+    Clients tag frames with a 'session_id' form field or an 'X-Session-Id'
+    header. Untagged requests share the default session.
     """
-    focus_levels = {
-        "Focused": 10,
-        "BadPosture": 8,
-        "LookingAway": 6,
-        "Drowsy": 6,
-        "Absent": 0,
-        "Phone": 2
-    }
-    return focus_levels.get(class_name, 5)
+    return (
+        request.form.get('session_id')
+        or request.headers.get('X-Session-Id')
+        or config.DEFAULT_SESSION_ID
+    )
 
 
 # =============================================================================
@@ -121,7 +116,9 @@ def deepwork_focus():
     DLEF Main Endpoint: Classify attention state from webcam frame.
     
     Request:
-        POST with 'image' file (JPEG/PNG)
+        POST with 'image' file (JPEG/PNG) and optional 'session_id' field,
+        or a raw application/octet-stream / image/jpeg body with the session
+        in the 'X-Session-Id' header
     
     Response:
         {
@@ -130,117 +127,76 @@ def deepwork_focus():
             "confidence": 0.0-1.0,
             "focusLevel": 0-10
         }
+        400 with {"error": ...} when the image is empty or cannot be decoded
     
-    Processing Order (DLEF Layers):
+    Processing Order (DLEF Layers, see pipeline.py):
         1. L2a: Absence check (highest priority)
         2. L2b: Phone check (critical distraction)
         3. L1: YOLOv11n-cls classification
         4. Return result with focus level
+        L2a and L1 run concurrently, L2b once L2a has not decided;
+        results are merged in this order.
     """
+    started = time.perf_counter()
+    try:
+        # === Decode Frame (BGR, see frame_ingest.py) ===
+        with metrics.timed("decode"):
+            frame = read_request_frame(request)
+    except ValueError as e:
+        # Empty or undecodable payload: the client's fault, not the server's
+        metrics.record_error("http", e)
+        return jsonify({"error": str(e)}), 400
+
     try:
-        # === Load Image from POST Request ===
-        image_file = request.files['image']
-        image_bytes = image_file.read()
-        pil_image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
-        frame = np.array(pil_image)
-
-        # =================================================================
-        # L2a: ABSENCE CHECK (Priority 1 - Critical)
-        # =================================================================
-        presence_state, presence_conf, presence_reason = check_presence(frame)
-        
-        if presence_state == "Absent":
-            return jsonify({
-                "focusState": "Distracted",
-                "reason": "Absent",
-                "confidence": round(presence_conf, 2),
-                "focusLevel": 0
-            })
-        
-        if presence_state == "Present without Face":
-            return jsonify({
-                "focusState": "Distracted",
-                "reason": "Likely Distraction: Full face not visible",
-                "confidence": round(presence_conf, 2),
-                "focusLevel": 5
-            })
-
-        # =================================================================
-        # L2b: PHONE CHECK (Priority 2 - Critical)
-        # =================================================================
-        cellphone_state, cellphone_conf = check_cellphone(frame)
-        
-        if cellphone_state == "Cellphone Present":
-            return jsonify({
-                "focusState": "Distracted",
-                "reason": "Phone",
-                "confidence": round(cellphone_conf, 2),
-                "focusLevel": 2
-            })
-
-        # =================================================================
-        # L1: PRIMARY CLASSIFICATION (YOLOv11n-cls)
-        # =================================================================
-        results = classifier(frame)
-        probs = results[0].probs
-        class_id = probs.top1
-        confidence = float(probs.top1conf)
-        class_name = classifier.names[class_id]
-
-        # =================================================================
-        # DETERMINE FOCUS STATE BASED ON CLASSIFICATION
-        # =================================================================
-        if class_name == "Focused":
-            return jsonify({
-                "focusState": "Focused",
-                "reason": None,
-                "confidence": round(confidence, 2),
-                "focusLevel": 10
-            })
-        
-        if class_name == "BadPosture":
-            return jsonify({
-                "focusState": "Focused",  # Not a critical distraction
-                "reason": None,
-                "confidence": round(confidence, 2),
-                "focusLevel": 8
-            })
-        
-        if class_name in ["Drowsy", "LookingAway"]:
-            return jsonify({
-                "focusState": "Distracted",
-                "reason": "Likely distraction: drowsy/looking away",
-                "confidence": round(confidence, 2),
-                "focusLevel": 6
-            })
-        
-        if class_name == "Absent":
-            return jsonify({
-                "focusState": "Distracted",
-                "reason": "Likely Distraction: Full face not visible",
-                "confidence": round(confidence, 2),
-                "focusLevel": 5
-            })
-        
-        if class_name == "Phone":
-            return jsonify({
-                "focusState": "Distracted",
-                "reason": "Phone",
-                "confidence": round(confidence, 2),
-                "focusLevel": 2
-            })
-
-        # === Default fallback ===
-        return jsonify({
-            "focusState": "Focused",
-            "reason": None,
-            "confidence": round(confidence, 2),
-            "focusLevel": get_focus_level(class_name)
-        })
+        session = sessions.get(get_session_id())
+        with session.lock:
+            result = process_frame(frame, session)
 
     except Exception as e:
+        metrics.record_error("http", e)
         return jsonify({"error": str(e)}), 500
 
+    metrics.record_decision(result)
+    metrics.update_gauges(len(sessions), classifier_batcher.queue_depth, cache_stats.hit_rate)
+    metrics.observe_request("http", time.perf_counter() - started)
+    return jsonify(result)
+
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    """Runtime statistics: sessions, batching, stages, cache and models."""
+    return jsonify({
+        "sessions": sessions.stats(),
+        "classifierBatching": dict(classifier_batcher.stats(), enabled=config.CLASSIFIER_BATCHING),
+        "stages": dict(stage_executor.stats(), parallel=config.PARALLEL_STAGES),
+        "cascade": cascade_report(),
+        "resultCache": cache_stats.report(),
+        "models": model_registry.memory_report(),
+    })
+
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the worker is up and serving requests."""
+    return jsonify({"status": "ok"})
+
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: the models this worker needs are loaded and warmed up."""
+    ready = model_registry.is_ready(config.WARMUP_MODELS)
+    return jsonify({"ready": ready}), 200 if ready else 503
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint (see metrics.py)."""
+    body, content_type = metrics.render()
+    if body is None:
+        return Response("metrics disabled (DLEF_METRICS=0 or prometheus_client missing)\n",
+                        status=501, mimetype="text/plain")
+    return Response(body, mimetype=content_type)
+
 
 # =============================================================================
 # RUN SERVER
@@ -251,6 +207,7 @@ if __name__ == '__main__':
     print("DLEF - DeepLens Engine for Focus")
     print("DeepWork AI Backend Server")
     print("=" * 50)
+    model_registry.warm_up(config.WARMUP_MODELS)
     app.run(debug=True, port=5000)
     
                                                 #Old........
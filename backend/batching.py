@@ -0,0 +1,147 @@
+"""
+DLEF - DeepLens Engine for Focus
+Cross-Request Micro-Batching
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Each /deepwork_focus request classifies a single frame. Under load, running
+the classifier with batch size 1 spends most of the CPU on per-call overhead.
+The MicroBatcher collects frames submitted by concurrent requests for a short
+window (or until the batch is full), runs one batched forward pass and hands
+every result back to the request that is waiting for it.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Batch single-item calls from many threads into one batched call.
+
+    Args:
+        predict_fn: Callable taking a list of items and returning a list of
+            results in the same order
+        max_batch_size (int): Upper bound on items per forward pass
+        max_wait_ms (float): How long the first item of a batch may wait for
+            company before the batch is flushed
+        name (str): Name of the worker thread
+    """
+
+    def __init__(self, predict_fn, max_batch_size=8, max_wait_ms=10.0, name="micro-batcher"):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.batch_size_counts = [0] * (self.max_batch_size + 1)
+        self.total_queue_wait = 0.0
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def submit(self, item):
+        """Queue one item; returns a Future resolved with its result."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future, time.monotonic()))
+        return future
+
+    def __call__(self, item, timeout=None):
+        """Submit one item and block until its result is ready."""
+        return self.submit(item).result(timeout=timeout)
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def reset_stats(self):
+        """Forget the batches counted so far (e.g. warm-up batches)."""
+        with self._stats_lock:
+            self.batches = 0
+            self.items = 0
+            self.errors = 0
+            self.batch_size_counts = [0] * (self.max_batch_size + 1)
+            self.total_queue_wait = 0.0
+
+    def stats(self):
+        """Snapshot of achieved batch sizes and queueing delay."""
+        with self._stats_lock:
+            batches, items = self.batches, self.items
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": batches,
+                "items": items,
+                "errors": self.errors,
+                "mean_batch_size": (items / batches) if batches else 0.0,
+                "batch_size_histogram": {
+                    size: count for size, count in enumerate(self.batch_size_counts) if count
+                },
+                "mean_queue_wait_ms": (self.total_queue_wait / items * 1000.0) if items else 0.0,
+                "queue_depth": self.queue_depth,
+            }
+
+    # =========================================================================
+    # WORKER
+    # =========================================================================
+
+    def _ensure_worker(self):
+        # Started lazily so that forked server workers each get their own thread.
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.monotonic()
+            batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                results = self.predict_fn([item for item, _, _ in batch])
+            except Exception as e:
+                with self._stats_lock:
+                    self.errors += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            with self._stats_lock:
+                self.batches += 1
+                self.items += len(batch)
+                self.batch_size_counts[len(batch)] += 1
+                self.total_queue_wait += sum(started - queued for _, _, queued in batch)
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
@@ -1,30 +1,67 @@
+import threading
+import weakref
 import cv2
 import numpy as np
-from ultralytics import YOLO
-import mediapipe as mp
-from filterpy.kalman import KalmanFilter
-
-# Initialize models
-model = YOLO("yolov8n.pt")
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(max_num_hands=2, min_detection_confidence=0.5)
-kf = KalmanFilter(dim_x=4, dim_z=2)
-kf.x = np.array([0, 0, 0, 0], dtype=float)  # [x, y, vx, vy]
-kf.F = np.array([[1, 0, 1, 0], [0, 1, 0, 1], [0, 0, 1, 0], [0, 0, 0, 1]])
-kf.H = np.array([[1, 0, 0, 0], [0, 1, 0, 0]])
-kf.P *= 1000
-kf.R = np.array([[5, 0], [0, 5]])
-kf.Q = np.eye(4) * 0.1
-
-# Globals
-prev_bbox = None
-prev_gray = None
-state_history = []
-
-def get_hand_bbox(landmarks, shape):
-    x_coords = [lm.x * shape[1] for lm in landmarks.landmark]
-    y_coords = [lm.y * shape[0] for lm in landmarks.landmark]
-    return [min(x_coords), min(y_coords), max(x_coords), max(y_coords)]
+import config
+from frame_context import as_context
+from frame_ingest import decoded_area, decoded_length
+from kalman_tracker import phone_tracker
+from model_registry import get_phone_detector, get_hands, inference_lock
+from temporal import RingBuffer
+
+# Vote codes for the per-frame majority vote
+_VOTE_ABSENT = 0
+_VOTE_PRESENT = 1
+
+
+class PhoneState:
+    """Per-session state for phone tracking and vote smoothing."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.initialized = False  # First frame of a session is only used to warm up
+        self.prev_bbox = None
+        self.votes = RingBuffer(config.PHONE_VOTE_WINDOW, 2)
+        self.last_vote = None  # Vote of the last checked frame, replayed on result cache hits
+        # Kalman track slot in the shared bank, released when the state is collected
+        self.track = phone_tracker.add()
+        weakref.finalize(self, phone_tracker.remove, self.track)
+        # Hand boxes from the last Hands run, reused while the phone box holds still
+        self.hand_boxes = None
+        self.hand_phone_bbox = None
+        self.hand_reuse = 0
+
+    def reset_hands(self):
+        self.hand_boxes = None
+        self.hand_phone_bbox = None
+        self.hand_reuse = 0
+
+    @property
+    def nbytes(self):
+        return phone_tracker.slot_nbytes
+
+
+# Fallback state for callers that do not track sessions
+_default_state = PhoneState()
+
+def _landmark_points(hands):
+    """Normalized (x, y) of every landmark of every hand, as one (hands, landmarks, 2) array."""
+    count = sum(len(hand.landmark) for hand in hands)
+    coords = np.fromiter(
+        (c for hand in hands for lm in hand.landmark for c in (lm.x, lm.y)), dtype=float, count=2 * count,
+    )
+    return coords.reshape(len(hands), -1, 2)
+
+def hand_landmark_boxes(hands, shape, offset=(0, 0)):
+    """(n, 4) hand boxes in pixels; landmarks are normalized to an image of `shape` at `offset`."""
+    if not hands:
+        return np.empty((0, 4))
+    points = _landmark_points(hands) * (shape[1], shape[0]) + offset
+    return np.concatenate([points.min(axis=1), points.max(axis=1)], axis=1)
+
+def get_hand_bbox(landmarks, shape, offset=(0, 0)):
+    """Hand box [x0, y0, x1, y1] in pixels; landmarks are normalized to an image of `shape` at `offset`."""
+    return hand_landmark_boxes([landmarks], shape, offset)[0]
 
 def iou(box1, box2):
     x1, y1, x2, y2 = box1
@@ -36,33 +73,89 @@ def iou(box1, box2):
     box2_area = (x2_b - x1_b) * (y2_b - y1_b)
     return inter_area / (box1_area + box2_area - inter_area) if (box1_area + box2_area - inter_area) > 0 else 0
 
-def is_phone_in_hand(frame, bbox):
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
-    if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
-            hand_box = get_hand_bbox(hand_landmarks, frame.shape)
-            if iou(bbox, hand_box) > 0.3:
-                return True
-    return False
+def box_iou(box, boxes):
+    """IoU of one box against each row of an (n, 4) array of boxes."""
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    x0 = np.maximum(box[0], boxes[:, 0])
+    y0 = np.maximum(box[1], boxes[:, 1])
+    x1 = np.minimum(box[2], boxes[:, 2])
+    y1 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    union = (box[2] - box[0]) * (box[3] - box[1]) + (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]) - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
 
-def check_cellphone(frame):
-    global prev_bbox, prev_gray, state_history
+def _hand_roi(bbox, shape, padding):
+    """Crop around the phone box, grown by `padding` box sizes per side and clipped to the frame."""
+    x0, y0, x1, y1 = (int(v) for v in bbox)
+    pad_x, pad_y = int((x1 - x0) * padding), int((y1 - y0) * padding)
+    return max(0, x0 - pad_x), max(0, y0 - pad_y), min(shape[1], x1 + pad_x), min(shape[0], y1 + pad_y)
+
+def find_hand_boxes(frame, bbox):
+    """
+    Run MediaPipe Hands near the phone box.
+
+    With PHONE_HAND_ROI only a padded crop around the box is converted and
+    processed; a hand that holds the phone overlaps the box, so hands
+    outside the crop could never pass the IoU test anyway. The crop moves
+    and changes size from call to call, which is only safe because the
+    shared Hands graph runs in static image mode (see model_registry.py):
+    tracking priors from the previous crop would be in other coordinates.
+
+    Returns:
+        np.ndarray: (n, 4) hand boxes in full-frame pixels
+    """
+    ctx = as_context(frame)
+    if config.PHONE_HAND_ROI:
+        x0, y0, x1, y1 = _hand_roi(bbox, ctx.shape, config.PHONE_HAND_ROI_PADDING)
+        if x1 <= x0 or y1 <= y0:
+            return np.empty((0, 4))
+        rgb = cv2.cvtColor(ctx.bgr[y0:y1, x0:x1], cv2.COLOR_BGR2RGB)
+        offset = (x0, y0)
+    else:
+        rgb = ctx.rgb
+        offset = (0, 0)
+    with inference_lock("hands"):
+        results = get_hands().process(rgb)
+    return hand_landmark_boxes(results.multi_hand_landmarks or [], rgb.shape, offset)
+
+def is_phone_in_hand(frame, bbox, state=None):
+    # Reuse the last hand boxes while the phone box barely moved since they were found
+    reuse = (
+        state is not None
+        and state.hand_boxes is not None
+        and state.hand_reuse < config.PHONE_HAND_MAX_REUSE
+        and iou(state.hand_phone_bbox, bbox) >= config.PHONE_HAND_REUSE_IOU
+    )
+    if reuse:
+        hand_boxes = state.hand_boxes
+        state.hand_reuse += 1
+    else:
+        hand_boxes = find_hand_boxes(frame, bbox)
+        if state is not None:
+            state.hand_boxes, state.hand_phone_bbox, state.hand_reuse = hand_boxes, bbox, 0
+    return bool((box_iou(bbox, hand_boxes) > 0.3).any())
+
+def check_cellphone(frame, state=None):
+    if state is None:
+        state = _default_state
+    votes = state.votes
     
     # Input validation
-    if frame is None or frame.size == 0:
+    if frame is None:
+        return "Cellphone Absent", 0.99
+    ctx = as_context(frame)
+    frame = ctx.bgr
+    if frame.size == 0:
         return "Cellphone Absent", 0.99
     
-    # Convert to grayscale
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    
-    # Initialize prev_gray
-    if prev_gray is None:
-        prev_gray = gray.copy()
+    # Skip the first frame of a session
+    if not state.initialized:
+        state.initialized = True
         return "Cellphone Absent", 0.99
     
     # 1. YOLOv8n Cellphone Detection
-    results = model(frame, verbose=False)
+    with inference_lock("phone_detector"):
+        results = get_phone_detector()(frame, verbose=False)
     boxes = results[0].boxes
     yolo_cellphone = False
     yolo_conf = 0.0
@@ -73,14 +166,14 @@ def check_cellphone(frame):
         yolo_cellphone = True
     
     if not yolo_cellphone:
-        prev_gray = gray.copy()
-        prev_bbox = None
-        state_history.append("Cellphone Absent")
-        if len(state_history) > 5:
-            state_history.pop(0)
+        state.prev_bbox = None
+        state.reset_hands()
+        state.last_vote = _VOTE_ABSENT
+        votes.push(_VOTE_ABSENT)
         return "Cellphone Absent", 0.99
     
     # 2. Edge Detection
+    gray = ctx.gray
     edges = cv2.Canny(gray, 100, 200)
     contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     rectangle_detected = False
@@ -94,7 +187,7 @@ def check_cellphone(frame):
                     rectangle_detected = True
                     break
     
-    # 3. Color Histogram
+    # 3. Color Histogram (HSV of the phone box only, not a full-frame view)
     roi = frame[current_bbox[1]:current_bbox[3], current_bbox[0]:current_bbox[2]] if current_bbox is not None else frame
     hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
     hist = cv2.calcHist([hsv], [2], None, [256], [0, 256])
@@ -102,38 +195,48 @@ def check_cellphone(frame):
     glow_detected = np.sum(hist[200:]) > (0.01 * roi_area)
     hist_hue = cv2.calcHist([hsv], [0], None, [180], [0, 180])
     hist_sat = cv2.calcHist([hsv], [1], None, [256], [0, 256])
-    colorful_screen = np.sum(hist_hue[0:30]) > 500 and np.sum(hist_sat[100:]) > 1000
+    colorful_screen = np.sum(hist_hue[0:30]) > decoded_area(500) and np.sum(hist_sat[100:]) > decoded_area(1000)
     glow_detected = glow_detected or colorful_screen
     
     # 4. Hand Detection
-    in_hand = is_phone_in_hand(frame, current_bbox)
+    in_hand = is_phone_in_hand(ctx, current_bbox, state)
     
     # 5. Motion Consistency
     motion_consistent = False
-    if prev_bbox is None:
-        kf.x[:2] = [(current_bbox[0] + current_bbox[2]) / 2, (current_bbox[1] + current_bbox[3]) / 2]
+    if state.prev_bbox is None:
+        phone_tracker.set_position(state.track, [(current_bbox[0] + current_bbox[2]) / 2, (current_bbox[1] + current_bbox[3]) / 2])
         motion_consistent = True
     else:
-        kf.predict()
         curr_center = np.array([(current_bbox[0] + current_bbox[2]) / 2, (current_bbox[1] + current_bbox[3]) / 2])
-        kf.update(curr_center)
-        predicted_center = kf.x[:2]
+        predicted_center = phone_tracker.step(state.track, curr_center)
         distance = np.linalg.norm(predicted_center - curr_center)
-        motion_consistent = distance < 50
+        motion_consistent = distance < decoded_length(50)
     
-    # Update globals
-    prev_gray = gray.copy()
-    prev_bbox = current_bbox
+    # Update session state
+    state.prev_bbox = current_bbox
     
     # Decision Logic
-    state = "Cellphone Present" if yolo_cellphone and in_hand and (rectangle_detected or glow_detected) and motion_consistent else "Cellphone Absent"
-    state_history.append(state)
-    if len(state_history) > 5:
-        state_history.pop(0)
-    final_state = max(set(state_history), key=state_history.count)
+    frame_state = "Cellphone Present" if yolo_cellphone and in_hand and (rectangle_detected or glow_detected) and motion_consistent else "Cellphone Absent"
+    state.last_vote = _VOTE_PRESENT if frame_state == "Cellphone Present" else _VOTE_ABSENT
+    votes.push(state.last_vote)
+    # Majority of the last frames; ties (short history) resolve to absent
+    final_state = "Cellphone Present" if votes.count(_VOTE_PRESENT) > votes.count(_VOTE_ABSENT) else "Cellphone Absent"
     conf = max(0.95, yolo_conf) if final_state == "Cellphone Present" else 0.99
     
     return final_state, conf
+
+def replay_cellphone(state):
+    """
+    Repeat the state updates of the last check for a frame the result cache
+    found identical to it: the Kalman track takes the same measurement and
+    the frame's vote joins the majority window again. No model runs.
+    """
+    if state.last_vote is None:
+        return
+    if state.prev_bbox is not None:
+        bbox = state.prev_bbox
+        phone_tracker.step(state.track, [(bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2])
+    state.votes.push(state.last_vote)
 # Example usage
 
 import numpy as np
@@ -0,0 +1,158 @@
+"""
+DLEF - DeepLens Engine for Focus
+Runtime Configuration
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Every tunable of the backend lives here so that deployments can adjust the
+engine without touching code. Each value can be overridden with an
+environment variable of the same name (prefixed with DLEF_).
+"""
+
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# =============================================================================
+# MODEL WEIGHTS
+# =============================================================================
+
+CLASSIFIER_WEIGHTS = os.environ.get("DLEF_CLASSIFIER_WEIGHTS", os.path.join(BACKEND_DIR, "best.pt"))
+PHONE_DETECTOR_WEIGHTS = os.environ.get("DLEF_PHONE_DETECTOR_WEIGHTS", os.path.join(BACKEND_DIR, "yolov8n.pt"))
+CLASSIFIER_ONNX_WEIGHTS = os.environ.get("DLEF_CLASSIFIER_ONNX_WEIGHTS", os.path.join(BACKEND_DIR, "best.onnx"))
+
+
+# =============================================================================
+# L1 INFERENCE BACKEND
+# =============================================================================
+
+CLASSIFIER_BACKEND = os.environ.get("DLEF_CLASSIFIER_BACKEND", "torch")  # "torch" or "onnx"
+ONNX_INTRA_OP_THREADS = _env_int("DLEF_ONNX_INTRA_OP_THREADS", 0)        # 0 = one per core
+
+
+# =============================================================================
+# SESSION STORE
+# =============================================================================
+
+SESSION_MAX = _env_int("DLEF_SESSION_MAX", 1024)                 # LRU capacity
+SESSION_TTL_SECONDS = _env_float("DLEF_SESSION_TTL_SECONDS", 900.0)  # Idle expiry
+DEFAULT_SESSION_ID = "default"                                   # Used when request has no id
+
+
+# =============================================================================
+# L1 CLASSIFIER MICRO-BATCHING
+# =============================================================================
+
+CLASSIFIER_BATCHING = _env_bool("DLEF_CLASSIFIER_BATCHING", True)
+CLASSIFIER_MAX_BATCH = _env_int("DLEF_CLASSIFIER_MAX_BATCH", 8)        # Frames per forward pass
+CLASSIFIER_MAX_WAIT_MS = _env_float("DLEF_CLASSIFIER_MAX_WAIT_MS", 10.0)  # Batching window
+
+
+# =============================================================================
+# STAGE EXECUTION
+# =============================================================================
+
+PARALLEL_STAGES = _env_bool("DLEF_PARALLEL_STAGES", True)  # Run L1 concurrently with L2 (L2b after L2a)
+STAGE_WORKERS = _env_int("DLEF_STAGE_WORKERS", 12)         # Shared stage thread pool size
+
+
+# =============================================================================
+# CONFIDENCE-GATED CASCADE
+# =============================================================================
+# In cascade mode the L1 classifier runs first and an L2 validator is only
+# invoked when L1 is uncertain or predicts a class that validator checks.
+
+def _env_set(name, default):
+    value = os.environ.get(name)
+    items = default if value in (None, "") else value.split(",")
+    return frozenset(item.strip() for item in items if item.strip())
+
+
+CASCADE_MODE = _env_bool("DLEF_CASCADE", False)
+CASCADE_CONFIDENCE = _env_float("DLEF_CASCADE_CONFIDENCE", 0.90)    # L1 top-1 needed to skip
+CASCADE_SKIPPABLE = _env_set("DLEF_CASCADE_SKIPPABLE", ["phone"])   # Validators that may be skipped
+CASCADE_PHONE_CLASSES = _env_set("DLEF_CASCADE_PHONE_CLASSES", ["Phone"])
+CASCADE_PRESENCE_CLASSES = _env_set("DLEF_CASCADE_PRESENCE_CLASSES", ["Absent"])
+
+
+# =============================================================================
+# FACE PRESENCE (L2a)
+# =============================================================================
+
+FAST_FACE_DETECTION = _env_bool("DLEF_FAST_FACE_DETECTION", True)
+FACE_DETECT_WIDTH = _env_int("DLEF_FACE_DETECT_WIDTH", 640)          # Detection image width (px)
+FACE_SCALE_FACTOR = _env_float("DLEF_FACE_SCALE_FACTOR", 1.05)       # Haar pyramid step (legacy: 1.03)
+FACE_MIN_NEIGHBORS = _env_int("DLEF_FACE_MIN_NEIGHBORS", 3)
+FACE_MIN_SIZE = _env_int("DLEF_FACE_MIN_SIZE", 30)                   # Full-resolution px
+FACE_ROI_PADDING = _env_float("DLEF_FACE_ROI_PADDING", 0.5)          # ROI growth per side
+FACE_REDETECT_INTERVAL = _env_int("DLEF_FACE_REDETECT_INTERVAL", 10)  # Frames between full scans
+
+
+# =============================================================================
+# PHONE-IN-HAND CHECK (L2b)
+# =============================================================================
+
+PHONE_HAND_ROI = _env_bool("DLEF_PHONE_HAND_ROI", True)                # Run Hands on a crop around the phone
+PHONE_HAND_ROI_PADDING = _env_float("DLEF_PHONE_HAND_ROI_PADDING", 1.0)  # Crop growth per side, in box sizes
+PHONE_HAND_REUSE_IOU = _env_float("DLEF_PHONE_HAND_REUSE_IOU", 0.9)    # Phone box overlap to reuse hand boxes
+PHONE_HAND_MAX_REUSE = _env_int("DLEF_PHONE_HAND_MAX_REUSE", 4)        # Re-run Hands after K reuses
+
+
+# =============================================================================
+# TEMPORAL RESULT CACHE
+# =============================================================================
+
+RESULT_CACHE = _env_bool("DLEF_RESULT_CACHE", True)
+CACHE_MAX_DISTANCE = _env_float("DLEF_CACHE_MAX_DISTANCE", 3.0)  # Mean abs diff of 32x24 thumbnails
+CACHE_MAX_REUSE = _env_int("DLEF_CACHE_MAX_REUSE", 4)            # Force a full run after K reuses
+
+
+# =============================================================================
+# FRAME INGESTION
+# =============================================================================
+
+DECODE_REDUCE_FACTOR = _env_int("DLEF_DECODE_REDUCE_FACTOR", 1)  # 1, 2, 4 or 8 (JPEG DCT scaling)
+
+
+# =============================================================================
+# L3 TEMPORAL AGGREGATION
+# =============================================================================
+
+L3_ENABLED = _env_bool("DLEF_L3_ENABLED", True)
+L3_WINDOW = _env_int("DLEF_L3_WINDOW", 15)       # Frames per summary window (1 fps -> 15 s)
+PHONE_VOTE_WINDOW = 5                            # L2b per-frame majority vote
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+# Multi-worker servers also need PROMETHEUS_MULTIPROC_DIR (see metrics.py).
+
+METRICS_ENABLED = _env_bool("DLEF_METRICS", True)  # Requires prometheus_client
+
+
+# =============================================================================
+# SERVER (wsgi.py / gunicorn.conf.py)
+# =============================================================================
+
+PRELOAD_MODELS = _env_bool("DLEF_PRELOAD_MODELS", True)  # Load fork-safe models in the master
+WARMUP_MODELS = _env_set("DLEF_WARMUP_MODELS", ["classifier", "phone_detector", "hands"])
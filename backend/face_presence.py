@@ -0,0 +1,122 @@
+"""
+DLEF - DeepLens Engine for Focus
+Fast Face-Presence Detection
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+check_presence only needs to know whether a face is visible. Running the
+frontal and profile Haar cascades with scaleFactor=1.03 on the full-resolution
+frame builds a very deep image pyramid twice per request. This engine:
+
+    1. Detects on a copy downscaled to FACE_DETECT_WIDTH with a coarser pyramid
+    2. Searches only an expanded ROI around the last face on later frames
+    3. Runs the profile cascade only when the frontal cascade misses
+    4. Falls back to (and periodically forces) a full-frame re-detect
+"""
+
+import cv2
+
+import config
+from frame_ingest import decoded_length
+
+haar_cascade_frontal = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+haar_cascade_profile = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_profileface.xml')
+
+
+class FaceTracker:
+    """Per-session face box (full-resolution x, y, w, h) and re-detect counter."""
+
+    def __init__(self):
+        self.last_box = None
+        self.frames_since_full = 0
+
+
+def _detect(cascade, image, min_size):
+    return cascade.detectMultiScale(
+        image,
+        scaleFactor=config.FACE_SCALE_FACTOR,
+        minNeighbors=config.FACE_MIN_NEIGHBORS,
+        minSize=(min_size, min_size),
+    )
+
+
+def _detect_any(image, min_size):
+    """Frontal first; profile only if frontal finds nothing."""
+    faces = _detect(haar_cascade_frontal, image, min_size)
+    if len(faces) == 0:
+        faces = _detect(haar_cascade_profile, image, min_size)
+    return faces
+
+
+def _roi(box, shape, padding):
+    x, y, w, h = box
+    pad_x, pad_y = int(w * padding), int(h * padding)
+    x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+    x1, y1 = min(shape[1], x + w + pad_x), min(shape[0], y + h + pad_y)
+    return x0, y0, x1, y1
+
+
+def detect_face(gray, tracker=None):
+    """
+    Check whether a (frontal or profile) face is visible.
+
+    Args:
+        gray: Full-resolution grayscale frame
+        tracker: FaceTracker for ROI tracking across frames (optional)
+
+    Returns:
+        bool: True if a face was found
+    """
+    height, width = gray.shape[:2]
+    scale = min(1.0, config.FACE_DETECT_WIDTH / float(width))
+    small = gray if scale == 1.0 else cv2.resize(
+        gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA
+    )
+    min_size = max(1, int(round(decoded_length(config.FACE_MIN_SIZE) * scale)))
+
+    faces = ()
+    offset = (0, 0)
+    use_roi = (
+        tracker is not None
+        and tracker.last_box is not None
+        and tracker.frames_since_full < config.FACE_REDETECT_INTERVAL
+    )
+
+    # 1. ROI search around the last known face
+    if use_roi:
+        small_box = [int(v * scale) for v in tracker.last_box]
+        x0, y0, x1, y1 = _roi(small_box, small.shape, config.FACE_ROI_PADDING)
+        faces = _detect_any(small[y0:y1, x0:x1], min_size)
+        offset = (x0, y0)
+        tracker.frames_since_full += 1
+
+    # 2. Full-frame detect (first frame, periodic refresh, or ROI miss)
+    if len(faces) == 0:
+        faces = _detect_any(small, min_size)
+        offset = (0, 0)
+        if tracker is not None:
+            tracker.frames_since_full = 0
+
+    if len(faces) == 0:
+        if tracker is not None:
+            tracker.last_box = None
+        return False
+
+    if tracker is not None:
+        x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+        tracker.last_box = (
+            int((x + offset[0]) / scale),
+            int((y + offset[1]) / scale),
+            int(w / scale),
+            int(h / scale),
+        )
+    return True
+
+
+def detect_face_legacy(gray):
+    """Original full-resolution detector (both cascades, scaleFactor=1.03)."""
+    min_size = max(1, int(round(decoded_length(30))))
+    frontal_faces = haar_cascade_frontal.detectMultiScale(gray, scaleFactor=1.03, minNeighbors=3, minSize=(min_size, min_size))
+    profile_faces = haar_cascade_profile.detectMultiScale(gray, scaleFactor=1.03, minNeighbors=3, minSize=(min_size, min_size))
+    return len(frontal_faces) > 0 or len(profile_faces) > 0
@@ -0,0 +1,301 @@
+"""
+DLEF - DeepLens Engine for Focus
+Run-Length Focus Log Store
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Compact storage for per-second focus logs (the session_*_focus_log.json
+schema written by focusLogsDummy.py and others/replay_session.py):
+
+    {"timestamp": "2024-03-15T10:00:00", "state": "Focused",
+     "confidence": 0.98, "focusLevel": 10, "reason": ...}   # last two optional
+
+Almost every entry repeats the state of the one before it, so a log is
+kept as typed, append-only columns:
+
+    runs        (first entry, key) per span of identical state/reason/focusLevel
+    keys        table of the distinct (state, reason, focusLevel) tuples
+    time spans  (first entry, epoch second) per span of entries 1 s apart
+    confidence  one uint8 per entry, in hundredths
+
+append() is amortized O(1): columns double their capacity when full.
+Pipeline confidences are rounded to two decimals, which uint8 hundredths
+hold exactly; anything finer is rejected instead of silently rounded, so
+entries() and to_json() reproduce the original entries exactly.
+
+File format: MAGIC, a little-endian uint32 header length, a JSON header
+(entry count, key table, column dtypes and lengths), then the raw columns.
+"""
+
+import json
+import struct
+from datetime import datetime, timedelta
+
+import numpy as np
+
+MAGIC = b"DLEFRLE1"
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+CONFIDENCE_SCALE = 100
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+
+class _Column:
+    """Growable typed array with amortized O(1) append."""
+
+    def __init__(self, dtype, values=None, capacity=64):
+        if values is None:
+            self.data = np.empty(capacity, dtype=dtype)
+            self.size = 0
+        else:
+            self.data = np.array(values, dtype=dtype)
+            self.size = len(self.data)
+
+    def append(self, value):
+        if self.size == len(self.data):
+            grown = np.empty(max(64, 2 * len(self.data)), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        end = self.size + len(values)
+        if end > len(self.data):
+            grown = np.empty(max(64, 2 * len(self.data), end), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:end] = values
+        self.size = end
+
+    @property
+    def values(self):
+        """View of the filled part (not a copy)."""
+        return self.data[:self.size]
+
+    def __len__(self):
+        return self.size
+
+
+def to_epoch_seconds(timestamp):
+    """Whole seconds since 1970-01-01 for a timestamp string or naive datetime."""
+    if isinstance(timestamp, str):
+        timestamp = datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+    if timestamp.microsecond:
+        raise ValueError(f"Timestamps have whole seconds only: {timestamp}")
+    return (timestamp - _EPOCH) // _SECOND
+
+
+class FocusLog:
+    """
+    Run-length encoded focus log of one session.
+
+    Columns (dtype, one row per ...):
+        run_start   uint32  run: index of its first entry
+        run_key     uint16  run: index into keys
+        time_start  uint32  time span: index of its first entry
+        time_value  int64   time span: epoch seconds of its first entry
+        confidence  uint8   entry: confidence in hundredths
+    """
+
+    COLUMNS = {
+        "run_start": np.uint32,
+        "run_key": np.uint16,
+        "time_start": np.uint32,
+        "time_value": np.int64,
+        "confidence": np.uint8,
+    }
+
+    def __init__(self):
+        self.keys = []          # (state, reason, focusLevel); None when absent
+        self._key_codes = {}
+        self.columns = {name: _Column(dtype) for name, dtype in self.COLUMNS.items()}
+        self._size = 0
+        self._last_key = None
+        self._last_second = None
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        """Memory held by the filled columns."""
+        return sum(column.values.nbytes for column in self.columns.values())
+
+    @property
+    def run_count(self):
+        return len(self.columns["run_start"])
+
+    # =========================================================================
+    # WRITING
+    # =========================================================================
+
+    def _key_code(self, key):
+        code = self._key_codes.get(key)
+        if code is None:
+            code = len(self.keys)
+            if code > np.iinfo(self.COLUMNS["run_key"]).max:
+                raise ValueError(f"More than {code} distinct (state, reason, focusLevel) keys in one log")
+            self._key_codes[key] = code
+            self.keys.append(key)
+        return code
+
+    def append(self, timestamp, state, confidence, reason=None, focus_level=None):
+        """
+        Add one entry at the end of the log.
+
+        Raises:
+            ValueError: If the confidence is not a multiple of 0.01 in
+                [0, 2.55], the timestamp has a fractional second, or the
+                entry would be the 65537th distinct key of the log
+        """
+        second = to_epoch_seconds(timestamp)
+        scaled = round(confidence * CONFIDENCE_SCALE)
+        if not 0 <= scaled <= 255 or scaled / CONFIDENCE_SCALE != confidence:
+            raise ValueError(f"Confidence {confidence!r} is not stored exactly in hundredths")
+
+        columns = self.columns
+        key = (state, reason, focus_level)
+        if key != self._last_key:
+            code = self._key_code(key)  # May raise; nothing is written before it
+            columns["run_start"].append(self._size)
+            columns["run_key"].append(code)
+            self._last_key = key
+        if self._last_second is None or second != self._last_second + 1:
+            columns["time_start"].append(self._size)
+            columns["time_value"].append(second)
+        self._last_second = second
+        columns["confidence"].append(scaled)
+        self._size += 1
+
+    def append_run(self, timestamp, state, confidences, reason=None, focus_level=None):
+        """
+        Add len(confidences) entries of one state, one second apart.
+
+        Same result as calling append() for each entry, with the per-entry
+        work done as array operations.
+        """
+        if len(confidences) == 0:
+            return
+        confidences = np.asarray(confidences, dtype=float)
+        scaled = np.rint(confidences * CONFIDENCE_SCALE)
+        if (scaled < 0).any() or (scaled > 255).any() or (scaled / CONFIDENCE_SCALE != confidences).any():
+            raise ValueError("Confidences are not stored exactly in hundredths")
+
+        self.append(timestamp, state, float(confidences[0]), reason, focus_level)
+        self.columns["confidence"].extend(scaled[1:].astype(np.uint8))
+        self._size += len(confidences) - 1
+        self._last_second += len(confidences) - 1
+
+    def append_entry(self, entry):
+        """Add one entry in the session_*_focus_log.json schema."""
+        self.append(
+            entry["timestamp"], entry["state"], entry["confidence"],
+            reason=entry.get("reason"), focus_level=entry.get("focusLevel"),
+        )
+
+    @classmethod
+    def from_entries(cls, entries):
+        log = cls()
+        for entry in entries:
+            log.append_entry(entry)
+        return log
+
+    # =========================================================================
+    # READING
+    # =========================================================================
+
+    def run_lengths(self):
+        """Number of entries in each run (int64 array)."""
+        return np.diff(self.columns["run_start"].values, append=self._size).astype(np.int64)
+
+    def entry_keys(self):
+        """Key index of every entry, expanded from the runs."""
+        return np.repeat(self.columns["run_key"].values, self.run_lengths())
+
+    def seconds(self):
+        """Epoch second of every entry, expanded from the time spans (int64 array)."""
+        starts = self.columns["time_start"].values.astype(np.int64)
+        lengths = np.diff(starts, append=self._size)
+        offsets = np.arange(self._size, dtype=np.int64) - np.repeat(starts, lengths)
+        return np.repeat(self.columns["time_value"].values, lengths) + offsets
+
+    def confidences(self):
+        """Confidence of every entry as float64."""
+        return self.columns["confidence"].values / float(CONFIDENCE_SCALE)
+
+    def timestamps(self):
+        """Timestamp string of every entry, formatted in one vectorized call."""
+        return np.datetime_as_string(self.seconds().astype("datetime64[s]"), unit="s")
+
+    def entries(self):
+        """Yield the entries in the session_*_focus_log.json schema."""
+        timestamps = self.timestamps().tolist()
+        confidences = self.confidences().tolist()
+        starts = self.columns["run_start"].values.tolist()
+        for start, end, code in zip(starts, starts[1:] + [self._size], self.columns["run_key"].values.tolist()):
+            state, reason, focus_level = self.keys[code]
+            for index in range(start, end):
+                entry = {"timestamp": timestamps[index], "state": state, "confidence": confidences[index]}
+                if focus_level is not None:
+                    entry["focusLevel"] = focus_level
+                if reason is not None:
+                    entry["reason"] = reason
+                yield entry
+
+    def to_json(self, **kwargs):
+        """The log as JSON text; json.dumps keyword arguments pass through."""
+        return json.dumps(list(self.entries()), **kwargs)
+
+    # =========================================================================
+    # FILES
+    # =========================================================================
+
+    def save(self, path):
+        header = {
+            "entries": self._size,
+            "keys": self.keys,
+            "columns": [
+                [name, np.dtype(dtype).newbyteorder("<").str, len(self.columns[name])]
+                for name, dtype in self.COLUMNS.items()
+            ],
+        }
+        header_bytes = json.dumps(header, separators=(",", ":")).encode()
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            for name, dtype, _ in header["columns"]:
+                f.write(self.columns[name].values.astype(dtype, copy=False).tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a focus log store file: {path}")
+        offset = len(MAGIC)
+        (header_length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        header = json.loads(data[offset:offset + header_length])
+        offset += header_length
+
+        log = cls()
+        for name, dtype, length in header["columns"]:
+            values = np.frombuffer(data, dtype=dtype, count=length, offset=offset)
+            offset += values.nbytes
+            log.columns[name] = _Column(cls.COLUMNS[name], values)
+        log.keys = [tuple(key) for key in header["keys"]]
+        log._key_codes = {key: code for code, key in enumerate(log.keys)}
+        log._size = header["entries"]
+        if log._size:
+            # Restore the append state so the log can keep growing
+            log._last_key = log.keys[log.columns["run_key"].values[-1]]
+            last_span = len(log.columns["time_start"]) - 1
+            log._last_second = int(
+                log.columns["time_value"].values[last_span]
+                + (log._size - 1 - int(log.columns["time_start"].values[last_span]))
+            )
+        return log
@@ -0,0 +1,89 @@
+"""
+DLEF - DeepLens Engine for Focus
+Shared Per-Frame Context
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Several stages need the same derived images of a frame: the result-cache
+signature, the L2a motion/variance/face checks and the L2b edge pass all use
+grayscale, and MediaPipe (hands, face mesh) needs RGB.
+A FrameContext wraps the canonical BGR frame (see frame_ingest.py) and
+builds each derived view at most once, on first use, for every stage that
+asks for it. Stages accept either a FrameContext or a plain BGR array.
+"""
+
+import threading
+
+import cv2
+
+_CONVERSIONS = {
+    "gray": cv2.COLOR_BGR2GRAY,
+    "rgb": cv2.COLOR_BGR2RGB,
+    "hsv": cv2.COLOR_BGR2HSV,
+}
+
+
+class FrameContext:
+    """
+    One BGR frame plus lazily computed, memoized views.
+
+    Views are computed under a lock, so stages running in parallel threads
+    share one copy instead of racing to build two. Views are shared, not
+    copied: treat them as read-only.
+
+    Args:
+        bgr (np.ndarray): (H, W, 3) uint8 frame in BGR order
+    """
+
+    def __init__(self, bgr):
+        self.bgr = bgr
+        self._views = {"bgr": bgr}
+        self._lock = threading.Lock()
+        self.conversions = 0  # Views built for this frame
+
+    @property
+    def shape(self):
+        return self.bgr.shape
+
+    def view(self, name):
+        """Full-resolution view: 'bgr', 'gray', 'rgb' or 'hsv'."""
+        image = self._views.get(name)
+        if image is None:
+            image = self._build(name, lambda: cv2.cvtColor(self.bgr, _CONVERSIONS[name]))
+        return image
+
+    @property
+    def gray(self):
+        return self.view("gray")
+
+    @property
+    def rgb(self):
+        return self.view("rgb")
+
+    @property
+    def hsv(self):
+        return self.view("hsv")
+
+    def resized(self, name, size):
+        """View `name` resized to size=(width, height) with area interpolation."""
+        key = (name, size)
+        image = self._views.get(key)
+        if image is None:
+            source = self.view(name)  # Built first: the lock is not reentrant
+            image = self._build(key, lambda: cv2.resize(source, size, interpolation=cv2.INTER_AREA))
+        return image
+
+    def _build(self, key, build):
+        with self._lock:
+            image = self._views.get(key)
+            if image is None:
+                image = build()
+                self._views[key] = image
+                self.conversions += 1
+        return image
+
+
+def as_context(frame):
+    """Wrap a BGR array in a FrameContext (a FrameContext is returned as is)."""
+    return frame if isinstance(frame, FrameContext) else FrameContext(frame)
@@ -0,0 +1,89 @@
+"""
+DLEF - DeepLens Engine for Focus
+Frame Ingestion
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Decodes uploaded webcam frames straight into the pipeline's canonical
+format: a C-contiguous uint8 array in BGR channel order (the order OpenCV,
+Ultralytics and every L2 stage expect). The encoded bytes are wrapped with
+np.frombuffer (no copy) and handed to cv2.imdecode, skipping the PIL round
+trip. JPEG frames can optionally be decoded at 1/2, 1/4 or 1/8 resolution
+via libjpeg's DCT scaling, which is cheaper than decoding at full size and
+resizing afterwards. The L2 stages state their pixel thresholds at full
+resolution and convert them with decoded_length() / decoded_area(), so a
+reduced decode keeps their meaning.
+"""
+
+import cv2
+import numpy as np
+
+import config
+
+# Reduction factor -> imdecode flag
+_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+RAW_MIMETYPES = ("application/octet-stream", "image/jpeg", "image/png")
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png")  # Image files the offline tools read
+
+
+def decoded_length(pixels):
+    """A full-resolution length (px) in pixels of frames decoded at DECODE_REDUCE_FACTOR."""
+    return pixels / config.DECODE_REDUCE_FACTOR
+
+
+def decoded_area(pixels):
+    """A full-resolution pixel count in pixels of frames decoded at DECODE_REDUCE_FACTOR."""
+    return pixels / config.DECODE_REDUCE_FACTOR ** 2
+
+
+def decode_frame(data, reduce_factor=None):
+    """
+    Decode encoded image bytes into a BGR uint8 frame.
+
+    Args:
+        data: Encoded JPEG/PNG (bytes, bytearray or memoryview)
+        reduce_factor (int): 1, 2, 4 or 8; defaults to config.DECODE_REDUCE_FACTOR
+
+    Returns:
+        np.ndarray: (H, W, 3) C-contiguous uint8 array in BGR order
+
+    Raises:
+        ValueError: If the bytes are empty or not a decodable image
+    """
+    if reduce_factor is None:
+        reduce_factor = config.DECODE_REDUCE_FACTOR
+    if reduce_factor not in _DECODE_FLAGS:
+        raise ValueError(f"Unsupported reduce factor: {reduce_factor} (use 1, 2, 4 or 8)")
+    if not data:
+        raise ValueError("Empty image payload")
+
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    frame = cv2.imdecode(buffer, _DECODE_FLAGS[reduce_factor])
+    if frame is None:
+        raise ValueError("Could not decode image")
+    return frame
+
+
+def read_request_frame(request):
+    """
+    Extract and decode the frame carried by a Flask request.
+
+    Accepts either a multipart upload with an 'image' file field (what the
+    timer window sends) or a raw request body with Content-Type
+    application/octet-stream, image/jpeg or image/png.
+
+    Returns:
+        np.ndarray: BGR uint8 frame
+    """
+    if request.mimetype in RAW_MIMETYPES:
+        data = request.get_data(cache=False)
+    else:
+        data = request.files['image'].read()
+    return decode_frame(data)
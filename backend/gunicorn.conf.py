@@ -0,0 +1,49 @@
+"""
+DLEF - DeepLens Engine for Focus
+Gunicorn Configuration
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+    cd backend
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Every setting can be overridden with the usual GUNICORN_CMD_ARGS or on the
+command line. Session state (motion history, phone tracker, L3 window) lives
+in the worker that created it: route a webcam to a single worker, either
+with the WebSocket stream (one connection, one worker) or with sticky
+sessions at the proxy.
+"""
+
+import os
+import tempfile
+
+bind = os.environ.get("DLEF_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("DLEF_WORKERS", "2"))
+
+# Threads let one worker hold WebSocket streams and overlap HTTP frames
+worker_class = "gthread"
+threads = int(os.environ.get("DLEF_THREADS", "8"))
+
+# Load the app (and the fork-safe models, see wsgi.py) once in the master
+preload_app = True
+
+# Warm-up runs before the worker's heartbeat starts; leave room for it
+timeout = 120
+graceful_timeout = 30
+
+# Metrics from all workers are aggregated through a shared directory
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="dlef-metrics-")
+
+
+def post_worker_init(worker):
+    """Warm up the worker's models before it accepts connections."""
+    from wsgi import warm_up_worker
+    warm_up_worker()
+    worker.log.info("DLEF worker %s warmed up", worker.pid)
+
+
+def child_exit(server, worker):
+    import metrics
+    metrics.mark_process_dead(worker.pid)
@@ -0,0 +1,178 @@
+"""
+DLEF - DeepLens Engine for Focus
+L1 Inference Backends
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+The L1 classifier (YOLOv11n-cls) can be served by two interchangeable
+backends, selected with DLEF_CLASSIFIER_BACKEND:
+
+    torch: Ultralytics YOLO("best.pt") wrapper (default)
+    onnx:  best.onnx through ONNX Runtime on CPU, bypassing the Ultralytics
+           predictor and its per-call PyTorch overhead
+
+Both expose the same interface: `names` (class id -> name) and
+`predict(frames)` returning (class_name, confidence) per BGR frame. The ONNX
+backend reproduces Ultralytics' classification preprocessing (shortest side
+resized to imgsz, center crop, BGR -> RGB, scaled to [0, 1]) in NumPy/OpenCV.
+Export best.onnx with model/export_onnx.py.
+"""
+
+import ast
+import os
+
+import cv2
+import numpy as np
+
+import config
+
+
+class TorchClassifier:
+    """L1 classifier served by the Ultralytics PyTorch wrapper."""
+
+    backend = "torch"
+
+    def __init__(self, weights=None):
+        from ultralytics import YOLO
+        self.model = YOLO(weights or config.CLASSIFIER_WEIGHTS)
+        self.names = self.model.names
+
+    @property
+    def param_bytes(self):
+        try:
+            return sum(p.numel() * p.element_size() for p in self.model.model.parameters())
+        except Exception:
+            return None
+
+    def predict(self, frames):
+        """
+        Classify a batch of frames in one forward pass.
+
+        Args:
+            frames: List of BGR images (numpy arrays)
+
+        Returns:
+            list: (class_name, confidence) per frame, in input order
+        """
+        results = self.model(frames, verbose=False)
+        return [
+            (self.names[r.probs.top1], float(r.probs.top1conf))
+            for r in results
+        ]
+
+
+def preprocess(frames, imgsz):
+    """
+    Ultralytics classification preprocessing for a batch of BGR frames.
+
+    Args:
+        frames: List of BGR uint8 images
+        imgsz (int): Model input size (square)
+
+    Returns:
+        np.ndarray: (N, 3, imgsz, imgsz) float32 RGB tensor in [0, 1]
+    """
+    batch = np.empty((len(frames), 3, imgsz, imgsz), dtype=np.float32)
+    for i, frame in enumerate(frames):
+        h, w = frame.shape[:2]
+        scale = imgsz / min(h, w)
+        new_w, new_h = max(imgsz, round(w * scale)), max(imgsz, round(h * scale))
+        # INTER_AREA approximates the antialiased bilinear downscale torchvision uses
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        resized = cv2.resize(frame, (new_w, new_h), interpolation=interpolation)
+        top, left = (new_h - imgsz) // 2, (new_w - imgsz) // 2
+        crop = resized[top:top + imgsz, left:left + imgsz, ::-1]  # BGR -> RGB
+        batch[i] = crop.transpose(2, 0, 1)
+    batch *= 1.0 / 255.0
+    return batch
+
+
+class OnnxClassifier:
+    """
+    L1 classifier served by ONNX Runtime.
+
+    Args:
+        path (str): Exported model (defaults to config.CLASSIFIER_ONNX_WEIGHTS)
+        intra_op_threads (int): Threads per operator; 0 lets ONNX Runtime decide
+    """
+
+    backend = "onnx"
+
+    def __init__(self, path=None, intra_op_threads=None):
+        import onnxruntime as ort
+
+        path = path or config.CLASSIFIER_ONNX_WEIGHTS
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"ONNX classifier not found: {path} (run model/export_onnx.py)"
+            )
+        if intra_op_threads is None:
+            intra_op_threads = config.ONNX_INTRA_OP_THREADS
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+
+        self.path = path
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+        # Ultralytics stores names/imgsz as metadata of the exported graph
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names = ast.literal_eval(metadata["names"]) if "names" in metadata else {}
+        imgsz = ast.literal_eval(metadata.get("imgsz", "[224, 224]"))
+        self.imgsz = imgsz[0] if isinstance(imgsz, (list, tuple)) else int(imgsz)
+        self.dynamic_batch = not isinstance(self.session.get_inputs()[0].shape[0], int)
+
+    @property
+    def param_bytes(self):
+        return os.path.getsize(self.path)
+
+    def predict(self, frames):
+        """
+        Classify a batch of frames in one forward pass.
+
+        Args:
+            frames: List of BGR images (numpy arrays)
+
+        Returns:
+            list: (class_name, confidence) per frame, in input order
+        """
+        batch = preprocess(frames, self.imgsz)
+        if self.dynamic_batch:
+            probs = self.session.run(None, {self.input_name: batch})[0]
+        else:
+            probs = np.concatenate([
+                self.session.run(None, {self.input_name: batch[i:i + 1]})[0]
+                for i in range(len(batch))
+            ])
+        top1 = probs.argmax(axis=1)
+        return [
+            (self.names[int(cls)], float(probs[i, cls]))
+            for i, cls in enumerate(top1)
+        ]
+
+
+BACKENDS = {
+    "torch": TorchClassifier,
+    "onnx": OnnxClassifier,
+}
+
+
+def load_classifier(backend=None):
+    """
+    Build the L1 classifier for the configured backend.
+
+    Args:
+        backend (str): "torch" or "onnx"; defaults to config.CLASSIFIER_BACKEND
+
+    Returns:
+        TorchClassifier or OnnxClassifier
+    """
+    backend = backend or config.CLASSIFIER_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown classifier backend: {backend} (use {', '.join(BACKENDS)})")
+    return BACKENDS[backend]()
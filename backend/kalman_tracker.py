@@ -0,0 +1,143 @@
+"""
+DLEF - DeepLens Engine for Focus
+Multi-Session Kalman Tracker
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Constant-velocity Kalman filters for the L2b phone-box motion check, one
+track per session, stored as stacked NumPy arrays instead of one filterpy
+object per session:
+
+    x: (capacity, 4)     state [x, y, vx, vy]
+    P: (capacity, 4, 4)  state covariance
+
+predict(), update() and step() take one slot or an array of slots and run
+as batched matrix operations over all of them, so stepping one track or a
+thousand costs one call. Slots come from a free list: add() and remove()
+are O(1), and the arrays double in size when full (amortized O(1) growth).
+
+The model and the update match the filterpy filter this replaces
+(F constant velocity, H selects [x, y], P0 = 1000*I, R = 5*I, Q = 0.1*I,
+Joseph-form covariance update), so results are numerically identical.
+"""
+
+import threading
+
+import numpy as np
+
+DIM_X = 4  # [x, y, vx, vy]
+DIM_Z = 2  # [x, y]
+
+F = np.array([[1, 0, 1, 0], [0, 1, 0, 1], [0, 0, 1, 0], [0, 0, 0, 1]], dtype=float)
+H = np.array([[1, 0, 0, 0], [0, 1, 0, 0]], dtype=float)
+Q = np.eye(DIM_X) * 0.1
+R = np.eye(DIM_Z) * 5.0
+P0 = np.eye(DIM_X) * 1000.0
+
+
+class KalmanTracker:
+    """
+    Bank of independent constant-velocity Kalman tracks.
+
+    Thread-safe: each call holds the bank lock only for its array math.
+
+    Args:
+        capacity (int): Initial number of track slots
+    """
+
+    def __init__(self, capacity=64):
+        self._lock = threading.Lock()
+        self.x = np.zeros((capacity, DIM_X))
+        self.P = np.zeros((capacity, DIM_X, DIM_X))
+        self._free = list(range(capacity - 1, -1, -1))  # Pop from the end: lowest slot first
+        self.active = 0
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    @property
+    def slot_nbytes(self):
+        """Memory held per track."""
+        return self.x[0].nbytes + self.P[0].nbytes
+
+    def add(self):
+        """Allocate a track at the origin with the initial covariance; returns its slot."""
+        with self._lock:
+            if not self._free:
+                self._grow()
+            slot = self._free.pop()
+            self.x[slot] = 0.0
+            self.P[slot] = P0
+            self.active += 1
+            return slot
+
+    def remove(self, slot):
+        """Release a track slot for reuse."""
+        with self._lock:
+            self._free.append(slot)
+            self.active -= 1
+
+    def _grow(self):
+        old = self.capacity
+        self.x = np.concatenate([self.x, np.zeros_like(self.x)])
+        self.P = np.concatenate([self.P, np.zeros_like(self.P)])
+        self._free.extend(range(2 * old - 1, old - 1, -1))
+
+    def set_position(self, slots, z):
+        """Overwrite the position of tracks (velocity and covariance are kept)."""
+        with self._lock:
+            self.x[slots, :DIM_Z] = z
+
+    def position(self, slots):
+        with self._lock:
+            return self.x[slots, :DIM_Z].copy()
+
+    def predict(self, slots):
+        """x = F x, P = F P F' + Q for every slot."""
+        with self._lock:
+            self.x[slots], self.P[slots] = _predict(self.x[slots], self.P[slots])
+
+    def update(self, slots, z):
+        """
+        Correct tracks with position measurements.
+
+        Args:
+            slots: Track slot, or array of n slots
+            z: (2,) measured position, or (n, 2) positions
+
+        Returns:
+            np.ndarray: Corrected positions, shaped like z
+        """
+        with self._lock:
+            x, P = _update(self.x[slots], self.P[slots], z)
+            self.x[slots], self.P[slots] = x, P
+        return x[..., :DIM_Z]
+
+    def step(self, slots, z):
+        """predict() then update() in one call; returns the corrected positions."""
+        with self._lock:
+            x, P = _update(*_predict(self.x[slots], self.P[slots]), z)
+            self.x[slots], self.P[slots] = x, P
+        return x[..., :DIM_Z]
+
+
+def _predict(x, P):
+    return x @ F.T, F @ P @ F.T + Q
+
+
+def _update(x, P, z):
+    # H only selects [x, y], so H x, P H' and H P H' are slices
+    y = np.asarray(z, dtype=float) - x[..., :DIM_Z]
+    PHt = P[..., :DIM_Z]
+    K = PHt @ np.linalg.inv(PHt[..., :DIM_Z, :] + R)  # Kalman gain, (..., 4, 2)
+    x = x + (K @ y[..., None])[..., 0]
+    I_KH = np.eye(DIM_X) - K @ H
+    # Joseph form, as filterpy: (I - KH) P (I - KH)' + K R K'
+    P = I_KH @ P @ np.swapaxes(I_KH, -1, -2) + K @ R @ np.swapaxes(K, -1, -2)
+    return x, P
+
+
+# Process-wide bank holding the L2b track of every session
+phone_tracker = KalmanTracker()
@@ -0,0 +1,180 @@
+"""
+DLEF - DeepLens Engine for Focus
+Prometheus Metrics
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Instrumentation for the hot path, exposed in the Prometheus text format on
+GET /metrics:
+
+    dlef_stage_seconds{stage}                 decode, presence, phone, classifier
+    dlef_request_seconds{transport}           whole frame, http or websocket
+    dlef_decisions_total{reason,focus_level}  final per-frame decisions
+    dlef_errors_total{transport,error}        frames answered with an error
+    dlef_result_cache_lookups_total{outcome}  hit, miss, forced_refresh
+    dlef_active_sessions                      live sessions (summed over workers)
+    dlef_classifier_queue_depth               frames waiting for the L1 batcher
+    dlef_result_cache_hit_ratio               per worker
+
+Label children are resolved once and cached, so recording a sample is a dict
+lookup plus one prometheus_client observe/inc (about a microsecond).
+
+Multiple workers: set PROMETHEUS_MULTIPROC_DIR to an empty directory before
+the workers start. prometheus_client then keeps the values in per-process
+files and /metrics aggregates all of them, whichever worker serves it.
+
+Without prometheus_client installed (or with DLEF_METRICS=0) every function
+here is a no-op and /metrics answers 501.
+"""
+
+import os
+from contextlib import contextmanager, nullcontext
+
+import config
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:  # Optional dependency
+    prometheus_client = None
+
+ENABLED = config.METRICS_ENABLED and prometheus_client is not None
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Frame stages take milliseconds to about a second on CPU
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+if ENABLED:
+    STAGE_SECONDS = Histogram(
+        "dlef_stage_seconds", "Latency of one DLEF stage for one frame",
+        ["stage"], buckets=LATENCY_BUCKETS,
+    )
+    REQUEST_SECONDS = Histogram(
+        "dlef_request_seconds", "Latency of one frame from receipt to response",
+        ["transport"], buckets=LATENCY_BUCKETS,
+    )
+    DECISIONS = Counter(
+        "dlef_decisions", "Final per-frame decisions", ["reason", "focus_level"],
+    )
+    ERRORS = Counter(
+        "dlef_errors", "Frames answered with an error", ["transport", "error"],
+    )
+    CACHE_LOOKUPS = Counter(
+        "dlef_result_cache_lookups", "Result cache lookups by outcome", ["outcome"],
+    )
+    ACTIVE_SESSIONS = Gauge(
+        "dlef_active_sessions", "Live webcam sessions", multiprocess_mode="livesum",
+    )
+    QUEUE_DEPTH = Gauge(
+        "dlef_classifier_queue_depth", "Frames waiting for the L1 micro-batcher",
+        multiprocess_mode="livesum",
+    )
+    CACHE_HIT_RATIO = Gauge(
+        "dlef_result_cache_hit_ratio", "Result cache hit ratio since start",
+        multiprocess_mode="liveall",
+    )
+
+_children = {}
+_suspended = False  # Set while warm-up frames run (see suspended())
+
+
+def _child(metric, *labels):
+    key = (metric, labels)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*labels)
+    return child
+
+
+# =============================================================================
+# RECORDING
+# =============================================================================
+
+@contextmanager
+def suspended():
+    """
+    Record nothing inside the block.
+
+    For frames that are not traffic, such as the warm-up frames a worker
+    runs before serving; it is process-wide, so only use it while no
+    requests are being handled.
+    """
+    global _suspended
+    _suspended = True
+    try:
+        yield
+    finally:
+        _suspended = False
+
+
+def timed(stage):
+    """Context manager that observes the duration of a pipeline stage."""
+    if not ENABLED or _suspended:
+        return nullcontext()
+    return _child(STAGE_SECONDS, stage).time()
+
+
+def observe_request(transport, seconds):
+    if ENABLED and not _suspended:
+        _child(REQUEST_SECONDS, transport).observe(seconds)
+
+
+def record_decision(response):
+    """Count the final decision of one frame."""
+    if ENABLED and not _suspended:
+        reason = response.get("reason") or "none"
+        _child(DECISIONS, reason, str(response.get("focusLevel"))).inc()
+
+
+def record_error(transport, error):
+    if ENABLED and not _suspended:
+        _child(ERRORS, transport, type(error).__name__).inc()
+
+
+def record_cache_lookup(outcome):
+    if ENABLED and not _suspended:
+        _child(CACHE_LOOKUPS, outcome).inc()
+
+
+def update_gauges(active_sessions, queue_depth, cache_hit_ratio):
+    """
+    Refresh the gauges after a frame.
+
+    In multiprocess mode a scrape cannot ask other workers for their current
+    values, so each worker publishes its own after every frame.
+    """
+    if ENABLED and not _suspended:
+        ACTIVE_SESSIONS.set(active_sessions)
+        QUEUE_DEPTH.set(queue_depth)
+        CACHE_HIT_RATIO.set(cache_hit_ratio)
+
+
+# =============================================================================
+# EXPOSITION
+# =============================================================================
+
+def render():
+    """
+    Current metrics in the Prometheus text format.
+
+    Returns:
+        tuple: (body bytes, content type), or (None, None) when disabled
+    """
+    if not ENABLED:
+        return None, None
+    if MULTIPROCESS:
+        from prometheus_client import CollectorRegistry, multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid):
+    """Drop a dead worker's live gauges (call from the server's child-exit hook)."""
+    if ENABLED and MULTIPROCESS:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,227 @@
+"""
+DLEF - DeepLens Engine for Focus
+Shared Model Registry
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Every model used by the engine is loaded at most once per process, on first
+use, through the accessors below. The L1 classifier, the YOLOv8n phone
+detector and the MediaPipe graphs are shared by all modules, so a worker
+holds exactly one copy of each.
+
+Models:
+    classifier:     YOLOv11n-cls (best.pt or best.onnx, see inference_backends.py)
+                                             - L1 primary classifier
+    phone_detector: YOLOv8n (yolov8n.pt)     - L2 phone validation
+    face_mesh:      MediaPipe FaceMesh       - L2 gaze tracking (static image mode)
+    hands:          MediaPipe Hands          - L2 phone-in-hand check (static image mode)
+"""
+
+import os
+import resource
+import threading
+import time
+
+import numpy as np
+
+import config
+
+
+def current_rss_bytes():
+    """Resident set size of this process (falls back to peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _param_bytes(yolo_model):
+    if hasattr(yolo_model, "param_bytes"):
+        return yolo_model.param_bytes
+    try:
+        return sum(p.numel() * p.element_size() for p in yolo_model.model.parameters())
+    except Exception:
+        return None
+
+
+class ModelEntry:
+    """
+    One lazily loaded model.
+
+    Args:
+        name (str): Registry key
+        loader: Zero-argument callable that builds the model
+        warmup: Callable(model) that runs one throwaway inference
+    """
+
+    def __init__(self, name, loader, warmup=None):
+        self.name = name
+        self._loader = loader
+        self._warmup = warmup
+        self._model = None
+        self._load_lock = threading.Lock()
+        # Ultralytics predictors and MediaPipe graphs are not re-entrant
+        self.inference_lock = threading.Lock()
+        self.load_seconds = None
+        self.rss_delta_bytes = None
+        self.param_bytes = None
+        self.warmed_up = False
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def get(self):
+        """Return the model, loading it on first call."""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    rss_before = current_rss_bytes()
+                    started = time.perf_counter()
+                    model = self._loader()
+                    self.load_seconds = time.perf_counter() - started
+                    self.rss_delta_bytes = current_rss_bytes() - rss_before
+                    self.param_bytes = _param_bytes(model)
+                    self._model = model
+        return self._model
+
+    def warm_up(self):
+        """Run one throwaway inference so the first real request is not slow."""
+        model = self.get()
+        if self._warmup is not None and not self.warmed_up:
+            with self.inference_lock:
+                self._warmup(model)
+            self.warmed_up = True
+
+    def report(self):
+        return {
+            "loaded": self.loaded,
+            "warmedUp": self.warmed_up,
+            "loadSeconds": self.load_seconds,
+            "rssDeltaBytes": self.rss_delta_bytes,
+            "paramBytes": self.param_bytes,
+        }
+
+
+# =============================================================================
+# LOADERS
+# =============================================================================
+
+def _load_yolo(path):
+    from ultralytics import YOLO
+    return YOLO(path)
+
+
+def _load_classifier():
+    from inference_backends import load_classifier
+    return load_classifier()
+
+
+# The MediaPipe graphs are shared by every session, so they run in static
+# image mode: in video mode one stream's landmarks would seed the tracking
+# of the next stream's frame.
+
+def _load_face_mesh():
+    import mediapipe as mp
+    return mp.solutions.face_mesh.FaceMesh(static_image_mode=True, refine_landmarks=True)
+
+
+def _load_hands():
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=2, min_detection_confidence=0.5)
+
+
+def _blank_frame():
+    return np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+_ENTRIES = {
+    "classifier": ModelEntry(
+        "classifier",
+        _load_classifier,
+        lambda m: m.predict([_blank_frame()]),
+    ),
+    "phone_detector": ModelEntry(
+        "phone_detector",
+        lambda: _load_yolo(config.PHONE_DETECTOR_WEIGHTS),
+        lambda m: m(_blank_frame(), verbose=False),
+    ),
+    "face_mesh": ModelEntry(
+        "face_mesh",
+        _load_face_mesh,
+        lambda m: m.process(_blank_frame()),
+    ),
+    "hands": ModelEntry(
+        "hands",
+        _load_hands,
+        lambda m: m.process(_blank_frame()),
+    ),
+}
+
+
+# =============================================================================
+# ACCESSORS
+# =============================================================================
+
+def get_classifier():
+    return _ENTRIES["classifier"].get()
+
+
+def get_phone_detector():
+    return _ENTRIES["phone_detector"].get()
+
+
+def get_face_mesh():
+    return _ENTRIES["face_mesh"].get()
+
+
+def get_hands():
+    return _ENTRIES["hands"].get()
+
+
+def inference_lock(name):
+    """Lock that serialises calls into the named model."""
+    return _ENTRIES[name].inference_lock
+
+
+def load_all(names=None):
+    """Load the given models (default: all) without running inference."""
+    for name in names or _ENTRIES:
+        _ENTRIES[name].get()
+
+
+def warm_up(names=None):
+    """Load and warm up the given models (default: all)."""
+    for name in names or _ENTRIES:
+        _ENTRIES[name].warm_up()
+
+
+def fork_safe_models():
+    """
+    Models that may be loaded before the server forks its workers.
+
+    PyTorch weights are plain memory and are shared copy-on-write by the
+    workers. ONNX Runtime sessions and MediaPipe graphs start threads when
+    they are created, which do not survive fork(), so each worker builds
+    its own.
+    """
+    names = ["phone_detector"]
+    if config.CLASSIFIER_BACKEND == "torch":
+        names.insert(0, "classifier")
+    return names
+
+
+def is_ready(names=None):
+    """True once the given models (default: all) are loaded and warmed up."""
+    return all(_ENTRIES[name].warmed_up for name in names or _ENTRIES)
+
+
+def memory_report():
+    """Per-model load time and memory footprint, plus current process RSS."""
+    return {
+        "models": {name: entry.report() for name, entry in _ENTRIES.items()},
+        "processRssBytes": current_rss_bytes(),
+    }
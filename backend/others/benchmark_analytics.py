@@ -0,0 +1,102 @@
+"""
+Benchmark the focus log analytics on large synthetic logs.
+
+Builds FocusColumns for --entries per-second entries spread evenly over
+--sessions sessions of the Markov model in focus_log_generator.py, times
+every metric of analytics.py, and times a plain Python per-entry loop on a
+sample of the sessions for comparison.
+
+Usage (from backend/):
+    python others/benchmark_analytics.py [--entries 10000000] [--sessions 4000]
+        [--loop-sessions 100] [--seed 0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics  # noqa: E402
+from focus_log_generator import generate_columns  # noqa: E402
+
+
+def loop_summary(cols, sessions):
+    """Reference implementation: one Python pass over the entries of the first sessions."""
+    results = []
+    for s in range(sessions):
+        start, end = cols.offsets[s], cols.offsets[s] + cols.lengths[s]
+        focused = cols.focused[start:end].tolist()
+        reasons = cols.reason[start:end].tolist()
+        seconds = cols.seconds[start:end].tolist()
+        counts, streak, longest, episodes, previous = {}, 0, 0, 0, None
+        for i, is_focused in enumerate(focused):
+            contiguous = previous is not None and seconds[i] == previous + 1
+            if is_focused:
+                streak = streak + 1 if contiguous and focused[i - 1] else 1
+                longest = max(longest, streak)
+            else:
+                counts[reasons[i]] = counts.get(reasons[i], 0) + 1
+                if not (contiguous and not focused[i - 1]):
+                    episodes += 1
+            previous = seconds[i]
+        results.append((sum(focused) / len(focused) * 100, counts, longest, episodes))
+    return results
+
+
+def timed(label, fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {elapsed * 1000:>9.1f} ms")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=10_000_000)
+    parser.add_argument("--sessions", type=int, default=4000)
+    parser.add_argument("--window", type=int, default=60, help="Rolling focus window (entries)")
+    parser.add_argument("--loop-sessions", type=int, default=100, help="Sessions in the per-entry loop sample")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    seconds = args.entries // args.sessions
+    print(f"Generating {seconds * args.sessions:,} entries over {args.sessions:,} sessions...")
+    cols = generate_columns(args.sessions, seconds, seed=args.seed)
+    print(f"Columns: {cols.nbytes / 2**20:.0f} MB\n")
+
+    print("Vectorized (all sessions):")
+    _, focus_s = timed("focus percentage", analytics.focus_percentage, cols)
+    _, reasons_s = timed("distraction breakdown", analytics.reason_counts, cols)
+    runs, runs_s = timed("state runs", analytics.segments, cols)
+    _, streak_s = timed("longest focused streak", analytics.longest_focused_streak, cols, runs)
+    episodes, episodes_s = timed("distraction episodes", analytics.distraction_episodes, cols, 1, runs)
+    timed(f"rolling focus ({args.window} s)", analytics.rolling_focus, cols, args.window)
+    summary, summary_s = timed("summarize (all of the above)", analytics.summarize, cols)
+    vector_s = focus_s + reasons_s + runs_s + streak_s + episodes_s
+
+    sample = min(args.loop_sessions, cols.n_sessions)
+    sample_entries = int(cols.lengths[:sample].sum())
+    print(f"\nPer-entry Python loop ({sample} sessions, {sample_entries:,} entries):")
+    reference, loop_s = timed("focus/breakdown/streak/episodes", loop_summary, cols, sample)
+
+    # The loop must agree with the vectorized results it is compared to
+    counts = analytics.reason_counts(cols)
+    for s, (focus, reason_counts, longest, n_episodes) in enumerate(reference):
+        assert abs(focus - summary["perSession"]["focusPercentage"][s]) < 0.01
+        assert longest == summary["perSession"]["longestFocusedStreakSeconds"][s]
+        assert n_episodes == summary["perSession"]["distractionEpisodes"][s]
+        assert all(counts[s, r] == n for r, n in reason_counts.items())
+
+    loop_per_entry = loop_s / max(sample_entries, 1)
+    vector_per_entry = vector_s / max(len(cols), 1)
+    print(f"\nVectorized: {vector_per_entry * 1e9:.1f} ns/entry | "
+          f"loop: {loop_per_entry * 1e9:.1f} ns/entry ({loop_per_entry / vector_per_entry:.0f}x)")
+    print(f"Focus {summary['focusPercentage']:.1f}% | {summary['distractionEpisodes']:,} episodes | "
+          f"longest streak {summary['longestFocusedStreakSeconds']} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Per-layer latency benchmark for the DLEF pipeline.
+
+Replays the dataset_sample images through each stage in isolation and through
+the full /deepwork_focus path, and reports p50/p95/p99 latency, throughput and
+peak memory per stage. Every stage runs in a fresh process, so its peak RSS
+covers only the models that stage loads.
+
+Stages:
+    decode      JPEG bytes -> BGR frame (frame_ingest.decode_frame)
+    presence    L2a check_presence (motion + Haar)
+    phone       L2b check_cellphone (YOLOv8n, contours, Hands, Kalman)
+    classifier  L1 classify_batch on one frame (configured backend)
+    pipeline    decode + process_frame, as /deepwork_focus runs it
+    endpoint    POST /deepwork_focus through the Flask test client
+
+Usage (from backend/):
+    python others/benchmark_pipeline.py [--stages decode presence] [--repeats 3]
+        [--output bench.json] [--baseline previous.json] [--tolerance 10] [--timeout 600]
+
+With --baseline, stages whose p50 or p95 grew by more than --tolerance percent
+are reported as regressions and the exit code is 1.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from frame_ingest import IMAGE_SUFFIXES  # noqa: E402
+
+DATASET = Path(BACKEND_DIR).parent / "dataset_sample"
+STAGES = ("decode", "presence", "phone", "classifier", "pipeline", "endpoint")
+COMPARED_METRICS = ("p50Ms", "p95Ms")
+
+
+def load_images(data, splits, limit=None):
+    """Encoded bytes of split/class/image files, in a stable order."""
+    paths = []
+    for split in splits:
+        paths.extend(sorted(
+            path for path in (Path(data) / split).glob("*/*") if path.suffix.lower() in IMAGE_SUFFIXES
+        ))
+    if limit:
+        paths = paths[:limit]
+    return [path.read_bytes() for path in paths]
+
+
+def _peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _stage_runner(stage):
+    """Build a callable(encoded_bytes) for one stage, loading what it needs."""
+    from frame_ingest import decode_frame
+
+    if stage == "decode":
+        return decode_frame
+
+    if stage == "endpoint":
+        from app import app
+        client = app.test_client()
+
+        def post(data):
+            response = client.post("/deepwork_focus", data=data, content_type="image/jpeg")
+            if response.status_code != 200:
+                raise RuntimeError(response.get_json())
+        return post
+
+    # Stages below take decoded frames; decoding is done outside the timer
+    from session_store import FocusSession
+    session = FocusSession("benchmark")
+
+    if stage == "pipeline":
+        from pipeline import process_frame
+
+        def run_pipeline(data):
+            frame = decode_frame(data)
+            with session.lock:
+                return process_frame(frame, session)
+        return run_pipeline
+    if stage == "presence":
+        from absence_model import check_presence
+        return lambda frame: check_presence(frame, session.presence)
+    if stage == "phone":
+        from cellphone_model import check_cellphone
+        return lambda frame: check_cellphone(frame, session.phone)
+    if stage == "classifier":
+        from pipeline import classify_batch
+        return lambda frame: classify_batch([frame])
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def _run_stage(stage, images, repeats, warmup, queue):
+    """Child process: load the stage, warm it up, then time every call."""
+    try:
+        from frame_ingest import decode_frame
+        from model_registry import current_rss_bytes
+
+        run = _stage_runner(stage)
+        takes_bytes = stage in ("decode", "pipeline", "endpoint")
+        inputs = images if takes_bytes else [decode_frame(data) for data in images]
+
+        for item in inputs[:warmup]:
+            run(item)
+        rss_ready = current_rss_bytes()
+
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(repeats):
+            for item in inputs:
+                t0 = time.perf_counter()
+                run(item)
+                latencies.append((time.perf_counter() - t0) * 1000)
+        elapsed = time.perf_counter() - started
+
+        queue.put({
+            "calls": len(latencies),
+            "p50Ms": float(np.percentile(latencies, 50)),
+            "p95Ms": float(np.percentile(latencies, 95)),
+            "p99Ms": float(np.percentile(latencies, 99)),
+            "meanMs": float(np.mean(latencies)),
+            "throughputPerSecond": len(latencies) / elapsed if elapsed else 0.0,
+            "readyRssBytes": rss_ready,
+            "peakRssBytes": _peak_rss_bytes(),
+        })
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def benchmark_stage(stage, images, repeats, warmup, timeout=None):
+    """
+    Run one stage in a fresh process and return its measurements.
+
+    A child that dies without reporting (e.g. a segfault in a native
+    library) or runs past `timeout` seconds yields an error entry.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_stage, args=(stage, images, repeats, warmup, queue))
+    process.start()
+    deadline = time.monotonic() + timeout if timeout else None
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=1.0)
+        except queue_module.Empty:
+            if not process.is_alive():
+                # The result may have been flushed just before the exit
+                try:
+                    result = queue.get(timeout=1.0)
+                except queue_module.Empty:
+                    result = {"error": f"Stage process exited with code {process.exitcode} without a result"}
+            elif deadline and time.monotonic() > deadline:
+                process.terminate()
+                result = {"error": f"Timed out after {timeout:.0f} s"}
+    process.join()
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    """Settings that change the numbers, stored with every report."""
+    import config
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "classifierBackend": config.CLASSIFIER_BACKEND,
+        "cascade": config.CASCADE_MODE,
+        "parallelStages": config.PARALLEL_STAGES,
+        "resultCache": config.RESULT_CACHE,
+        "fastFaceDetection": config.FAST_FACE_DETECTION,
+        "decodeReduceFactor": config.DECODE_REDUCE_FACTOR,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Per-stage metric changes against a baseline report; returns regressions."""
+    regressions = []
+    print(f"\nComparison with baseline ({baseline['environment'].get('commit')}):")
+    for stage, current in report["stages"].items():
+        previous = baseline["stages"].get(stage)
+        if not previous or "error" in current or "error" in previous:
+            continue
+        for metric in COMPARED_METRICS:
+            change = (current[metric] - previous[metric]) / previous[metric] * 100
+            flag = "✗ regression" if change > tolerance else ""
+            print(f"  {stage:<11} {metric:<6} {previous[metric]:>9.2f} -> {current[metric]:>9.2f} ms ({change:+.1f}%) {flag}")
+            if change > tolerance:
+                regressions.append((stage, metric, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data", default=str(DATASET), help="Folder with split/class/image.jpg")
+    parser.add_argument("--splits", nargs="+", default=["train", "val"])
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=STAGES)
+    parser.add_argument("--repeats", type=int, default=3, help="Passes over the images per stage")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed calls before measuring")
+    parser.add_argument("--limit", type=int, default=None, help="Use only the first N images")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds allowed per stage")
+    parser.add_argument("--output", default="benchmark.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", default=None, help="Earlier report to compare against")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="Allowed slowdown in percent")
+    args = parser.parse_args()
+
+    images = load_images(args.data, args.splits, args.limit)
+    if not images:
+        sys.exit(f"No images found under {args.data} ({', '.join(args.splits)})")
+    print(f"Images: {len(images)} | Repeats: {args.repeats} | Warm-up: {args.warmup}")
+
+    report = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "images": len(images),
+        "splits": args.splits,
+        "repeats": args.repeats,
+        "environment": environment(),
+        "stages": {},
+    }
+
+    print(f"\n{'Stage':<11} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'calls/s':>8} | {'peak RSS':>9}")
+    print("-" * 68)
+    for stage in args.stages:
+        result = benchmark_stage(stage, images, args.repeats, args.warmup, args.timeout)
+        report["stages"][stage] = result
+        if "error" in result:
+            print(f"{stage:<11} | failed: {result['error']}")
+            continue
+        print(f"{stage:<11} | {result['p50Ms']:>8.2f} | {result['p95Ms']:>8.2f} | {result['p99Ms']:>8.2f} | "
+              f"{result['throughputPerSecond']:>8.1f} | {result['peakRssBytes'] / 2**20:>6.0f} MB")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport saved to: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0f}%")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
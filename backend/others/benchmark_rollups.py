@@ -0,0 +1,106 @@
+"""
+Benchmark dashboard queries on rollups against re-deriving them from logs.
+
+Builds a year of synthetic history for one user (--sessions-per-day
+sessions of --session-minutes each, see focus_log_generator.py), feeds it to a RollupStore in segments
+of --segment-minutes as a live session would, checks that the incremental
+rollups equal a full recompute, then times the dashboard queries (365 daily
+rows, 53 weekly rows, a yearly total) against recomputing them from the
+per-second entries.
+
+Usage (from backend/):
+    python others/benchmark_rollups.py [--days 365] [--sessions-per-day 2]
+        [--session-minutes 90] [--segment-minutes 15] [--repeats 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rollups  # noqa: E402
+from analytics import FocusColumns  # noqa: E402
+from focus_log_generator import generate_columns  # noqa: E402
+
+USER = "benchmark-user"
+
+
+def segments(cols, segment_entries):
+    """Split each session into FocusColumns of at most segment_entries entries, in time order."""
+    for s, session_id in enumerate(cols.session_ids):
+        begin, end = int(cols.offsets[s]), int(cols.offsets[s] + cols.lengths[s])
+        for a in range(begin, end, segment_entries):
+            b = min(a + segment_entries, end)
+            yield FocusColumns(
+                [session_id], [b - a], cols.seconds[a:b], cols.focused[a:b],
+                cols.reason[a:b], cols.confidence[a:b], cols.reasons,
+            )
+
+
+def median_ms(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return float(np.median(times)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--sessions-per-day", type=int, default=2)
+    parser.add_argument("--session-minutes", type=int, default=90)
+    parser.add_argument("--segment-minutes", type=int, default=15, help="Entries per ingest() call, in minutes")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed runs per query (median is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    n_sessions = args.days * args.sessions_per_day
+    entries = n_sessions * args.session_minutes * 60
+    print(f"History: {args.days} days, {n_sessions:,} sessions, {entries:,} entries")
+    cols = generate_columns(
+        n_sessions, args.session_minutes * 60, seed=args.seed, sessions_per_day=args.sessions_per_day,
+    )
+
+    store = rollups.RollupStore()
+    started = time.perf_counter()
+    for segment in segments(cols, args.segment_minutes * 60):
+        store.ingest(USER, segment)
+    ingest_s = time.perf_counter() - started
+    print(f"Incremental ingest: {store.segments:,} segments in {ingest_s:.2f} s "
+          f"({ingest_s / store.segments * 1000:.3f} ms/segment)")
+
+    started = time.perf_counter()
+    recomputed = rollups.recompute({USER: cols})
+    recompute_s = time.perf_counter() - started
+    if recomputed.snapshot() != store.snapshot():
+        sys.exit("✗ Incremental rollups differ from the full recompute")
+    print(f"Full recompute:     {recompute_s:.2f} s - identical to the incremental rollups ✓")
+
+    first = rollups.day_date(int(cols.seconds[0]) // rollups.SECONDS_PER_DAY)
+    last = first + timedelta(days=args.days - 1)
+    daily = store.query(USER, first, last)
+    weekly = store.query(USER, rollups.day_date(rollups.week_start(rollups.day_number(first))), last, rollups.WEEK)
+    print(f"\nDashboard queries for {first} .. {last} ({len(daily)} daily, {len(weekly)} weekly rows):")
+    print(f"{'Query':<22} | {'Rollups':>10} | {'From entries':>12} | {'Speed-up':>8}")
+    print("-" * 62)
+    raw_ms = median_ms(lambda: rollups.recompute({USER: cols}), max(3, args.repeats // 5))
+    for name, query in (
+        ("daily rows", lambda: store.query(USER, first, last)),
+        ("weekly rows", lambda: store.query(USER, first, last, rollups.WEEK)),
+        ("yearly total", lambda: store.totals(USER, first, last)),
+    ):
+        rollup_ms = median_ms(query, args.repeats)
+        print(f"{name:<22} | {rollup_ms:>7.3f} ms | {raw_ms:>9.1f} ms | {raw_ms / rollup_ms:>7.0f}x")
+    print("\n'From entries' recomputes from per-second columns already in memory;"
+          " reading the logs from disk would add to it.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compare the fast face-presence engine against the original detector.
+
+Runs both detectors over dataset_sample at each requested width and prints
+how often they agree and the average time per frame. Widths above
+FACE_DETECT_WIDTH (including the native 1920 px of the dataset) exercise
+the downscaled detection and the mapping of boxes and minSize back to the
+frame; at or below it the fast engine detects on the frame as is.
+
+Usage (from backend/):
+    python others/compare_face_presence.py [--widths 0 1280 640] [--track]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from face_presence import FaceTracker, detect_face, detect_face_legacy  # noqa: E402
+from frame_ingest import IMAGE_SUFFIXES  # noqa: E402
+
+DATASET = Path(__file__).resolve().parents[2] / "dataset_sample"
+
+
+def compare(frames, width, track):
+    """Run both detectors on (path, gray) frames resized to `width` (0 = native)."""
+    agree, legacy_time, fast_time = 0, 0.0, 0.0
+    trackers = {}
+    for path, gray in frames:
+        if width:
+            height = int(gray.shape[0] * width / gray.shape[1])
+            gray = cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA)
+        tracker = trackers.setdefault(path.parent, FaceTracker()) if track else None
+
+        started = time.perf_counter()
+        legacy = detect_face_legacy(gray)
+        legacy_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        fast = detect_face(gray, tracker)
+        fast_time += time.perf_counter() - started
+
+        agree += legacy == fast
+        if legacy != fast:
+            print(f"  ✗ {path.parent.parent.name}/{path.parent.name}/{path.name}: legacy={legacy} fast={fast}")
+    return agree, legacy_time, fast_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data", default=str(DATASET), help="Folder with split/class/image.jpg")
+    parser.add_argument("--widths", type=int, nargs="+", default=[0, 1280, 640],
+                        help="Frame widths to compare at (0 = native resolution)")
+    parser.add_argument("--track", action="store_true", help="Reuse one FaceTracker per class folder")
+    args = parser.parse_args()
+
+    paths = sorted(p for p in Path(args.data).glob("*/*/*") if p.suffix.lower() in IMAGE_SUFFIXES)
+    frames = [(path, cv2.cvtColor(cv2.imread(str(path)), cv2.COLOR_BGR2GRAY)) for path in paths]
+    n = len(frames) or 1
+    print(f"Frames: {len(frames)} | FACE_DETECT_WIDTH: {config.FACE_DETECT_WIDTH}")
+
+    for width in args.widths:
+        label = f"{width} px" if width else f"native ({frames[0][1].shape[1]} px)" if frames else "native"
+        print(f"\nWidth {label}:")
+        agree, legacy_time, fast_time = compare(frames, width, args.track)
+        print(f"  Agreement: {agree}/{len(frames)} ({agree / n * 100:.1f}%)")
+        print(f"  Legacy:    {legacy_time / n * 1000:.1f} ms/frame")
+        print(f"  Fast:      {fast_time / n * 1000:.1f} ms/frame ({legacy_time / max(fast_time, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare the run-length focus log store against the JSON focus logs.
+
+Converts session_*_focus_log.json files to focus_log_store files, checks
+that every entry survives the round trip unchanged, and prints file size
+and load time for both formats. Without log files, --sessions logs are
+first written with focus_log_generator.py (deterministic for a --seed).
+
+Usage (from backend/):
+    python others/compare_focus_log_store.py [--sessions 10] [--seconds 2400]
+    python others/compare_focus_log_store.py ../session_1_focus_log.json ...
+        [--out-dir .] [--repeats 20]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from focus_log_generator import START, write_shard  # noqa: E402
+from focus_log_store import FocusLog  # noqa: E402
+
+
+def best_time(fn, repeats):
+    """Fastest of `repeats` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("logs", nargs="*", help="JSON focus logs (default: generate --sessions logs)")
+    parser.add_argument("--sessions", type=int, default=10, help="Generated logs when none are given")
+    parser.add_argument("--seconds", type=int, default=2400, help="Entries per generated log")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", default=".", help="Where to write generated logs and the .dlog files")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed loads per file (best is reported)")
+    args = parser.parse_args()
+
+    logs = args.logs
+    os.makedirs(args.out_dir, exist_ok=True)
+    if not logs:
+        write_shard((0, args.sessions, {
+            "format": "json", "out_dir": args.out_dir, "seconds": args.seconds,
+            "start": START, "sessions_per_day": 2, "seed": args.seed,
+        }))
+        logs = [str(Path(args.out_dir) / f"session_{i:06d}_focus_log.json") for i in range(args.sessions)]
+
+    print(f"{'Log':<30} | {'Entries':>7} | {'Runs':>5} | {'JSON':>9} | {'Store':>8} | {'Ratio':>6} | "
+          f"{'JSON load':>9} | {'Store load':>10} | {'+ entries':>9}")
+    print("-" * 118)
+    failed = False
+    for json_path in map(Path, logs):
+        text = json_path.read_text()
+        entries = json.loads(text)
+        log = FocusLog.from_entries(entries)
+        store_path = Path(args.out_dir) / (json_path.stem + ".dlog")
+        log.save(store_path)
+
+        loaded = FocusLog.load(store_path)
+        if list(loaded.entries()) != entries:
+            print(f"✗ {json_path.name}: entries changed in the round trip")
+            failed = True
+            continue
+        # focusLogsDummy.py indents; focus_log_generator.py writes one entry per line
+        identical = text in (
+            loaded.to_json(indent=4),
+            "[\n" + ",\n".join(json.dumps(entry) for entry in loaded.entries()) + "\n]\n",
+        )
+
+        json_seconds = best_time(lambda: json.loads(json_path.read_text()), args.repeats)
+        store_seconds = best_time(lambda: FocusLog.load(store_path), args.repeats)
+        expand_seconds = best_time(lambda: list(FocusLog.load(store_path).entries()), args.repeats)
+        json_size, store_size = json_path.stat().st_size, store_path.stat().st_size
+        print(f"{json_path.name:<30} | {len(entries):>7} | {log.run_count:>5} | {json_size:>7} B | "
+              f"{store_size:>6} B | {json_size / store_size:>5.0f}x | {json_seconds * 1000:>6.2f} ms | "
+              f"{store_seconds * 1000:>7.3f} ms | {expand_seconds * 1000:>6.2f} ms"
+              + ("" if identical else "  (entries equal, JSON text differs)"))
+
+    print("\nStore load reads the columns only; '+ entries' also rebuilds every JSON entry.")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
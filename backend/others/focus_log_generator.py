@@ -0,0 +1,273 @@
+"""
+Generate large synthetic focus logs for load, storage and analytics tests.
+
+Each session is a semi-Markov chain over the six DLEF classes: a class
+holds for a log-normally distributed dwell time, then moves to another
+class with the probabilities in TRANSITIONS. Every second of a class is
+logged as the response /deepwork_focus gives for it (responses.
+response_for_class), with a per-entry confidence around the class mean,
+in the session_*_focus_log.json schema (see focus_log_store.py).
+
+Sessions are written one file each, streamed in chunks of entries, so
+memory stays constant however long or numerous they are. Work is sharded
+over processes; session i always uses the seed (--seed, i), so the output
+does not depend on --workers.
+
+Formats:
+    json   JSON array, one compact entry per line (json.load compatible)
+    dlog   focus_log_store run-length file
+
+Usage (from backend/):
+    python others/focus_log_generator.py --sessions 4000 [--seconds 2400]
+        [--format json|dlog] [--out-dir generated_logs] [--workers 4] [--seed 0]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from focus_log_store import FocusLog, to_epoch_seconds  # noqa: E402
+from responses import response_for_class  # noqa: E402
+
+CLASSES = ("Focused", "BadPosture", "LookingAway", "Drowsy", "Absent", "Phone")
+
+# Dwell time per visit: log-normal with this median (s) and sigma
+DWELL_MEDIAN = np.array([240.0, 90.0, 6.0, 20.0, 60.0, 40.0])
+DWELL_SIGMA = np.array([0.9, 0.8, 0.7, 0.8, 1.0, 0.9])
+
+# Next-class probabilities when a dwell ends (rows: from, columns: to)
+TRANSITIONS = np.array([
+    # Focused BadPost LookAw Drowsy Absent Phone
+    [0.00,    0.35,   0.35,  0.08,  0.10,  0.12],  # Focused
+    [0.60,    0.00,   0.15,  0.10,  0.05,  0.10],  # BadPosture
+    [0.70,    0.15,   0.00,  0.00,  0.05,  0.10],  # LookingAway
+    [0.45,    0.15,   0.10,  0.00,  0.20,  0.10],  # Drowsy
+    [0.60,    0.10,   0.05,  0.05,  0.00,  0.20],  # Absent
+    [0.65,    0.10,   0.10,  0.00,  0.15,  0.00],  # Phone
+])
+INITIAL = np.array([0.80, 0.10, 0.00, 0.00, 0.10, 0.00])
+
+# Per-entry confidence: normal around the class mean, clipped, in hundredths
+CONFIDENCE_MEAN = np.array([0.95, 0.85, 0.80, 0.80, 0.99, 0.90])
+CONFIDENCE_STD = 0.04
+
+CHUNK_ENTRIES = 65536  # Entries formatted per write
+SESSION_GAP_SECONDS = 4 * 3600  # Between the sessions of one day
+START = "2024-03-15T09:00:00"
+_EPOCH = datetime(1970, 1, 1)
+
+
+def class_responses():
+    """State, reason and focusLevel logged for each class (confidence aside)."""
+    responses = [response_for_class(name, 1.0) for name in CLASSES]
+    return [(r["focusState"], r["reason"], r["focusLevel"]) for r in responses]
+
+
+def session_rng(seed, index):
+    return np.random.default_rng([seed, index])
+
+
+def session_runs(rng, seconds):
+    """
+    Class visits covering exactly `seconds` entries.
+
+    Returns:
+        tuple: (class index, run length) arrays
+    """
+    cumulative = np.cumsum(TRANSITIONS, axis=1)
+    # Rows may sum to 1 - 1 ulp; rescale so that every u in [0, 1) maps to a class
+    cumulative /= cumulative[:, -1:]
+    classes, lengths = [], []
+    current = int(rng.choice(len(CLASSES), p=INITIAL))
+    total = 0
+    while total < seconds:
+        # Draw a batch of dwell noise and transition variates at a time
+        noise = rng.standard_normal(64)
+        steps = rng.random(64)
+        for z, u in zip(noise.tolist(), steps.tolist()):
+            dwell = max(1, int(round(DWELL_MEDIAN[current] * np.exp(DWELL_SIGMA[current] * z))))
+            dwell = min(dwell, seconds - total)
+            classes.append(current)
+            lengths.append(dwell)
+            total += dwell
+            if total >= seconds:
+                break
+            current = int(np.searchsorted(cumulative[current], u, side="right"))
+    return np.array(classes, dtype=np.int64), np.array(lengths, dtype=np.int64)
+
+
+def session_confidences(rng, classes, lengths):
+    """Per-entry confidences (multiples of 0.01) for a session's runs."""
+    means = np.repeat(CONFIDENCE_MEAN[classes], lengths)
+    values = np.clip(means + rng.normal(0.0, CONFIDENCE_STD, len(means)), 0.5, 1.0)
+    return np.rint(values * 100) / 100
+
+
+def session_start(rng, index, start_seconds, sessions_per_day):
+    """Epoch second of the first entry of session `index`."""
+    day, slot = divmod(index, sessions_per_day)
+    return start_seconds + day * 86400 + slot * SESSION_GAP_SECONDS + int(rng.integers(0, 1800))
+
+
+def generate_session(seed, index, seconds, start_seconds, sessions_per_day):
+    """(start epoch second, class per run, run lengths, confidence per entry) of one session."""
+    rng = session_rng(seed, index)
+    first = session_start(rng, index, start_seconds, sessions_per_day)
+    classes, lengths = session_runs(rng, seconds)
+    return first, classes, lengths, session_confidences(rng, classes, lengths)
+
+
+# =============================================================================
+# IN-MEMORY FIXTURE
+# =============================================================================
+
+def generate_columns(sessions, seconds, seed=0, start=START, sessions_per_day=2):
+    """
+    Sessions as analytics.FocusColumns, without touching the disk.
+
+    Same sessions, seeds and values as the files written by main().
+    """
+    from analytics import NO_REASON, FocusColumns
+
+    responses = class_responses()
+    reasons = sorted({reason for _, reason, _ in responses if reason is not None})
+    class_focused = np.array([state == "Focused" for state, _, _ in responses])
+    class_reason = np.array([reasons.index(r) if r is not None else NO_REASON for _, r, _ in responses], dtype=np.int16)
+
+    start_seconds = to_epoch_seconds(start)
+    parts = []
+    for index in range(sessions):
+        first, classes, lengths, confidences = generate_session(seed, index, seconds, start_seconds, sessions_per_day)
+        parts.append((
+            first + np.arange(seconds, dtype=np.int64),
+            np.repeat(class_focused[classes], lengths),
+            np.repeat(class_reason[classes], lengths),
+            confidences.astype(np.float32),
+        ))
+    columns = [np.concatenate(column) for column in zip(*parts)] if parts else [np.empty(0)] * 4
+    return FocusColumns([f"session_{i}" for i in range(sessions)], [seconds] * sessions, *columns, reasons=reasons)
+
+
+# =============================================================================
+# STREAMING WRITERS
+# =============================================================================
+
+def _entry_templates(responses):
+    """Per-class JSON text around the timestamp and confidence, as json.dumps writes it."""
+    templates = []
+    for state, reason, focus_level in responses:
+        tail = f', "focusLevel": {json.dumps(focus_level)}'
+        if reason is not None:
+            tail += f', "reason": {json.dumps(reason)}'
+        templates.append(('{"timestamp": "', f'", "state": {json.dumps(state)}, "confidence": ', tail + "}"))
+    return templates
+
+
+def write_json(path, first, classes, lengths, confidences, responses):
+    """Stream one session as a JSON array, CHUNK_ENTRIES entries at a time."""
+    templates = _entry_templates(responses)
+    confidence_text = [repr(k / 100) for k in range(101)]
+    entry_class = np.repeat(classes, lengths)
+    total = len(entry_class)
+    with open(path, "w") as f:
+        f.write("[\n")
+        for begin in range(0, total, CHUNK_ENTRIES):
+            end = min(begin + CHUNK_ENTRIES, total)
+            stamps = np.datetime_as_string(
+                (first + np.arange(begin, end, dtype=np.int64)).astype("datetime64[s]"), unit="s",
+            ).tolist()
+            hundredths = np.rint(confidences[begin:end] * 100).astype(np.int64).tolist()
+            lines = []
+            for stamp, cls, k in zip(stamps, entry_class[begin:end].tolist(), hundredths):
+                head, middle, tail = templates[cls]
+                lines.append(head + stamp + middle + confidence_text[k] + tail)
+            if begin:
+                f.write(",\n")
+            f.write(",\n".join(lines))
+        f.write("\n]\n")
+
+
+def write_dlog(path, first, classes, lengths, confidences, responses):
+    """Write one session as a focus_log_store file, one append_run per class visit."""
+    log = FocusLog()
+    offset = 0
+    for cls, length in zip(classes.tolist(), lengths.tolist()):
+        state, reason, focus_level = responses[cls]
+        timestamp = _EPOCH + timedelta(seconds=first + offset)
+        log.append_run(timestamp, state, confidences[offset:offset + length], reason, focus_level)
+        offset += length
+    log.save(path)
+
+
+WRITERS = {"json": (write_json, "json"), "dlog": (write_dlog, "dlog")}
+
+
+def write_shard(task):
+    """Worker: generate and write sessions [begin, end); returns (entries, bytes)."""
+    begin, end, options = task
+    write, suffix = WRITERS[options["format"]]
+    responses = class_responses()
+    start_seconds = to_epoch_seconds(options["start"])
+    entries = size = 0
+    for index in range(begin, end):
+        first, classes, lengths, confidences = generate_session(
+            options["seed"], index, options["seconds"], start_seconds, options["sessions_per_day"],
+        )
+        path = Path(options["out_dir"]) / f"session_{index:06d}_focus_log.{suffix}"
+        write(path, first, classes, lengths, confidences, responses)
+        entries += int(lengths.sum())
+        size += path.stat().st_size
+    return entries, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--seconds", type=int, default=2400, help="Entries per session (1 per second)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="json")
+    parser.add_argument("--out-dir", default="generated_logs")
+    parser.add_argument("--start", default=START, help="First session's day and time")
+    parser.add_argument("--sessions-per-day", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-size", type=int, default=50, help="Sessions per worker task")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    options = {
+        "format": args.format, "out_dir": args.out_dir, "seconds": args.seconds, "start": args.start,
+        "sessions_per_day": args.sessions_per_day, "seed": args.seed,
+    }
+    tasks = [
+        (begin, min(begin + args.shard_size, args.sessions), options)
+        for begin in range(0, args.sessions, args.shard_size)
+    ]
+    print(f"Writing {args.sessions:,} sessions x {args.seconds:,} entries ({args.format}) "
+          f"to {args.out_dir} with {args.workers} workers...")
+
+    started = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(write_shard, tasks))
+    else:
+        results = [write_shard(task) for task in tasks]
+    elapsed = time.perf_counter() - started
+
+    entries = sum(e for e, _ in results)
+    size = sum(s for _, s in results)
+    print(f"Entries: {entries:,} | Size: {size / 2**20:.1f} MB | "
+          f"{elapsed:.1f} s ({entries / elapsed / 1e6:.2f} M entries/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Replay a recorded session through the DLEF pipeline without a browser.
+
+Reads a video file or a folder of images, samples frames the way the timer
+window does (1 fps by default), runs each through process_frame() exactly as
+/deepwork_focus would, and writes a per-frame timeline in the
+session_*_focus_log.json format (see focusLogsDummy.py):
+
+    [{"timestamp": "2024-03-15T10:00:00", "state": "Focused",
+      "confidence": 0.98, "focusLevel": 10}, ...]   # "reason" when distracted
+
+The focusLevel field is an addition: the committed session_*_focus_log.json
+files do not have it. focus_log_store.py and analytics.py treat it as
+optional, so both kinds of log load the same way.
+
+Frames are decoded by a reader thread into a bounded queue (--prefetch), so
+decoding overlaps inference without buffering the whole recording. By default
+frames are paced at their recorded time, as a live webcam would deliver them;
+--fast processes them as quickly as possible for bulk regression runs.
+
+Usage (from backend/):
+    python others/replay_session.py recording.mp4 [--fast] [--sample-fps 1]
+        [--start 2024-03-15T10:00:00] [--output session_x_focus_log.json]
+    python others/replay_session.py frames_dir/ --fps 1 --fast
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_ingest import IMAGE_SUFFIXES, decode_frame  # noqa: E402
+
+_END = object()
+
+
+def video_frames(path, sample_fps):
+    """Yield (seconds, frame) from a video, keeping at most sample_fps frames per second."""
+    capture = cv2.VideoCapture(str(path))
+    if not capture.isOpened():
+        raise ValueError(f"Could not open video: {path}")
+    interval = 1.0 / sample_fps
+    next_time = 0.0
+    try:
+        while True:
+            if not capture.grab():
+                break
+            seconds = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if seconds + 1e-6 < next_time:
+                continue  # Skipped frames are grabbed but never decoded
+            ok, frame = capture.retrieve()
+            if not ok:
+                break
+            next_time += interval
+            yield seconds, frame
+    finally:
+        capture.release()
+
+
+def image_frames(folder, fps):
+    """Yield (seconds, frame) for the images of a folder in name order, fps apart."""
+    paths = sorted(p for p in Path(folder).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    for index, path in enumerate(paths):
+        yield index / fps, decode_frame(path.read_bytes())
+
+
+def prefetched(frames, depth):
+    """Run a frame generator in a reader thread, at most `depth` frames ahead."""
+    buffer = queue.Queue(maxsize=depth)
+    errors = []
+
+    def read():
+        try:
+            for item in frames:
+                buffer.put(item)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            buffer.put(_END)
+
+    threading.Thread(target=read, daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is _END:
+            break
+        yield item
+    if errors:
+        raise errors[0]
+
+
+def timeline_entry(response, timestamp):
+    """One focus-log entry (session_*_focus_log.json schema) for a pipeline response."""
+    entry = {
+        "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S"),
+        "state": response["focusState"],
+        "confidence": response["confidence"],
+        "focusLevel": response["focusLevel"],
+    }
+    if response.get("reason"):
+        entry["reason"] = response["reason"]
+    return entry
+
+
+def replay(frames, start, realtime=True):
+    """
+    Run frames through the pipeline with one fresh session.
+
+    Args:
+        frames: Iterable of (seconds since start, BGR frame)
+        start (datetime): Wall-clock time of the first frame
+        realtime (bool): Pace frames at their recorded time
+
+    Returns:
+        tuple: (timeline entries, L3 window summaries, stats dict)
+    """
+    import config
+    import model_registry
+    from pipeline import process_frame
+    from session_store import FocusSession
+
+    model_registry.warm_up(config.WARMUP_MODELS)  # Keep model loading out of the fps figure
+    session = FocusSession("replay")
+    timeline, windows = [], []
+    media_seconds = 0.0
+    started = time.perf_counter()
+    for seconds, frame in frames:
+        if realtime:
+            delay = seconds - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+        with session.lock:
+            response = process_frame(frame, session)
+        timeline.append(timeline_entry(response, start + timedelta(seconds=seconds)))
+        if "window" in response:
+            windows.append(response["window"])
+        media_seconds = seconds
+    elapsed = time.perf_counter() - started
+    return timeline, windows, {
+        "frames": len(timeline),
+        "seconds": elapsed,
+        "fps": len(timeline) / elapsed if elapsed else 0.0,
+        "realtimeFactor": media_seconds / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help="Video file or folder of images")
+    parser.add_argument("--fast", action="store_true", help="Do not pace frames (faster than real time)")
+    parser.add_argument("--sample-fps", type=float, default=1.0, help="Frames per second taken from a video")
+    parser.add_argument("--fps", type=float, default=1.0, help="Frame rate of an image folder")
+    parser.add_argument("--prefetch", type=int, default=8, help="Decoded frames buffered ahead")
+    parser.add_argument("--start", default=None, help="Timestamp of the first frame (default: now)")
+    parser.add_argument("--output", default=None, help="Timeline file (default: session_<name>_focus_log.json)")
+    parser.add_argument("--windows-output", default=None, help="Also write the L3 window summaries here")
+    args = parser.parse_args()
+
+    source = Path(args.source)
+    if source.is_dir():
+        frames = image_frames(source, args.fps)
+    elif source.exists():
+        frames = video_frames(source, args.sample_fps)
+    else:
+        sys.exit(f"Not found: {source}")
+
+    start = datetime.strptime(args.start, "%Y-%m-%dT%H:%M:%S") if args.start else datetime.now().replace(microsecond=0)
+    output = args.output or f"session_{source.stem}_focus_log.json"
+
+    mode = "fast" if args.fast else "real time"
+    print(f"Replaying {source} ({mode}, prefetch {args.prefetch})...")
+    timeline, windows, stats = replay(prefetched(frames, args.prefetch), start, realtime=not args.fast)
+
+    with open(output, "w") as f:
+        json.dump(timeline, f, indent=4)
+    if args.windows_output:
+        with open(args.windows_output, "w") as f:
+            json.dump(windows, f, indent=4)
+
+    distracted = sum(entry["state"] == "Distracted" for entry in timeline)
+    print(f"Frames:     {stats['frames']} ({distracted} distracted, {len(windows)} L3 windows)")
+    print(f"Throughput: {stats['fps']:.1f} frames/s ({stats['realtimeFactor']:.1f}x real time)")
+    print(f"Timeline saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
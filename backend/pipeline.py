@@ -0,0 +1,288 @@
+"""
+DLEF - DeepLens Engine for Focus
+Per-Frame Decision Pipeline
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+The DLEF decision for one webcam frame, independent of the transport that
+delivered it. /deepwork_focus and offline tools call process_frame() and
+get back the same response fields.
+
+Decision Priority (DLEF Layers):
+    1. L2a: Absence check (highest priority)
+    2. L2b: Phone check (critical distraction)
+    3. L1: YOLOv11n-cls classification (PyTorch or ONNX Runtime backend)
+    4. L3: Per-session window summary over the per-frame results
+"""
+
+import threading
+from collections import Counter
+
+import config
+import metrics
+from absence_model import check_presence, replay_presence
+from batching import MicroBatcher
+from cellphone_model import check_cellphone, replay_cellphone
+from frame_context import as_context
+from model_registry import get_classifier, inference_lock
+from responses import response_for_class
+from result_cache import frame_signature
+from stage_executor import StageExecutor
+
+
+# =============================================================================
+# LAYER 1: PRIMARY CLASSIFICATION (YOLOv11n-cls)
+# =============================================================================
+
+def classify_batch(frames):
+    """
+    L1: Classify a batch of frames in one forward pass.
+
+    Args:
+        frames: List of images (numpy arrays)
+
+    Returns:
+        list: (class_name, confidence) per frame, in input order
+    """
+    classifier = get_classifier()
+    with inference_lock("classifier"):
+        return classifier.predict(frames)
+
+
+# Concurrent requests share forward passes through the micro-batcher
+classifier_batcher = MicroBatcher(
+    classify_batch,
+    max_batch_size=config.CLASSIFIER_MAX_BATCH,
+    max_wait_ms=config.CLASSIFIER_MAX_WAIT_MS,
+    name="l1-classifier-batcher",
+)
+
+
+def classify_frame(frame):
+    """L1: Classify one frame, batched with concurrent requests when enabled."""
+    with metrics.timed("classifier"):
+        if config.CLASSIFIER_BATCHING:
+            return classifier_batcher(frame)
+        return classify_batch([frame])[0]
+
+
+# =============================================================================
+# STAGES
+# =============================================================================
+# Each stage returns a response dict when it decides the frame, or None to
+# defer to the next stage in priority order.
+
+def presence_stage(frame, session):
+    """L2a: Absence check (Priority 1 - Critical)."""
+    with session.presence.lock, metrics.timed("presence"):
+        presence_state, presence_conf, presence_reason = check_presence(frame, session.presence)
+
+    if presence_state == "Absent":
+        return {
+            "focusState": "Distracted",
+            "reason": "Absent",
+            "confidence": round(presence_conf, 2),
+            "focusLevel": 0
+        }
+
+    if presence_state == "Present without Face":
+        return {
+            "focusState": "Distracted",
+            "reason": "Likely Distraction: Full face not visible",
+            "confidence": round(presence_conf, 2),
+            "focusLevel": 5
+        }
+
+    return None
+
+
+def phone_stage(frame, session):
+    """L2b: Phone check (Priority 2 - Critical)."""
+    with session.phone.lock, metrics.timed("phone"):
+        cellphone_state, cellphone_conf = check_cellphone(frame, session.phone)
+
+    if cellphone_state == "Cellphone Present":
+        return {
+            "focusState": "Distracted",
+            "reason": "Phone",
+            "confidence": round(cellphone_conf, 2),
+            "focusLevel": 2
+        }
+
+    return None
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+stage_executor = StageExecutor(max_workers=config.STAGE_WORKERS)
+
+# Stages that update session state; they never run ahead of a decision
+STATEFUL_STAGES = ("phone",)
+
+# Which L1 classes each skippable L2 validator is responsible for
+CASCADE_VALIDATED_CLASSES = {
+    "presence": config.CASCADE_PRESENCE_CLASSES,
+    "phone": config.CASCADE_PHONE_CLASSES,
+}
+
+_cascade_lock = threading.Lock()
+cascade_stats = Counter()
+
+
+def cascade_skips(class_name, confidence):
+    """
+    Decide which L2 validators the cascade may skip for an L1 prediction.
+
+    A validator is skipped when L1 is confident and its top-1 class is not
+    one the validator checks.
+
+    Returns:
+        set: Names of the stages to skip
+    """
+    if confidence < config.CASCADE_CONFIDENCE:
+        return set()
+    return {
+        stage for stage in config.CASCADE_SKIPPABLE
+        if class_name not in CASCADE_VALIDATED_CLASSES.get(stage, ())
+    }
+
+
+def evaluate_frame(frame, session, cascade=None):
+    """
+    Run the DLEF layers on one frame and report how the decision was made.
+
+    Args:
+        frame: Input image (BGR numpy array) or FrameContext; all stages
+            share its derived views (grayscale, RGB)
+        session: FocusSession holding the L2 state for this webcam stream
+        cascade (bool): Use the confidence-gated cascade; defaults to
+            config.CASCADE_MODE
+
+    Returns:
+        dict: {
+            "response": API response (focusState, reason, confidence, focusLevel),
+            "decidedBy": "presence" | "phone" | "classifier",
+            "l1": (class_name, confidence) or None if L1 did not finish,
+            "skipped": names of the L2 stages the cascade skipped,
+            "l2Ran": names of the L2 stages that ran (and updated session state)
+        }
+    """
+    if cascade is None:
+        cascade = config.CASCADE_MODE
+    frame = as_context(frame)
+    l1 = []
+    l2_ran = []
+
+    def run_classifier():
+        l1.append(classify_frame(frame.bgr))
+        return response_for_class(*l1[0])
+
+    def l2_stage(name, stage):
+        def run():
+            l2_ran.append(name)
+            return stage(frame, session)
+        return name, run
+
+    l2_stages = [l2_stage("presence", presence_stage), l2_stage("phone", phone_stage)]
+
+    skipped = set()
+    if cascade:
+        # Cheap L1 first; expensive validators only when they can matter
+        l1_response = run_classifier()
+        skipped = cascade_skips(*l1[0])
+        stages = [stage for stage in l2_stages if stage[0] not in skipped]
+        stages.append(("classifier", lambda: l1_response))
+        with _cascade_lock:
+            cascade_stats["frames"] += 1
+            for name in skipped:
+                cascade_stats["skipped_" + name] += 1
+    else:
+        stages = l2_stages + [("classifier", run_classifier)]
+
+    decided_by, response = stage_executor.run(
+        stages, parallel=config.PARALLEL_STAGES, deferred=STATEFUL_STAGES,
+    )
+    return {
+        "response": response,
+        "decidedBy": decided_by,
+        "l1": l1[0] if l1 else None,
+        "skipped": sorted(skipped),
+        "l2Ran": l2_ran,
+    }
+
+
+def _replay_l2(frame, session, stages):
+    """Advance the cheap L2 state of `stages` for a frame served from the result cache."""
+    if "presence" in stages:
+        with session.presence.lock:
+            replay_presence(frame, session.presence)
+    if "phone" in stages:
+        with session.phone.lock:
+            replay_cellphone(session.phone)
+
+
+def _frame_response(frame, session):
+    """Per-frame response, reusing the previous one for unchanged frames."""
+    if not config.RESULT_CACHE:
+        return evaluate_frame(frame, session)["response"]
+
+    # Visually unchanged frames reuse the previous decision; the L2 stages
+    # that decided it still see the frame, so their history keeps moving
+    signature = frame_signature(frame)
+    cached = session.result_cache.lookup(signature)
+    if cached is not None:
+        _replay_l2(frame, session, session.result_cache.l2_stages)
+        return cached
+    evaluation = evaluate_frame(frame, session)
+    session.result_cache.store(signature, evaluation["response"], evaluation["l2Ran"])
+    return evaluation["response"]
+
+
+def process_frame(frame, session):
+    """
+    Run the DLEF layers on one frame using the given session's state.
+
+    Args:
+        frame: Input image (BGR numpy array) or FrameContext
+        session: FocusSession holding the L2/L3 state for this webcam stream
+
+    Returns:
+        dict: focusState, reason, confidence, focusLevel, plus a 'window'
+        summary (see temporal.py) on every frame that completes an L3 window
+    """
+    # One context per frame: the cache signature and every stage share its views
+    response = _frame_response(as_context(frame), session)
+    if config.L3_ENABLED:
+        summary = session.temporal.update(response)
+        if summary is not None:
+            # Copy: the cached response must stay a plain per-frame result
+            response = dict(response, window=summary)
+    return response
+
+
+def reset_stats():
+    """Clear the in-process stage, batching and cascade counters (after warm-up)."""
+    stage_executor.reset_stats()
+    classifier_batcher.reset_stats()
+    with _cascade_lock:
+        cascade_stats.clear()
+
+
+def cascade_report():
+    """How often each L2 validator was skipped in cascade mode."""
+    with _cascade_lock:
+        frames = cascade_stats["frames"]
+        skipped = {
+            key[len("skipped_"):]: count
+            for key, count in cascade_stats.items() if key.startswith("skipped_")
+        }
+    return {
+        "enabled": config.CASCADE_MODE,
+        "confidenceThreshold": config.CASCADE_CONFIDENCE,
+        "frames": frames,
+        "skipped": skipped,
+        "skipRate": {name: count / frames for name, count in skipped.items()} if frames else {},
+    }
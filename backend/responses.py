@@ -0,0 +1,84 @@
+"""
+DLEF - DeepLens Engine for Focus
+Focus Responses
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+The API response for each L1 class (focusState, reason, confidence,
+focusLevel). Kept free of model imports so offline tools such as the
+focus log generator can use the mapping without loading the inference
+stack.
+"""
+
+
+def get_focus_level(class_name):
+    """
+    Map classification result to focus level (0-10 scale).
+
+    Focus Levels:
+        10 = Fully focused
+        8-9 = Minor issues (bad posture)
+        5-6 = Likely distracted (drowsy, looking away)
+        0-2 = Confirmed distracted (absent, phone)
+    """
+    focus_levels = {
+        "Focused": 10,
+        "BadPosture": 8,
+        "LookingAway": 6,
+        "Drowsy": 6,
+        "Absent": 0,
+        "Phone": 2
+    }
+    return focus_levels.get(class_name, 5)
+
+
+def response_for_class(class_name, confidence):
+    """Map an L1 class to the API response."""
+    if class_name == "Focused":
+        return {
+            "focusState": "Focused",
+            "reason": None,
+            "confidence": round(confidence, 2),
+            "focusLevel": 10
+        }
+
+    if class_name == "BadPosture":
+        return {
+            "focusState": "Focused",  # Not a critical distraction
+            "reason": None,
+            "confidence": round(confidence, 2),
+            "focusLevel": 8
+        }
+
+    if class_name in ["Drowsy", "LookingAway"]:
+        return {
+            "focusState": "Distracted",
+            "reason": "Likely distraction: drowsy/looking away",
+            "confidence": round(confidence, 2),
+            "focusLevel": 6
+        }
+
+    if class_name == "Absent":
+        return {
+            "focusState": "Distracted",
+            "reason": "Likely Distraction: Full face not visible",
+            "confidence": round(confidence, 2),
+            "focusLevel": 5
+        }
+
+    if class_name == "Phone":
+        return {
+            "focusState": "Distracted",
+            "reason": "Phone",
+            "confidence": round(confidence, 2),
+            "focusLevel": 2
+        }
+
+    # === Default fallback ===
+    return {
+        "focusState": "Focused",
+        "reason": None,
+        "confidence": round(confidence, 2),
+        "focusLevel": get_focus_level(class_name)
+    }
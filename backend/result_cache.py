@@ -0,0 +1,133 @@
+"""
+DLEF - DeepLens Engine for Focus
+Temporal Result Cache
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+The timer window posts a frame every second, and during deep work
+consecutive frames are nearly identical. Each session keeps a tiny
+perceptual signature of the last fully processed frame (a 32x24 grayscale
+thumbnail); while new frames stay within a similarity threshold the previous
+result is reused. A full refresh is forced every few frames so a cached
+decision is never more than CACHE_MAX_REUSE frames old.
+
+A hit skips the models but not the session's L2 history: the cache records
+which L2 stages ran on the cached frame, and the pipeline replays their
+cheap updates for every hit (the motion reference moves to the new frame,
+the phone vote and Kalman measurement are repeated). The next full run
+therefore diffs against the previous frame and votes over the same window
+as it would without the cache.
+"""
+
+import threading
+
+import numpy as np
+
+import config
+import metrics
+from frame_context import as_context
+
+SIGNATURE_SIZE = (32, 24)  # (width, height)
+
+
+def frame_signature(frame):
+    """
+    Cheap perceptual signature: downscaled grayscale thumbnail.
+
+    Args:
+        frame: BGR image or FrameContext; the grayscale view it builds is
+            reused by the L2 stages
+    """
+    small = as_context(frame).resized("gray", SIGNATURE_SIZE)
+    return small.astype(np.int16)
+
+
+class ResultCache:
+    """Per-session cache of the last full pipeline result."""
+
+    def __init__(self):
+        self.signature = None
+        self.result = None
+        self.l2_stages = ()  # L2 stages that ran on the cached frame
+        self.reuse_count = 0  # Frames served from cache since last refresh
+
+    def lookup(self, signature):
+        """
+        Return the cached result if the frame is visually unchanged.
+
+        Args:
+            signature: frame_signature() of the incoming frame
+
+        Returns:
+            dict or None: Cached response, or None when a full run is needed
+        """
+        if self.result is None or self.signature is None:
+            cache_stats.record("miss")
+            return None
+        if self.reuse_count >= config.CACHE_MAX_REUSE:
+            cache_stats.record("forced_refresh")
+            return None
+        distance = float(np.mean(np.abs(signature - self.signature)))
+        if distance > config.CACHE_MAX_DISTANCE:
+            cache_stats.record("miss")
+            return None
+        self.reuse_count += 1
+        cache_stats.record("hit", staleness=self.reuse_count)
+        return dict(self.result)
+
+    def store(self, signature, result, l2_stages=()):
+        # The signature is not updated on hits, so slow drift still
+        # triggers a refresh once it exceeds the threshold.
+        self.signature = signature
+        self.result = dict(result)
+        self.l2_stages = tuple(l2_stages)
+        self.reuse_count = 0
+
+
+class CacheStats:
+    """Process-wide hit rate and staleness counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.forced_refreshes = 0
+        self.staleness_total = 0
+        self.staleness_max = 0
+
+    def record(self, outcome, staleness=0):
+        metrics.record_cache_lookup(outcome)
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+                self.staleness_total += staleness
+                self.staleness_max = max(self.staleness_max, staleness)
+            elif outcome == "forced_refresh":
+                self.forced_refreshes += 1
+            else:
+                self.misses += 1
+
+    @property
+    def hit_rate(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.forced_refreshes
+            return self.hits / lookups if lookups else 0.0
+
+    def report(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.forced_refreshes
+            return {
+                "enabled": config.RESULT_CACHE,
+                "maxDistance": config.CACHE_MAX_DISTANCE,
+                "maxReuse": config.CACHE_MAX_REUSE,
+                "hits": self.hits,
+                "misses": self.misses,
+                "forcedRefreshes": self.forced_refreshes,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "meanStalenessFrames": self.staleness_total / self.hits if self.hits else 0.0,
+                "maxStalenessFrames": self.staleness_max,
+            }
+
+
+cache_stats = CacheStats()
@@ -0,0 +1,237 @@
+"""
+DLEF - DeepLens Engine for Focus
+Per-User Daily and Weekly Rollups
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Materialized dashboard totals, so a page load reads a year of history as
+365 small rows instead of re-deriving them from millions of per-second log
+entries. Each (user, day) and (user, week) bucket holds:
+
+    focusSeconds     entries in the "Focused" state (1 entry per second)
+    trackedSeconds   all entries
+    reasons          distracted entries per reason
+    sessions         distinct sessions with at least one entry in the bucket
+
+RollupStore.ingest() takes new log segments (FocusColumns, see
+analytics.py) as they arrive. A segment is grouped by (session, day) with
+whole-array operations, and only those few groups are merged into the
+buckets; later segments of the same session add to the same buckets
+without counting the session twice. recompute() derives the same buckets
+from complete history in one pass; the two always agree exactly.
+
+Days are calendar days of the (naive, local) log timestamps; weeks start
+on Monday and are identified by their Monday.
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+
+import numpy as np
+
+from analytics import NO_REASON
+
+SECONDS_PER_DAY = 86400
+_EPOCH = date(1970, 1, 1)
+
+DAY = "day"
+WEEK = "week"
+
+
+def day_number(value):
+    """Days since 1970-01-01 of a date."""
+    return (value - _EPOCH).days
+
+
+def day_date(number):
+    return _EPOCH + timedelta(days=int(number))
+
+
+def week_start(days):
+    """Monday on or before each day number (1970-01-01 was a Thursday)."""
+    return days - (days + 3) % 7
+
+
+def session_key(session_id):
+    """Session identity in the buckets: ids are compared as strings, so 1 and "1" are one session."""
+    return str(session_id)
+
+
+class Rollup:
+    """Totals of one (user, period) bucket."""
+
+    __slots__ = ("focus_seconds", "tracked_seconds", "reasons", "sessions")
+
+    def __init__(self):
+        self.focus_seconds = 0
+        self.tracked_seconds = 0
+        self.reasons = Counter()
+        self.sessions = set()
+
+    def as_dict(self):
+        return {
+            "focusSeconds": self.focus_seconds,
+            "trackedSeconds": self.tracked_seconds,
+            "focusPercentage": self.focus_seconds / self.tracked_seconds * 100 if self.tracked_seconds else 0.0,
+            "reasons": dict(self.reasons),
+            "sessions": len(self.sessions),
+        }
+
+
+class RollupStore:
+    """
+    Incrementally maintained (user, day) and (user, week) rollups.
+
+    Not thread-safe: feed it from one writer (e.g. the request that saves
+    a session's log) or guard it with a lock.
+    """
+
+    def __init__(self):
+        # user_id -> period -> first day number of the bucket -> Rollup
+        self._users = {}
+        self.segments = 0
+
+    def _buckets(self, user_id, period):
+        periods = self._users.setdefault(user_id, {DAY: {}, WEEK: {}})
+        return periods[period]
+
+    def ingest(self, user_id, cols):
+        """
+        Add a log segment of one user.
+
+        Args:
+            user_id: Owner of every session in the segment
+            cols: FocusColumns with the new entries; a session may continue
+                a session of an earlier segment (same session id)
+        """
+        self.segments += 1
+        if len(cols) == 0:
+            return
+        days = cols.seconds // SECONDS_PER_DAY
+        first_day = int(days.min())
+        span = int(days.max()) - first_day + 1
+        n_reasons = len(cols.reasons)
+
+        # One group per (session, day) in the segment
+        group_codes = cols.session_index.astype(np.int64) * span + (days - first_day)
+        groups, inverse = np.unique(group_codes, return_inverse=True)
+        tracked = np.bincount(inverse, minlength=len(groups))
+        focused = np.bincount(inverse[cols.focused], minlength=len(groups))
+        distracted = ~cols.focused & (cols.reason != NO_REASON)
+        reasons = np.bincount(
+            inverse[distracted] * n_reasons + cols.reason[distracted],
+            minlength=len(groups) * n_reasons,
+        ).reshape(len(groups), n_reasons)
+
+        day_buckets = self._buckets(user_id, DAY)
+        week_buckets = self._buckets(user_id, WEEK)
+        group_days = (groups % span + first_day).tolist()
+        group_sessions = (groups // span).tolist()
+        for g, (day, session) in enumerate(zip(group_days, group_sessions)):
+            session_id = session_key(cols.session_ids[session])
+            reason_counts = {cols.reasons[r]: int(n) for r, n in enumerate(reasons[g]) if n}
+            for buckets, key in ((day_buckets, day), (week_buckets, week_start(day))):
+                rollup = buckets.get(key)
+                if rollup is None:
+                    rollup = buckets[key] = Rollup()
+                rollup.focus_seconds += int(focused[g])
+                rollup.tracked_seconds += int(tracked[g])
+                rollup.reasons.update(reason_counts)
+                rollup.sessions.add(session_id)
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def query(self, user_id, start, end, period=DAY):
+        """
+        Rows of a user's buckets between two dates (inclusive).
+
+        Args:
+            start, end (date): Range; for weeks, the weeks whose Monday is in it
+            period (str): "day" or "week"
+
+        Returns:
+            list: Dicts with 'date' (ISO day or week Monday) plus the totals,
+            for buckets that have data, in date order
+        """
+        buckets = self._users.get(user_id, {}).get(period, {})
+        first, last = day_number(start), day_number(end)
+        rows = []
+        for key in sorted(k for k in buckets if first <= k <= last):
+            row = buckets[key].as_dict()
+            row["date"] = day_date(key).isoformat()
+            rows.append(row)
+        return rows
+
+    def totals(self, user_id, start, end):
+        """One total over the user's days between two dates (inclusive)."""
+        buckets = self._users.get(user_id, {}).get(DAY, {})
+        first, last = day_number(start), day_number(end)
+        total = Rollup()
+        for key, rollup in buckets.items():
+            if first <= key <= last:
+                total.focus_seconds += rollup.focus_seconds
+                total.tracked_seconds += rollup.tracked_seconds
+                total.reasons.update(rollup.reasons)
+                total.sessions |= rollup.sessions
+        return total.as_dict()
+
+    def snapshot(self):
+        """Every bucket as {(user_id, period, first day number): as_dict()}."""
+        return {
+            (user_id, period, key): rollup.as_dict()
+            for user_id, periods in self._users.items()
+            for period, buckets in periods.items()
+            for key, rollup in buckets.items()
+        }
+
+
+def recompute(history):
+    """
+    Build the rollups from complete history in one pass per user.
+
+    Groups entries by day and by week directly, and counts sessions as
+    distinct (session_key, bucket) pairs; the result equals any sequence of
+    ingest() calls over the same entries.
+
+    Args:
+        history: {user_id: FocusColumns with all of the user's entries}
+
+    Returns:
+        RollupStore
+    """
+    store = RollupStore()
+    for user_id, cols in history.items():
+        if len(cols) == 0:
+            continue
+        # Sessions are identified by id; one id may span several segments
+        session_keys, session_codes = np.unique(
+            np.array([session_key(sid) for sid in cols.session_ids]), return_inverse=True,
+        )
+        entry_sessions = session_codes[cols.session_index]
+        distracted = ~cols.focused & (cols.reason != NO_REASON)
+        days = cols.seconds // SECONDS_PER_DAY
+
+        for period, keys in ((DAY, days), (WEEK, week_start(days))):
+            buckets = store._buckets(user_id, period)
+            bucket_keys, inverse = np.unique(keys, return_inverse=True)
+            n = len(bucket_keys)
+            tracked = np.bincount(inverse, minlength=n)
+            focused = np.bincount(inverse[cols.focused], minlength=n)
+            n_reasons = len(cols.reasons)
+            reason_table = np.bincount(
+                inverse[distracted] * n_reasons + cols.reason[distracted], minlength=n * n_reasons,
+            ).reshape(n, n_reasons)
+            n_codes = len(session_keys)
+            pairs = np.unique(inverse * n_codes + entry_sessions)
+
+            for b, key in enumerate(bucket_keys.tolist()):
+                rollup = buckets[key] = Rollup()
+                rollup.tracked_seconds = int(tracked[b])
+                rollup.focus_seconds = int(focused[b])
+                rollup.reasons = Counter({cols.reasons[r]: int(c) for r, c in enumerate(reason_table[b]) if c})
+            for b, session in zip((pairs // n_codes).tolist(), (pairs % n_codes).tolist()):
+                buckets[bucket_keys[b]].sessions.add(str(session_keys[session]))
+    return store
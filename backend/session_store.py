@@ -0,0 +1,117 @@
+"""
+DLEF - DeepLens Engine for Focus
+Per-Session State Store
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+The L2 validators are stateful (motion diff against the previous frame,
+phone vote history, Kalman filter, L3 window). Each webcam session gets its own state
+object so that concurrent users never see each other's frames. Sessions are
+kept in an LRU map that is bounded in size and expires idle entries.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import config
+from absence_model import PresenceState
+from cellphone_model import PhoneState
+from result_cache import ResultCache
+from temporal import TemporalState
+
+
+class FocusSession:
+    """
+    All per-session state used by the DLEF pipeline.
+
+    The lock serialises frames of the same session; frames of different
+    sessions are processed fully in parallel.
+    """
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.lock = threading.Lock()
+        self.presence = PresenceState()
+        self.phone = PhoneState()
+        self.result_cache = ResultCache()
+        self.temporal = TemporalState()
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the session's frame buffers."""
+        return self.presence.nbytes + self.phone.nbytes
+
+
+class SessionStore:
+    """
+    Thread-safe LRU map of session id -> session state with idle expiry.
+
+    Args:
+        factory: Callable taking a session id and returning a new state object
+        max_sessions (int): Maximum number of live sessions (LRU eviction)
+        ttl_seconds (float): Sessions idle for longer than this are dropped
+    """
+
+    def __init__(self, factory=FocusSession, max_sessions=config.SESSION_MAX,
+                 ttl_seconds=config.SESSION_TTL_SECONDS):
+        self._factory = factory
+        self._max_sessions = max_sessions
+        self._ttl = ttl_seconds
+        self._sessions = OrderedDict()  # session_id -> [state, last_seen]
+        self._lock = threading.Lock()
+        self.evicted_lru = 0
+        self.evicted_ttl = 0
+
+    def get(self, session_id):
+        """Return the state for session_id, creating it on first use."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = [self._factory(session_id), now]
+                self._sessions[session_id] = entry
+                while len(self._sessions) > self._max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evicted_lru += 1
+            else:
+                entry[1] = now
+                self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def discard(self, session_id):
+        """Drop a session explicitly (e.g. when the user ends it)."""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self, now):
+        # Entries are ordered by last access, so expired ones sit at the front.
+        while self._sessions:
+            _, (state, last_seen) = next(iter(self._sessions.items()))
+            if now - last_seen <= self._ttl:
+                break
+            self._sessions.popitem(last=False)
+            self.evicted_ttl += 1
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def stats(self):
+        """Snapshot of store occupancy and eviction counters."""
+        with self._lock:
+            states = [entry[0] for entry in self._sessions.values()]
+        return {
+            "active_sessions": len(states),
+            "max_sessions": self._max_sessions,
+            "ttl_seconds": self._ttl,
+            "evicted_lru": self.evicted_lru,
+            "evicted_ttl": self.evicted_ttl,
+            "approx_bytes": sum(getattr(s, "nbytes", 0) for s in states),
+        }
+
+
+# Process-wide store used by the Flask app
+sessions = SessionStore()
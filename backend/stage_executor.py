@@ -0,0 +1,114 @@
+"""
+DLEF - DeepLens Engine for Focus
+Concurrent Stage Executor
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+The DLEF layers are checked in a fixed priority order (Absent > Phone > L1
+classifier): the first layer that reaches a decision wins. Running them one
+after another makes request latency the sum of all stages, although most of
+the work (OpenCV, PyTorch, MediaPipe) runs in native code that releases the
+GIL. The StageExecutor starts all stages at once on a thread pool and merges
+their results in priority order, so latency drops to roughly the slowest
+stage that actually has to be waited for.
+
+Stages that change per-session state (the L2b phone check's vote history,
+Kalman track and hand boxes) can be deferred: they start only once every
+higher-priority stage has returned None, exactly as in sequential mode, so
+their state never depends on the executor mode.
+"""
+
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StageExecutor:
+    """
+    Run prioritised decision stages concurrently.
+
+    A stage is a zero-argument callable returning a decision, or None when
+    it has no opinion and lower-priority stages should decide. Once a stage
+    decides, lower-priority stages that have not started are cancelled and
+    the results of those already running are ignored, so only stateless
+    stages should run ahead of the decision; stateful ones are deferred.
+
+    Args:
+        max_workers (int): Size of the shared thread pool
+    """
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.decided_by = Counter()
+        self.cancelled = 0
+
+    def _get_pool(self):
+        # Created lazily so that forked server workers each get their own pool.
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="dlef-stage"
+                    )
+        return self._pool
+
+    def run(self, stages, parallel=True, deferred=()):
+        """
+        Evaluate stages and return the highest-priority decision.
+
+        Args:
+            stages: List of (name, callable) in priority order (highest first)
+            parallel (bool): Start all stages at once; if False, run them
+                lazily one after another (the original sequential behaviour)
+            deferred: Names of stages that start only after every
+                higher-priority stage returned None (run in the calling
+                thread while the other lower-priority stages keep running)
+
+        Returns:
+            tuple: (stage_name, decision), or (None, None) if no stage decided
+        """
+        if not parallel:
+            for name, fn in stages:
+                decision = fn()
+                if decision is not None:
+                    self._record(name, 0)
+                    return name, decision
+            return None, None
+
+        pool = self._get_pool()
+        futures = [(name, fn, None if name in deferred else pool.submit(fn)) for name, fn in stages]
+        decided = None, None
+        try:
+            for name, fn, future in futures:
+                decision = fn() if future is None else future.result()
+                if decision is not None:
+                    decided = name, decision
+                    break
+        finally:
+            # Drop lower-priority work that has not started yet
+            cancelled = sum(1 for _, _, future in futures if future is not None and future.cancel())
+            self._record(decided[0], cancelled)
+        return decided
+
+    def _record(self, name, cancelled):
+        with self._stats_lock:
+            if name is not None:
+                self.decided_by[name] += 1
+            self.cancelled += cancelled
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.decided_by = Counter()
+            self.cancelled = 0
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "maxWorkers": self.max_workers,
+                "decidedBy": dict(self.decided_by),
+                "cancelledStages": self.cancelled,
+            }
@@ -0,0 +1,138 @@
+"""
+DLEF - DeepLens Engine for Focus
+WebSocket Frame Streaming
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+A persistent alternative to posting one multipart request per second. The
+client opens
+
+    ws://<host>/deepwork_focus/stream?session_id=<id>
+
+sends each webcam frame as a binary JPEG message and receives one JSON text
+message per processed frame with the usual response fields (focusState,
+reason, confidence, focusLevel) plus:
+
+    seq:     Number of the frame this result belongs to (1-based, per connection)
+    dropped: Frames skipped so far because newer ones arrived first
+    window:  L3 summary, present on frames that complete a window
+
+Backpressure: a reader thread keeps only the newest unprocessed frame. If
+the server falls behind, stale frames are dropped instead of queueing up.
+"""
+
+import json
+import threading
+import time
+
+from flask import request
+
+import config
+import metrics
+from frame_ingest import decode_frame
+from pipeline import classifier_batcher, process_frame
+from result_cache import cache_stats
+from session_store import sessions
+
+
+class LatestFrameSlot:
+    """
+    Single-slot mailbox that always holds the newest frame.
+
+    put() never blocks and overwrites an unconsumed frame; get() blocks until
+    a frame is available or the slot is closed.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._cond.notify()
+
+    def get(self):
+        """Return the newest item, or None once the slot is closed and empty."""
+        with self._cond:
+            while self._item is None and not self._closed:
+                self._cond.wait()
+            item, self._item = self._item, None
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+def _read_frames(ws, slot):
+    """Reader thread: drain the socket into the slot as fast as frames arrive."""
+    seq = 0
+    try:
+        while True:
+            message = ws.receive()
+            if message is None:
+                break
+            if isinstance(message, str):
+                continue  # Text messages (e.g. keep-alives) carry no frame
+            seq += 1
+            slot.put((seq, message))
+    except Exception:
+        pass
+    finally:
+        slot.close()
+
+
+def register_streaming(app):
+    """
+    Attach the /deepwork_focus/stream WebSocket route to the Flask app.
+
+    Returns:
+        bool: False if flask-sock is not installed (HTTP endpoint only)
+    """
+    try:
+        from flask_sock import Sock
+    except ImportError:
+        print("⚠️ flask-sock not installed: /deepwork_focus/stream disabled")
+        return False
+
+    sock = Sock(app)
+
+    @sock.route('/deepwork_focus/stream')
+    def deepwork_focus_stream(ws):
+        """DLEF streaming endpoint: binary JPEG frames in, JSON results out."""
+        session_id = request.args.get('session_id') or config.DEFAULT_SESSION_ID
+        slot = LatestFrameSlot()
+        reader = threading.Thread(target=_read_frames, args=(ws, slot), daemon=True)
+        reader.start()
+
+        while True:
+            item = slot.get()
+            if item is None:
+                break
+            seq, data = item
+            started = time.perf_counter()
+            try:
+                with metrics.timed("decode"):
+                    frame = decode_frame(data)
+                # Looked up per frame, as over HTTP: refreshes the session's
+                # TTL/LRU position so a long stream is never evicted under it
+                session = sessions.get(session_id)
+                with session.lock:
+                    result = process_frame(frame, session)
+            except Exception as e:
+                metrics.record_error("websocket", e)
+                result = {"error": str(e)}
+            else:
+                metrics.record_decision(result)
+                metrics.update_gauges(len(sessions), classifier_batcher.queue_depth, cache_stats.hit_rate)
+                metrics.observe_request("websocket", time.perf_counter() - started)
+            ws.send(json.dumps(dict(result, seq=seq, dropped=slot.dropped)))
+
+    return True
@@ -0,0 +1,195 @@
+"""
+DLEF - DeepLens Engine for Focus
+L3: Server-Side Temporal Aggregation
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Per-frame results are noisy; L3 confirms sustained distraction over a
+window of frames. The rules are the ones the timer window used to apply in
+the browser (summarize15Seconds); the page now only displays the 'window'
+summaries computed here:
+
+    Phone >= 3 of 15 frames                    -> Distracted: Phone
+    Absent >= 4, or face not visible >= 6 after
+    three face-not-visible windows in a row    -> Distracted: Absent
+      (the latter enters absent mode, which
+      holds until a Phone window)
+    Face not visible >= 6                      -> Distracted: face not visible
+    Drowsy/looking away >= 8                   -> Distracted: likely distraction
+    otherwise                                  -> Focused
+
+Frames are kept in fixed-size, array-backed ring buffers with a running
+count per category, so adding a frame and reading the counts are O(1).
+"""
+
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+import config
+
+# === Frame Categories ===
+FOCUSED = 0
+ABSENT = 1
+PHONE = 2
+NOT_VISIBLE = 3
+LIKELY = 4
+OTHER = 5
+CATEGORY_NAMES = ("Focused", "Absent", "Phone", "NotVisible", "Likely", "Other")
+
+FACE_NOT_VISIBLE_REASON = "Likely Distraction: Full face not visible"
+LIKELY_REASON = "Likely distraction: drowsy/lookingaway/badposture"
+
+_REASON_CATEGORIES = {
+    "Absent": ABSENT,
+    "Phone": PHONE,
+    FACE_NOT_VISIBLE_REASON: NOT_VISIBLE,
+    LIKELY_REASON: LIKELY,
+    # The reason L1 actually sends for Drowsy/LookingAway (responses.py). The
+    # browser only matched LIKELY_REASON, so its Likely rule could never fire.
+    "Likely distraction: drowsy/looking away": LIKELY,
+}
+
+# === Window Rules ===
+PHONE_MIN = 3
+ABSENT_MIN = 4
+NOT_VISIBLE_MIN = 6
+LIKELY_MIN = 8
+ABSENT_MODE_WINDOWS = 3  # Consecutive face-not-visible windows before absent mode
+
+
+def categorize(result):
+    """Map a per-frame response to an L3 category code."""
+    if result.get("focusState") == "Focused":
+        return FOCUSED
+    return _REASON_CATEGORIES.get(result.get("reason"), OTHER)
+
+
+class RingBuffer:
+    """
+    Fixed-capacity ring of small integer codes with O(1) per-code counts.
+
+    Args:
+        capacity (int): Number of most recent codes kept
+        n_codes (int): Codes are integers in [0, n_codes)
+    """
+
+    def __init__(self, capacity, n_codes):
+        self.capacity = capacity
+        self._codes = np.zeros(capacity, dtype=np.int8)
+        self._counts = [0] * n_codes
+        self._head = 0  # Next write position
+        self._size = 0
+
+    def push(self, code):
+        if self._size == self.capacity:
+            self._counts[self._codes[self._head]] -= 1
+        else:
+            self._size += 1
+        self._codes[self._head] = code
+        self._counts[code] += 1
+        self._head = (self._head + 1) % self.capacity
+
+    def count(self, code):
+        return self._counts[code]
+
+    def clear(self):
+        self._counts = [0] * len(self._counts)
+        self._head = 0
+        self._size = 0
+
+    def values(self):
+        """Codes in arrival order (oldest first)."""
+        if self._size < self.capacity:
+            return self._codes[:self._size].copy()
+        return np.roll(self._codes, -self._head)
+
+    def __len__(self):
+        return self._size
+
+
+class TemporalState:
+    """
+    Per-session L3 engine: a tumbling window of per-frame categories.
+
+    Every `window` frames a summary is emitted and the window restarts, as
+    the timer window did every 15 seconds.
+    """
+
+    def __init__(self, window=None):
+        self.window = RingBuffer(window or config.L3_WINDOW, len(CATEGORY_NAMES))
+        self.details = []  # Per-frame entries of the current window, for display
+        self.recent_reasons = deque(maxlen=ABSENT_MODE_WINDOWS)
+        self.absent_mode = False
+        self.windows_emitted = 0
+
+    def update(self, result):
+        """
+        Add one per-frame result.
+
+        Returns:
+            dict or None: Window summary when the window is complete
+        """
+        self.window.push(categorize(result))
+        self.details.append({
+            "focusState": result.get("focusState"),
+            "reason": result.get("reason") or "-",
+            "focusLevel": result.get("focusLevel", 0),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        })
+        if len(self.window) < self.window.capacity:
+            return None
+        summary = self.summarize()
+        self.window.clear()
+        self.details = []
+        return summary
+
+    def summarize(self):
+        """Apply the L3 rules to the current window."""
+        counts = {name: self.window.count(code) for code, name in enumerate(CATEGORY_NAMES)}
+        phone, absent = counts["Phone"], counts["Absent"]
+        not_visible, likely = counts["NotVisible"], counts["Likely"]
+
+        face_hidden_streak = (
+            len(self.recent_reasons) == ABSENT_MODE_WINDOWS
+            and all(reason == FACE_NOT_VISIBLE_REASON for reason in self.recent_reasons)
+        )
+        face_not_visible_transition = False
+
+        # Absent mode outranks every rule below Phone, so only a Phone window ends it
+        if phone >= PHONE_MIN:
+            focus_state, reason, level = "Distracted", "Phone", 2
+            self.absent_mode = False
+        elif (
+            self.absent_mode
+            or (not_visible >= NOT_VISIBLE_MIN and face_hidden_streak)
+            or absent >= ABSENT_MIN
+        ):
+            focus_state, reason, level = "Distracted", "Absent", 0
+            if not_visible >= NOT_VISIBLE_MIN and face_hidden_streak:
+                self.absent_mode = True
+                face_not_visible_transition = True
+        elif not_visible >= NOT_VISIBLE_MIN:
+            focus_state, reason, level = "Distracted", FACE_NOT_VISIBLE_REASON, 7
+        elif likely >= LIKELY_MIN:
+            focus_state, reason, level = "Distracted", LIKELY_REASON, 6
+        else:
+            focus_state, reason, level = "Focused", None, 10
+
+        self.recent_reasons.append(reason)
+        self.windows_emitted += 1
+
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "focusState": focus_state,
+            "reason": reason,
+            "focusLevel": level,
+            "isFaceNotVisibleTransition": face_not_visible_transition,
+            "absentMode": self.absent_mode,
+            "frames": len(self.window),
+            "focusCount": counts["Focused"],
+            "counts": counts,
+            "details": list(self.details),
+        }
@@ -0,0 +1,118 @@
+"""Vectorized focus log metrics against a plain per-entry Python loop."""
+
+import numpy as np
+import pytest
+
+import analytics
+from analytics import NO_REASON, FocusColumns
+
+REASONS = ["Absent", "Phone", "Likely distraction: drowsy/looking away"]
+
+
+@pytest.fixture
+def cols():
+    """Random sessions (one empty) with state runs and occasional time gaps."""
+    rng = np.random.default_rng(0)
+    lengths = [300, 0, 1, 250, 120]
+    seconds, focused, reason = [], [], []
+    for length in lengths:
+        steps = np.where(rng.random(length) < 0.05, rng.integers(2, 30, length), 1)
+        seconds.append(1_700_000_000 + np.cumsum(steps))
+        is_focused = np.repeat(rng.random(length) < 0.6, rng.integers(1, 20, length))[:length]
+        focused.append(is_focused)
+        reason.append(np.where(is_focused, NO_REASON, rng.integers(0, len(REASONS), length)))
+    return FocusColumns(
+        [f"session_{i}" for i in range(len(lengths))], lengths,
+        np.concatenate(seconds), np.concatenate(focused), np.concatenate(reason),
+        rng.random(sum(lengths)), REASONS,
+    )
+
+
+def loop_metrics(cols, s):
+    """Reference: one Python pass over the entries of session s."""
+    start, end = cols.offsets[s], cols.offsets[s] + cols.lengths[s]
+    focused = cols.focused[start:end].tolist()
+    reasons = cols.reason[start:end].tolist()
+    seconds = cols.seconds[start:end].tolist()
+    counts, streak, longest, episodes = {}, 0, 0, []
+    for i, is_focused in enumerate(focused):
+        contiguous = i > 0 and seconds[i] == seconds[i - 1] + 1
+        if is_focused:
+            streak = streak + 1 if contiguous and focused[i - 1] else 1
+            longest = max(longest, streak)
+        else:
+            counts[reasons[i]] = counts.get(reasons[i], 0) + 1
+            if contiguous and not focused[i - 1]:
+                episodes[-1][1] += 1
+            else:
+                episodes.append([seconds[i], 1, reasons[i]])
+    return counts, longest, episodes
+
+
+def test_metrics_match_the_python_loop(cols):
+    focus = analytics.focus_percentage(cols)
+    counts = analytics.reason_counts(cols)
+    streaks = analytics.longest_focused_streak(cols)
+    episodes = analytics.distraction_episodes(cols)
+
+    for s in range(cols.n_sessions):
+        expected_counts, expected_longest, expected_episodes = loop_metrics(cols, s)
+        start, end = cols.offsets[s], cols.offsets[s] + cols.lengths[s]
+        if cols.lengths[s]:
+            assert focus[s] == pytest.approx(np.mean(cols.focused[start:end]) * 100)
+        else:
+            assert np.isnan(focus[s])
+        assert counts[s].tolist() == [expected_counts.get(r, 0) for r in range(len(REASONS))]
+        assert streaks[s] == expected_longest
+
+        mine = episodes["session"] == s
+        actual = list(zip(episodes["start"][mine].tolist(), episodes["seconds"][mine].tolist(),
+                          episodes["reason"][mine].tolist()))
+        assert actual == [tuple(episode) for episode in expected_episodes]
+
+
+def test_min_episode_length_filters_short_episodes(cols):
+    every = analytics.distraction_episodes(cols)
+    long_only = analytics.distraction_episodes(cols, min_seconds=5)
+    assert sorted(long_only["seconds"].tolist()) == sorted(n for n in every["seconds"].tolist() if n >= 5)
+
+
+def test_rolling_focus_matches_the_python_loop(cols):
+    window = 7
+    rolling = analytics.rolling_focus(cols, window)
+    for s in range(cols.n_sessions):
+        start = cols.offsets[s]
+        focused = cols.focused[start:start + cols.lengths[s]].tolist()
+        expected = [
+            sum(focused[max(0, i - window + 1):i + 1]) * 100.0 / (i + 1 - max(0, i - window + 1))
+            for i in range(len(focused))
+        ]
+        np.testing.assert_allclose(rolling[start:start + cols.lengths[s]], expected, rtol=1e-6)
+
+
+def test_summary_totals(cols):
+    summary = analytics.summarize(cols)
+    assert summary["entries"] == len(cols)
+    assert summary["sessions"] == cols.n_sessions
+    assert summary["focusPercentage"] == pytest.approx(cols.focused.mean() * 100)
+    assert sum(summary["distractionBreakdown"].values()) == int((~cols.focused).sum())
+    assert summary["distractionEpisodes"] == sum(len(loop_metrics(cols, s)[2]) for s in range(cols.n_sessions))
+
+
+def test_columns_from_entries_expands_the_logs():
+    sessions = {
+        "a": [
+            {"timestamp": "2024-03-15T10:00:00", "state": "Focused", "confidence": 0.9, "focusLevel": 10},
+            {"timestamp": "2024-03-15T10:00:01", "state": "Distracted", "confidence": 0.8, "reason": "Phone"},
+            {"timestamp": "2024-03-15T10:00:05", "state": "Distracted", "confidence": 0.7, "reason": "Absent"},
+        ],
+        "b": [{"timestamp": "2024-03-15T11:00:00", "state": "Distracted", "confidence": 0.6, "reason": "Absent"}],
+    }
+    cols = analytics.columns_from_entries(sessions)
+    assert cols.session_ids == ["a", "b"]
+    assert cols.lengths.tolist() == [3, 1]
+    assert cols.focused.tolist() == [True, False, False, False]
+    assert [cols.reasons[r] if r != NO_REASON else None for r in cols.reason.tolist()] == \
+        [None, "Phone", "Absent", "Absent"]
+    assert np.diff(cols.seconds[:3]).tolist() == [1, 4]
+    np.testing.assert_allclose(cols.confidence, [0.9, 0.8, 0.7, 0.6], rtol=1e-6)
@@ -0,0 +1,29 @@
+"""/deepwork_focus request validation."""
+
+import io
+
+import pytest
+
+pytest.importorskip("flask")
+
+from app import app  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.mark.parametrize("body, error", [(b"", "Empty image payload"), (b"not an image", "Could not decode image")])
+def test_bad_raw_payload_is_a_client_error(client, body, error):
+    response = client.post("/deepwork_focus", data=body, content_type="image/jpeg")
+    assert response.status_code == 400
+    assert response.get_json() == {"error": error}
+
+
+def test_bad_multipart_upload_is_a_client_error(client):
+    response = client.post(
+        "/deepwork_focus", data={"image": (io.BytesIO(b"not an image"), "frame.jpg")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 400
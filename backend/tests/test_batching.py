@@ -0,0 +1,74 @@
+"""MicroBatcher: single-item calls from many threads share batched calls."""
+
+import threading
+
+import pytest
+
+from batching import MicroBatcher
+
+
+def test_results_return_to_their_callers():
+    batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_batch_size=4, max_wait_ms=20)
+    results = {}
+
+    def call(i):
+        results[i] = batcher(i, timeout=5)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {i: i * 2 for i in range(20)}
+    stats = batcher.stats()
+    assert stats["items"] == 20
+    assert stats["batches"] == sum(stats["batch_size_histogram"].values())
+    assert max(stats["batch_size_histogram"]) <= 4
+
+
+def test_concurrent_items_share_a_batch():
+    started = threading.Event()
+    release = threading.Event()
+    batch_sizes = []
+
+    def predict(items):
+        started.set()
+        release.wait(5)  # Hold the first batch so the rest queue up behind it
+        batch_sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=20)
+    futures = [batcher.submit(0)]
+    assert started.wait(5)
+    futures += [batcher.submit(i) for i in range(1, 6)]
+    release.set()
+
+    assert [f.result(timeout=5) for f in futures] == list(range(6))
+    assert batch_sizes == [1, 5]
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    def predict(items):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(predict, max_batch_size=4, max_wait_ms=20)
+    futures = [batcher.submit(i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model failed"):
+            future.result(timeout=5)
+    assert batcher.stats()["errors"] >= 1
+
+    # The worker survives the failure
+    batcher.predict_fn = lambda items: items
+    assert batcher(7, timeout=5) == 7
+
+
+def test_reset_stats_forgets_earlier_batches():
+    batcher = MicroBatcher(lambda items: items, max_batch_size=4, max_wait_ms=1)
+    assert batcher(1, timeout=5) == 1
+    batcher.reset_stats()
+    stats = batcher.stats()
+    assert (stats["batches"], stats["items"], stats["batch_size_histogram"]) == (0, 0, {})
+    assert batcher(2, timeout=5) == 2
+    assert batcher.stats()["items"] == 1
@@ -0,0 +1,103 @@
+"""Run-length focus log store: lossless round trips and rejected inputs."""
+
+import json
+
+import numpy as np
+import pytest
+
+from focus_log_store import FocusLog
+
+
+def make_entries():
+    """A short log with runs, a time gap, optional fields and repeated keys."""
+    spans = [
+        ("2024-03-15T10:00:00", "Focused", None, 10, [0.98, 0.97, 0.99]),
+        ("2024-03-15T10:00:03", "Distracted", "Phone", 2, [0.9, 0.91]),
+        ("2024-03-15T10:05:00", "Distracted", "Phone", 2, [0.88]),  # Same key after a gap
+        ("2024-03-15T10:05:01", "Focused", None, None, [1.0, 0.5]),  # No focusLevel
+        ("2024-03-15T10:05:03", "Focused", None, 10, [0.95]),
+    ]
+    entries = []
+    for start, state, reason, level, confidences in spans:
+        second = np.datetime64(start)
+        for offset, confidence in enumerate(confidences):
+            entry = {"timestamp": str(second + offset), "state": state, "confidence": confidence}
+            if level is not None:
+                entry["focusLevel"] = level
+            if reason is not None:
+                entry["reason"] = reason
+            entries.append(entry)
+    return entries
+
+
+def test_entries_round_trip():
+    entries = make_entries()
+    log = FocusLog.from_entries(entries)
+    assert len(log) == len(entries)
+    assert log.run_count == 4  # The gap does not split the Phone run
+    assert list(log.entries()) == entries
+    assert log.to_json() == json.dumps(entries)
+
+
+def test_save_and_load(tmp_path):
+    entries = make_entries()
+    path = tmp_path / "session.dlog"
+    FocusLog.from_entries(entries).save(path)
+
+    loaded = FocusLog.load(path)
+    assert list(loaded.entries()) == entries
+
+    # A loaded log keeps growing as if it had never been saved
+    extra = {"timestamp": "2024-03-15T10:05:04", "state": "Focused", "confidence": 0.96, "focusLevel": 10}
+    loaded.append_entry(extra)
+    expected = FocusLog.from_entries(entries + [extra])
+    assert list(loaded.entries()) == entries + [extra]
+    assert loaded.run_count == expected.run_count
+    assert len(loaded.columns["time_start"]) == len(expected.columns["time_start"])
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "log.json"
+    path.write_text("[]")
+    with pytest.raises(ValueError):
+        FocusLog.load(path)
+
+
+def test_append_run_matches_appends():
+    confidences = [0.9, 0.91, 0.92, 0.5]
+    by_run = FocusLog()
+    by_entry = FocusLog()
+    for log_start, state, reason in (("2024-03-15T10:00:00", "Focused", None),
+                                     ("2024-03-15T10:00:04", "Distracted", "Phone")):
+        by_run.append_run(log_start, state, confidences, reason=reason, focus_level=2)
+        first = np.datetime64(log_start)
+        for offset, confidence in enumerate(confidences):
+            by_entry.append(str(first + offset), state, confidence, reason=reason, focus_level=2)
+
+    assert list(by_run.entries()) == list(by_entry.entries())
+    for name in FocusLog.COLUMNS:
+        np.testing.assert_array_equal(by_run.columns[name].values, by_entry.columns[name].values)
+
+
+@pytest.mark.parametrize("confidence", [0.985, -0.01, 2.56])
+def test_inexact_confidence_is_rejected(confidence):
+    log = FocusLog()
+    with pytest.raises(ValueError):
+        log.append("2024-03-15T10:00:00", "Focused", confidence)
+    with pytest.raises(ValueError):
+        log.append_run("2024-03-15T10:00:00", "Focused", [0.5, confidence])
+    assert len(log) == 0
+
+
+def test_key_table_overflow_raises_without_writing():
+    log = FocusLog()
+    limit = np.iinfo(FocusLog.COLUMNS["run_key"]).max + 1
+    # Fill the key table directly; appending 65536 entries is not needed
+    log.keys = [("Focused", None, level) for level in range(limit)]
+    log._key_codes = {key: code for code, key in enumerate(log.keys)}
+
+    with pytest.raises(ValueError):
+        log.append("2024-03-15T10:00:00", "Distracted", 0.9, reason="Phone")
+    assert len(log) == 0
+    assert log.run_count == 0
+    assert len(log.columns["confidence"]) == 0
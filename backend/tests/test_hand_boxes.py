@@ -0,0 +1,27 @@
+"""Hand boxes from the shared Hands graph do not depend on earlier calls."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("mediapipe")
+cv2 = pytest.importorskip("cv2")
+
+from cellphone_model import find_hand_boxes  # noqa: E402
+
+PHONE_FRAMES = sorted((Path(__file__).resolve().parents[2] / "dataset_sample").glob("*/Phone/*.jpg"))
+
+
+@pytest.mark.skipif(len(PHONE_FRAMES) < 2, reason="dataset_sample Phone frames not available")
+def test_roi_crops_do_not_seed_each_other():
+    frames = [cv2.imread(str(path)) for path in PHONE_FRAMES[:2]]
+    # Phone boxes next to a hand, at different positions, so each crop differs
+    crops = [(frames[0], (1019, 411, 1259, 651)), (frames[1], (1168, 805, 1408, 1045))]
+    frame, bbox = frames[1], (433, 437, 673, 677)
+
+    alone = find_hand_boxes(frame, bbox)
+    assert len(alone)
+    for other_frame, other_bbox in crops:
+        find_hand_boxes(other_frame, other_bbox)
+        np.testing.assert_array_equal(find_hand_boxes(frame, bbox), alone)
@@ -0,0 +1,57 @@
+"""Batched Kalman tracks against the filterpy filter they replace."""
+
+import numpy as np
+import pytest
+
+from kalman_tracker import F, H, P0, Q, R, KalmanTracker
+
+filterpy_kalman = pytest.importorskip("filterpy.kalman")
+
+
+def make_filter():
+    kf = filterpy_kalman.KalmanFilter(dim_x=4, dim_z=2)
+    kf.F, kf.H, kf.P, kf.R, kf.Q = F.copy(), H.copy(), P0.copy(), R.copy(), Q.copy()
+    return kf
+
+
+def test_tracks_match_filterpy():
+    rng = np.random.default_rng(0)
+    n_tracks, n_steps = 5, 40
+    tracker = KalmanTracker(capacity=2)  # Forces growth while adding
+    slots = np.array([tracker.add() for _ in range(n_tracks)])
+    filters = [make_filter() for _ in range(n_tracks)]
+
+    for _ in range(n_steps):
+        z = rng.uniform(0, 640, (n_tracks, 2))
+        positions = tracker.step(slots, z)
+        for kf, measurement in zip(filters, z):
+            kf.predict()
+            kf.update(measurement)
+        np.testing.assert_allclose(positions, [kf.x[:2, 0] for kf in filters], rtol=1e-9, atol=1e-9)
+
+    np.testing.assert_allclose(tracker.x[slots], [kf.x[:, 0] for kf in filters], rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(tracker.P[slots], [kf.P for kf in filters], rtol=1e-9, atol=1e-9)
+
+
+def test_single_slot_predict_update_matches_filterpy():
+    tracker = KalmanTracker()
+    slot = tracker.add()
+    kf = make_filter()
+    for z in ([10.0, 20.0], [12.0, 23.0], [15.0, 25.0]):
+        tracker.predict(slot)
+        position = tracker.update(slot, z)
+        kf.predict()
+        kf.update(np.array(z))
+        np.testing.assert_allclose(position, kf.x[:2, 0], rtol=1e-9, atol=1e-9)
+
+
+def test_removed_slots_are_reused_and_reset():
+    tracker = KalmanTracker(capacity=4)
+    slot = tracker.add()
+    tracker.step(slot, [100.0, 50.0])
+    tracker.remove(slot)
+    assert tracker.active == 0
+
+    assert tracker.add() == slot
+    np.testing.assert_array_equal(tracker.x[slot], np.zeros(4))
+    np.testing.assert_array_equal(tracker.P[slot], P0)
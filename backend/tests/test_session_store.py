@@ -0,0 +1,82 @@
+"""SessionStore: per-session state with LRU eviction and idle expiry."""
+
+import pytest
+
+import session_store
+from session_store import SessionStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store.time, "monotonic", clock)
+    return clock
+
+
+def make_store(**kwargs):
+    return SessionStore(factory=lambda session_id: {"id": session_id}, **kwargs)
+
+
+def test_same_id_returns_same_state(clock):
+    store = make_store(max_sessions=4, ttl_seconds=60)
+    first = store.get("a")
+    assert store.get("a") is first
+    assert store.get("b") is not first
+    assert len(store) == 2
+
+
+def test_least_recently_used_session_is_evicted(clock):
+    store = make_store(max_sessions=2, ttl_seconds=60)
+    a = store.get("a")
+    store.get("b")
+    store.get("a")  # "b" is now the least recently used
+    store.get("c")
+
+    assert len(store) == 2
+    assert store.evicted_lru == 1
+    assert store.get("a") is a
+    assert store.get("b")["id"] == "b"  # Re-created
+    assert store.evicted_lru == 2  # ... which evicted "c"
+
+
+def test_idle_sessions_expire(clock):
+    store = make_store(max_sessions=4, ttl_seconds=60)
+    a = store.get("a")
+    clock.now += 30
+    store.get("b")
+    clock.now += 31  # "a" idle for 61 s, "b" for 31 s
+
+    store.get("b")
+    assert store.evicted_ttl == 1
+    assert len(store) == 1
+    assert store.get("a") is not a
+
+
+def test_access_refreshes_idle_time(clock):
+    store = make_store(max_sessions=4, ttl_seconds=60)
+    a = store.get("a")
+    for _ in range(5):
+        clock.now += 50
+        assert store.get("a") is a
+    assert store.evicted_ttl == 0
+
+
+def test_discard_and_stats(clock):
+    store = make_store(max_sessions=4, ttl_seconds=60)
+    store.get("a")
+    store.get("b")
+    assert store.discard("a")
+    assert not store.discard("a")
+
+    stats = store.stats()
+    assert stats["active_sessions"] == 1
+    assert stats["max_sessions"] == 4
+    assert stats["evicted_lru"] == stats["evicted_ttl"] == 0
@@ -0,0 +1,101 @@
+"""L3 ring buffer counts and the window rules ported from the timer window."""
+
+import numpy as np
+
+from temporal import (
+    ABSENT, FACE_NOT_VISIBLE_REASON, FOCUSED, LIKELY_REASON, PHONE,
+    RingBuffer, TemporalState,
+)
+
+FOCUSED_FRAME = {"focusState": "Focused", "reason": None, "focusLevel": 10}
+PHONE_FRAME = {"focusState": "Distracted", "reason": "Phone", "focusLevel": 2}
+ABSENT_FRAME = {"focusState": "Distracted", "reason": "Absent", "focusLevel": 0}
+HIDDEN_FRAME = {"focusState": "Distracted", "reason": FACE_NOT_VISIBLE_REASON, "focusLevel": 5}
+DROWSY_FRAME = {"focusState": "Distracted", "reason": "Likely distraction: drowsy/looking away", "focusLevel": 3}
+
+
+def run_window(state, frames):
+    """Feed a full window (padded with focused frames) and return its summary."""
+    frames = list(frames) + [FOCUSED_FRAME] * (state.window.capacity - len(frames))
+    summaries = [state.update(frame) for frame in frames]
+    assert all(summary is None for summary in summaries[:-1])
+    return summaries[-1]
+
+
+def test_ring_buffer_counts_follow_wrap_around():
+    ring = RingBuffer(4, 3)
+    codes = [0, 1, 2, 1, 1, 0, 2]
+    for code in codes:
+        ring.push(code)
+
+    kept = codes[-4:]
+    assert len(ring) == 4
+    assert list(ring.values()) == kept
+    assert [ring.count(code) for code in range(3)] == [kept.count(code) for code in range(3)]
+
+    ring.clear()
+    assert len(ring) == 0
+    assert [ring.count(code) for code in range(3)] == [0, 0, 0]
+    ring.push(2)
+    assert list(ring.values()) == [2]
+
+
+def test_ring_buffer_matches_a_sliding_window():
+    rng = np.random.default_rng(0)
+    ring = RingBuffer(15, 6)
+    history = []
+    for code in rng.integers(0, 6, 200):
+        ring.push(int(code))
+        history.append(int(code))
+        window = history[-15:]
+        assert [ring.count(c) for c in range(6)] == [window.count(c) for c in range(6)]
+
+
+def test_window_rules():
+    assert run_window(TemporalState(15), [PHONE_FRAME] * 3)["reason"] == "Phone"
+    assert run_window(TemporalState(15), [PHONE_FRAME] * 2)["focusState"] == "Focused"
+    assert run_window(TemporalState(15), [ABSENT_FRAME] * 4)["reason"] == "Absent"
+    assert run_window(TemporalState(15), [HIDDEN_FRAME] * 6)["reason"] == FACE_NOT_VISIBLE_REASON
+    # Phone outranks Absent within one window
+    assert run_window(TemporalState(15), [PHONE_FRAME] * 3 + [ABSENT_FRAME] * 5)["reason"] == "Phone"
+
+
+def test_drowsy_reason_counts_as_likely():
+    summary = run_window(TemporalState(15), [DROWSY_FRAME] * 8)
+    assert summary["reason"] == LIKELY_REASON
+    assert summary["counts"]["Likely"] == 8
+
+
+def test_absent_mode_holds_until_a_phone_window():
+    state = TemporalState(15)
+    for _ in range(3):
+        assert run_window(state, [HIDDEN_FRAME] * 6)["reason"] == FACE_NOT_VISIBLE_REASON
+
+    summary = run_window(state, [HIDDEN_FRAME] * 6)
+    assert summary["reason"] == "Absent"
+    assert summary["isFaceNotVisibleTransition"]
+    assert summary["absentMode"]
+
+    # A fully visible, focused window does not end absent mode
+    summary = run_window(state, [])
+    assert summary["reason"] == "Absent"
+    assert not summary["isFaceNotVisibleTransition"]
+
+    summary = run_window(state, [PHONE_FRAME] * 3)
+    assert summary["reason"] == "Phone"
+    assert not summary["absentMode"]
+    assert run_window(state, [])["focusState"] == "Focused"
+
+
+def test_summary_carries_the_window_details():
+    state = TemporalState(15)
+    summary = run_window(state, [PHONE_FRAME, ABSENT_FRAME])
+    assert summary["frames"] == 15
+    assert summary["focusCount"] == 13
+    assert len(summary["details"]) == 15
+    assert [d["reason"] for d in summary["details"][:3]] == ["Phone", "Absent", "-"]
+    # The next window starts empty
+    assert state.update(FOCUSED_FRAME) is None
+    assert len(state.details) == 1
+    assert state.window.count(FOCUSED) == 1
+    assert state.window.count(PHONE) == state.window.count(ABSENT) == 0
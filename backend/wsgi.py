@@ -0,0 +1,56 @@
+"""
+DLEF - DeepLens Engine for Focus
+Production WSGI Entry Point
+
+Author: Nafis Aslam
+Project: DeepWork AI
+
+Run with Gunicorn (settings in gunicorn.conf.py):
+
+    cd backend
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+With preload_app the master imports this module once. The fork-safe models
+(PyTorch weights) are loaded here, before the workers are forked, so all
+workers share one copy of the weights copy-on-write. gc.freeze() moves the
+loaded objects out of the garbage collector's reach so that collections in
+the workers do not write to (and thereby copy) the shared pages.
+
+Each worker then calls warm_up_worker() before it accepts traffic.
+"""
+
+import gc
+
+import numpy as np
+
+import config
+import metrics
+import model_registry
+from app import app
+from pipeline import evaluate_frame, reset_stats
+from session_store import FocusSession
+
+if config.PRELOAD_MODELS:
+    model_registry.load_all(model_registry.fork_safe_models())
+    gc.freeze()
+
+application = app
+
+
+def warm_up_worker():
+    """
+    Per-worker warm-up, run after fork and before serving.
+
+    Builds the models that cannot be shared across fork, runs one throwaway
+    inference per model, then pushes a blank frame through the whole
+    pipeline to start the stage pool and the classifier micro-batcher.
+    Those frames are not traffic: metrics are suspended while they run and
+    the /stats counters are cleared afterwards.
+    """
+    model_registry.warm_up(config.WARMUP_MODELS)
+    blank = np.zeros((480, 640, 3), dtype=np.uint8)
+    session = FocusSession("warmup")
+    with metrics.suspended():
+        for _ in range(2):  # The first frame of a session only initialises L2 state
+            evaluate_frame(blank, session)
+    reset_stats()
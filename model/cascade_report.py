@@ -0,0 +1,206 @@
+"""
+================================================================================
+DLEF Cascade Mode Report
+DeepLens Engine for Focus - Stage Skipping vs. Accuracy
+
+Author: Nafis Aslam
+Project: DeepWork AI
+Institution: Universiti Sains Malaysia
+
+Description:
+    Runs every labeled image through the full DLEF pipeline twice - once in
+    the default mode (all L2 validators on every frame) and once in the
+    confidence-gated cascade mode - and reports how often each validator was
+    skipped and what that costs in accuracy.
+
+    Pipeline responses are mapped back to DLEF classes via focusLevel; Drowsy
+    and LookingAway share one response and are scored as a single class.
+
+Usage:
+    python cascade_report.py
+
+Output:
+    - Console: Skip rates, accuracy of both modes, disagreements
+    - File: cascade_report.json (saved in current directory)
+================================================================================
+"""
+
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import config  # noqa: E402
+from frame_ingest import IMAGE_SUFFIXES, decode_frame  # noqa: E402
+from pipeline import evaluate_frame  # noqa: E402
+from session_store import FocusSession  # noqa: E402
+
+
+# focusLevel -> DLEF class as scored by this report
+LEVEL_TO_LABEL = {
+    10: "Focused",
+    8: "BadPosture",
+    6: "Drowsy/LookingAway",
+    5: "Absent",
+    0: "Absent",
+    2: "Phone",
+}
+
+
+def true_label(class_name):
+    return "Drowsy/LookingAway" if class_name in ("Drowsy", "LookingAway") else class_name
+
+
+def response_label(response):
+    return LEVEL_TO_LABEL.get(response["focusLevel"], "Unknown")
+
+
+def load_frame(path):
+    """Decode an image the same way /deepwork_focus does."""
+    with open(path, "rb") as f:
+        return decode_frame(f.read())
+
+
+def iter_labeled_images(data_path):
+    """Yield (class_name, image_path) for every image under class subfolders."""
+    for class_folder in sorted(Path(data_path).iterdir()):
+        if not class_folder.is_dir() or class_folder.name.startswith('.'):
+            continue
+        for img_file in sorted(class_folder.glob("*")):
+            if img_file.suffix.lower() in IMAGE_SUFFIXES:
+                yield class_folder.name, img_file
+
+
+def run_mode(samples, cascade):
+    """Evaluate all samples in one mode; one session per class folder."""
+    sessions = {}
+    outcomes = []
+    started = time.perf_counter()
+    for class_name, img_file, frame in samples:
+        session = sessions.setdefault(class_name, FocusSession(f"{class_name}-{cascade}"))
+        outcomes.append(evaluate_frame(frame, session, cascade=cascade))
+    elapsed = time.perf_counter() - started
+    return outcomes, elapsed
+
+
+def summarize(samples, outcomes):
+    correct = 0
+    per_class = defaultdict(lambda: {"total": 0, "correct": 0})
+    for (class_name, _, _), outcome in zip(samples, outcomes):
+        label = true_label(class_name)
+        hit = response_label(outcome["response"]) == label
+        correct += hit
+        per_class[label]["total"] += 1
+        per_class[label]["correct"] += hit
+    total = len(samples)
+    return {
+        "accuracy": (correct / total * 100) if total else 0.0,
+        "perClass": {
+            cls: stats["correct"] / stats["total"] * 100 for cls, stats in sorted(per_class.items())
+        },
+        "decidedBy": dict(Counter(outcome["decidedBy"] for outcome in outcomes)),
+    }
+
+
+def cascade_report(data_path="../dataset_sample/val", save_report=True):
+    """
+    Compare default and cascade pipeline modes on a labeled image folder.
+
+    Args:
+        data_path (str): Folder with one subfolder per DLEF class
+        save_report (bool): Write cascade_report.json
+
+    Returns:
+        dict: Skip rates, accuracy of both modes and the accuracy cost
+    """
+    print("=" * 70)
+    print("📊 DLEF - DeepLens Engine for Focus")
+    print("   Cascade Mode Report")
+    print("=" * 70)
+    print(f"\n⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"📁 Data: {data_path}")
+    print(f"🎚️  Cascade threshold: {config.CASCADE_CONFIDENCE:.2f} | Skippable: {sorted(config.CASCADE_SKIPPABLE)}")
+
+    if not os.path.exists(data_path):
+        raise FileNotFoundError(f"❌ Data not found: {data_path}")
+
+    samples = [(cls, img, load_frame(img)) for cls, img in iter_labeled_images(data_path)]
+    print(f"🖼️  Images: {len(samples)}")
+
+    full_outcomes, full_seconds = run_mode(samples, cascade=False)
+    cascade_outcomes, cascade_seconds = run_mode(samples, cascade=True)
+
+    full = summarize(samples, full_outcomes)
+    cascaded = summarize(samples, cascade_outcomes)
+    skipped = Counter(name for outcome in cascade_outcomes for name in outcome["skipped"])
+    total = len(samples)
+
+    disagreements = [
+        {
+            "image": img.name,
+            "trueClass": cls,
+            "full": response_label(a["response"]),
+            "cascade": response_label(b["response"]),
+        }
+        for (cls, img, _), a, b in zip(samples, full_outcomes, cascade_outcomes)
+        if a["response"]["focusLevel"] != b["response"]["focusLevel"]
+    ]
+
+    report = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "dataPath": str(data_path),
+        "images": total,
+        "cascadeConfidence": config.CASCADE_CONFIDENCE,
+        "skippable": sorted(config.CASCADE_SKIPPABLE),
+        "skipRate": {name: count / total for name, count in skipped.items()} if total else {},
+        "full": dict(full, seconds=full_seconds),
+        "cascade": dict(cascaded, seconds=cascade_seconds),
+        "accuracyCost": full["accuracy"] - cascaded["accuracy"],
+        "disagreements": disagreements,
+    }
+
+    print("\n" + "-" * 70)
+    print(f"{'Stage':<12} | {'Skipped':<8} | {'Skip rate'}")
+    print("-" * 70)
+    for name in sorted(config.CASCADE_SKIPPABLE):
+        print(f"{name:<12} | {skipped[name]:<8} | {skipped[name] / total * 100 if total else 0:.1f}%")
+    print("-" * 70)
+    print(f"   🎯 Full pipeline accuracy:  {full['accuracy']:.2f}%  ({full_seconds:.2f}s)")
+    print(f"   🎯 Cascade accuracy:        {cascaded['accuracy']:.2f}%  ({cascade_seconds:.2f}s)")
+    print(f"   📉 Accuracy cost:           {report['accuracyCost']:.2f} pts")
+    print(f"   ↔️  Disagreements:           {len(disagreements)}")
+
+    if save_report:
+        report_path = "cascade_report.json"
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to: {report_path}")
+
+    print(f"\n⏰ Finished: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return report
+
+
+def main():
+    """Main entry point."""
+
+    # === CONFIGURATION ===
+    CONFIG = {
+        "data_path": "../dataset_sample/val",   # Labeled images (class subfolders)
+        "save_report": True,                     # Save cascade_report.json
+    }
+
+    try:
+        cascade_report(**CONFIG)
+    except FileNotFoundError as e:
+        print(f"\n❌ Error: {e}")
+        print("   Please check your data path.")
+
+
+if __name__ == "__main__":
+    main()
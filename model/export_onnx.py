@@ -0,0 +1,226 @@
+"""
+================================================================================
+DLEF ONNX Export Script
+DeepLens Engine for Focus - PyTorch vs. ONNX Runtime Parity & Latency
+
+Author: Nafis Aslam
+Project: DeepWork AI
+Institution: Universiti Sains Malaysia
+
+Description:
+    Exports the trained YOLOv11n-cls model (best.pt) to ONNX with a dynamic
+    batch axis, then serves both artifacts through the backend's L1 inference
+    backends (backend/inference_backends.py) and compares them:
+
+    - Parity: top-1 agreement and accuracy of both backends on the labeled
+      validation images, plus the largest top-1 confidence difference
+    - Latency: per-call latency (p50/p95) and throughput at batch 1 and at
+      the micro-batcher's maximum batch size
+
+    The backend serves the exported model with DLEF_CLASSIFIER_BACKEND=onnx.
+
+Usage:
+    python export_onnx.py
+
+Output:
+    - File: ../backend/best.onnx (next to best.pt)
+    - Console: Parity summary and latency table
+    - File: onnx_report.json (saved in current directory)
+================================================================================
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import config  # noqa: E402
+from frame_ingest import IMAGE_SUFFIXES, decode_frame  # noqa: E402
+from inference_backends import OnnxClassifier, TorchClassifier  # noqa: E402
+
+
+def export_onnx(model_path, img_size=224, opset=None):
+    """Export best.pt to ONNX next to the weights; returns the .onnx path."""
+    from ultralytics import YOLO
+
+    print("\n📦 Exporting to ONNX...")
+    model = YOLO(model_path)
+    kwargs = {"format": "onnx", "imgsz": img_size, "dynamic": True, "simplify": True}
+    if opset is not None:
+        kwargs["opset"] = opset
+    return model.export(**kwargs)
+
+
+def load_labeled_frames(data_path):
+    """Decode every labeled image under class subfolders: [(class_name, frame)]."""
+    samples = []
+    for class_folder in sorted(Path(data_path).iterdir()):
+        if not class_folder.is_dir() or class_folder.name.startswith('.'):
+            continue
+        for img_file in sorted(class_folder.glob("*")):
+            if img_file.suffix.lower() in IMAGE_SUFFIXES:
+                with open(img_file, "rb") as f:
+                    samples.append((class_folder.name, decode_frame(f.read())))
+    return samples
+
+
+def check_parity(torch_clf, onnx_clf, samples):
+    """Top-1 agreement and accuracy of both backends on the same frames."""
+    frames = [frame for _, frame in samples]
+    torch_preds = [torch_clf.predict([frame])[0] for frame in frames]
+    onnx_preds = [onnx_clf.predict([frame])[0] for frame in frames]
+
+    total = len(samples)
+    agree = sum(t[0] == o[0] for t, o in zip(torch_preds, onnx_preds))
+    torch_correct = sum(p[0] == cls for (cls, _), p in zip(samples, torch_preds))
+    onnx_correct = sum(p[0] == cls for (cls, _), p in zip(samples, onnx_preds))
+    conf_diff = max(
+        (abs(t[1] - o[1]) for t, o in zip(torch_preds, onnx_preds) if t[0] == o[0]),
+        default=0.0,
+    )
+    return {
+        "images": total,
+        "top1Agreement": agree / total * 100 if total else 0.0,
+        "torchAccuracy": torch_correct / total * 100 if total else 0.0,
+        "onnxAccuracy": onnx_correct / total * 100 if total else 0.0,
+        "maxConfidenceDiff": conf_diff,
+    }
+
+
+def benchmark(classifier, frames, batch_size, repeats):
+    """Latency per predict() call and throughput in frames/s."""
+    if not frames:
+        raise ValueError("No frames to benchmark")
+    batch_size = min(batch_size, len(frames))  # Small data sets still fill one batch
+    batches = [frames[i:i + batch_size] for i in range(0, len(frames) - batch_size + 1, batch_size)]
+    classifier.predict(batches[0])  # Warm-up
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for batch in batches:
+            t0 = time.perf_counter()
+            classifier.predict(batch)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+    return {
+        "batchSize": batch_size,
+        "p50Ms": float(np.percentile(latencies, 50)),
+        "p95Ms": float(np.percentile(latencies, 95)),
+        "framesPerSecond": len(latencies) * batch_size / elapsed,
+    }
+
+
+def export_and_compare(
+    model_path="../backend/best.pt",
+    data_path="../dataset_sample/val",
+    img_size=224,
+    repeats=3,
+    save_report=True
+):
+    """
+    Export best.pt to ONNX and compare it with the PyTorch backend.
+
+    Args:
+        model_path (str): Path to trained model weights (.pt file)
+        data_path (str): Labeled images (class subfolders) for parity/latency
+        img_size (int): Export input size (square)
+        repeats (int): Passes over the images per latency measurement
+        save_report (bool): Write onnx_report.json
+
+    Returns:
+        dict: Parity and latency results
+    """
+    print("=" * 70)
+    print("📊 DLEF - DeepLens Engine for Focus")
+    print("   ONNX Export, Parity & Latency")
+    print("=" * 70)
+    print(f"\n⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🧠 Model: {model_path}")
+    print(f"📁 Data: {data_path}")
+
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"❌ Model not found: {model_path}")
+    if not os.path.exists(data_path):
+        raise FileNotFoundError(f"❌ Data not found: {data_path}")
+
+    onnx_path = export_onnx(model_path, img_size)
+    print(f"✅ Exported: {onnx_path} ({os.path.getsize(onnx_path) / 1e6:.1f} MB)")
+
+    torch_clf = TorchClassifier(model_path)
+    onnx_clf = OnnxClassifier(onnx_path)
+    samples = load_labeled_frames(data_path)
+    print(f"🖼️  Images: {len(samples)}")
+
+    # Parity
+    parity = check_parity(torch_clf, onnx_clf, samples)
+    print("\n" + "-" * 70)
+    print("🔍 PARITY")
+    print("-" * 70)
+    print(f"   Top-1 agreement:       {parity['top1Agreement']:.2f}%")
+    print(f"   PyTorch accuracy:      {parity['torchAccuracy']:.2f}%")
+    print(f"   ONNX Runtime accuracy: {parity['onnxAccuracy']:.2f}%")
+    print(f"   Max confidence diff:   {parity['maxConfidenceDiff']:.4f}")
+
+    # Latency
+    frames = [frame for _, frame in samples]
+    latency = {"torch": [], "onnx": []}
+    for batch_size in sorted({1, min(config.CLASSIFIER_MAX_BATCH, len(frames))}):
+        latency["torch"].append(benchmark(torch_clf, frames, batch_size, repeats))
+        latency["onnx"].append(benchmark(onnx_clf, frames, batch_size, repeats))
+
+    print("\n" + "-" * 70)
+    print(f"{'Backend':<10} | {'Batch':<6} | {'p50 (ms)':<10} | {'p95 (ms)':<10} | {'Frames/s'}")
+    print("-" * 70)
+    for backend, rows in latency.items():
+        for row in rows:
+            print(f"{backend:<10} | {row['batchSize']:<6} | {row['p50Ms']:<10.2f} | {row['p95Ms']:<10.2f} | {row['framesPerSecond']:.1f}")
+    print("-" * 70)
+
+    report = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "modelPath": str(model_path),
+        "onnxPath": str(onnx_path),
+        "onnxBytes": os.path.getsize(onnx_path),
+        "dataPath": str(data_path),
+        "parity": parity,
+        "latency": latency,
+    }
+
+    if save_report:
+        report_path = "onnx_report.json"
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to: {report_path}")
+
+    print(f"\n⏰ Finished: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return report
+
+
+def main():
+    """Main entry point."""
+
+    # === CONFIGURATION ===
+    CONFIG = {
+        "model_path": "../backend/best.pt",     # Path to trained model
+        "data_path": "../dataset_sample/val",   # Labeled images (class subfolders)
+        "img_size": 224,                         # Export input size
+        "repeats": 3,                            # Latency passes over the images
+        "save_report": True,                     # Save onnx_report.json
+    }
+
+    try:
+        export_and_compare(**CONFIG)
+    except FileNotFoundError as e:
+        print(f"\n❌ Error: {e}")
+        print("   Please check your file paths.")
+
+
+if __name__ == "__main__":
+    main()
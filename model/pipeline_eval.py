@@ -0,0 +1,309 @@
+"""
+================================================================================
+DLEF Full-Pipeline Evaluation Script
+DeepLens Engine for Focus - L2 + L1 Decision Accuracy and Cost
+
+Author: Nafis Aslam
+Project: DeepWork AI
+Institution: Universiti Sains Malaysia
+
+Description:
+    test.py scores the YOLOv11n-cls classifier alone. In production the
+    answer of /deepwork_focus is the highest-priority decision of three
+    layers - L2a presence, L2b phone, then L1 - so the L2 validators can
+    override the classifier. This script runs that complete decision over
+    labeled folders and reports:
+
+    - Accuracy per class of the final decision vs. L1 alone
+    - Per-layer override counts: how often presence/phone replaced the L1
+      answer, and whether that fixed or broke the prediction
+    - Per-stage cost (decode, presence, phone, classifier) in ms
+
+    Stages run in the order production uses: presence and L1 on every
+    frame (so the L1 answer is known even when an L2 validator decides),
+    the stateful phone check only when presence has not decided, exactly as
+    pipeline.evaluate_frame defers it. Phone stage cost is therefore over
+    the frames that reach it. Images are
+    sharded across worker processes; each shard is a run of consecutive
+    images from one class folder with its own FocusSession, and each worker
+    loads its own models, so no state is shared between shards.
+
+    Pipeline responses are mapped back to DLEF classes via focusLevel (see
+    cascade_report.py); Drowsy and LookingAway share one response.
+
+Usage:
+    python pipeline_eval.py
+
+Output:
+    - Console: Accuracy, override and stage cost tables
+    - File: pipeline_eval.json (saved in current directory)
+================================================================================
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from cascade_report import iter_labeled_images, response_label, true_label  # noqa: E402
+
+
+STAGES = ("decode", "presence", "phone", "classifier")
+LAYERS = ("presence", "phone", "classifier")  # Decision priority
+
+
+def _init_worker(threads):
+    """
+    Worker start-up: limit threads so processes do not oversubscribe cores,
+    and load the models so that load time is not counted as stage cost.
+    """
+    import cv2
+    cv2.setNumThreads(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    import model_registry
+    model_registry.warm_up(["classifier", "phone_detector", "hands"])
+
+
+def evaluate_shard(shard):
+    """
+    Worker: run the full decision over one shard with a fresh session.
+
+    Args:
+        shard: (class_name, [image paths]) - consecutive frames of one folder
+
+    Returns:
+        list: One record per image
+    """
+    from frame_context import FrameContext
+    from frame_ingest import decode_frame
+    from pipeline import classify_batch, phone_stage, presence_stage
+    from responses import response_for_class
+    from session_store import FocusSession
+
+    class_name, paths = shard
+    session = FocusSession(f"eval-{class_name}")
+    records = []
+    for path in paths:
+        timings = {}
+
+        t0 = time.perf_counter()
+        with open(path, "rb") as f:
+            frame = FrameContext(decode_frame(f.read()))
+        timings["decode"] = time.perf_counter() - t0
+
+        decisions = {}
+        t0 = time.perf_counter()
+        decisions["presence"] = presence_stage(frame, session)
+        timings["presence"] = time.perf_counter() - t0
+
+        # Phone votes and the Kalman track only see frames presence passed on
+        decisions["phone"] = None
+        if decisions["presence"] is None:
+            t0 = time.perf_counter()
+            decisions["phone"] = phone_stage(frame, session)
+            timings["phone"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        l1_class, l1_conf = classify_batch([frame.bgr])[0]
+        decisions["classifier"] = response_for_class(l1_class, l1_conf)
+        timings["classifier"] = time.perf_counter() - t0
+
+        decided_by = next(name for name in LAYERS if decisions[name] is not None)
+        records.append({
+            "image": str(path),
+            "trueClass": true_label(class_name),
+            "l1Class": l1_class,
+            "l1Label": response_label(decisions["classifier"]),
+            "finalLabel": response_label(decisions[decided_by]),
+            "decidedBy": decided_by,
+            "timingsMs": {name: seconds * 1000 for name, seconds in timings.items()},
+        })
+    return records
+
+
+def make_shards(data_path, shard_size):
+    """Split each class folder into runs of at most shard_size consecutive images."""
+    by_class = defaultdict(list)
+    for class_name, img_file in iter_labeled_images(data_path):
+        by_class[class_name].append(img_file)
+    return [
+        (class_name, paths[i:i + shard_size])
+        for class_name, paths in sorted(by_class.items())
+        for i in range(0, len(paths), shard_size)
+    ]
+
+
+def summarize(records):
+    """Accuracy, overrides and stage cost from per-image records."""
+    per_class = defaultdict(lambda: {"total": 0, "final": 0, "l1": 0})
+    overrides = {name: Counter() for name in LAYERS[:-1]}
+    for r in records:
+        stats = per_class[r["trueClass"]]
+        stats["total"] += 1
+        stats["final"] += r["finalLabel"] == r["trueClass"]
+        stats["l1"] += r["l1Label"] == r["trueClass"]
+        if r["decidedBy"] != "classifier":
+            counter = overrides[r["decidedBy"]]
+            counter["decided"] += 1
+            if r["finalLabel"] != r["l1Label"]:
+                counter["overrides"] += 1
+                if r["finalLabel"] == r["trueClass"]:
+                    counter["fixed"] += 1
+                elif r["l1Label"] == r["trueClass"]:
+                    counter["broke"] += 1
+
+    total = len(records)
+    stage_cost = {}
+    for stage in STAGES:
+        values = [r["timingsMs"][stage] for r in records if stage in r["timingsMs"]]
+        stage_cost[stage] = {
+            "frames": len(values),
+            "meanMs": float(np.mean(values)) if values else 0.0,
+            "p50Ms": float(np.percentile(values, 50)) if values else 0.0,
+            "p95Ms": float(np.percentile(values, 95)) if values else 0.0,
+        }
+    return {
+        "images": total,
+        "accuracy": sum(s["final"] for s in per_class.values()) / total * 100 if total else 0.0,
+        "l1Accuracy": sum(s["l1"] for s in per_class.values()) / total * 100 if total else 0.0,
+        "perClass": {
+            cls: {
+                "total": s["total"],
+                "accuracy": s["final"] / s["total"] * 100,
+                "l1Accuracy": s["l1"] / s["total"] * 100,
+            }
+            for cls, s in sorted(per_class.items())
+        },
+        "decidedBy": dict(Counter(r["decidedBy"] for r in records)),
+        "overrides": {name: dict(counter) for name, counter in overrides.items()},
+        "stageCost": stage_cost,
+    }
+
+
+def evaluate_pipeline(
+    data_path="../dataset_sample/val",
+    workers=2,
+    shard_size=16,
+    threads_per_worker=1,
+    save_report=True
+):
+    """
+    Score the complete L2 + L1 decision on a labeled image folder.
+
+    Args:
+        data_path (str): Folder with one subfolder per DLEF class
+        workers (int): Worker processes (each loads its own models)
+        shard_size (int): Consecutive images per session
+        threads_per_worker (int): OpenCV/PyTorch threads per worker
+        save_report (bool): Write pipeline_eval.json
+
+    Returns:
+        dict: Accuracy, override counts and stage cost
+    """
+    print("=" * 70)
+    print("📊 DLEF - DeepLens Engine for Focus")
+    print("   Full-Pipeline Evaluation")
+    print("=" * 70)
+    print(f"\n⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"📁 Data: {data_path}")
+    print(f"⚙️  Workers: {workers} | Shard size: {shard_size}")
+
+    if not os.path.exists(data_path):
+        raise FileNotFoundError(f"❌ Data not found: {data_path}")
+
+    shards = make_shards(data_path, shard_size)
+    print(f"🖼️  Images: {sum(len(paths) for _, paths in shards)} in {len(shards)} shards")
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(threads_per_worker,),
+    ) as pool:
+        records = [record for shard in pool.map(evaluate_shard, shards) for record in shard]
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(records)
+
+    print("\n" + "-" * 70)
+    print(f"{'Class':<20} | {'Total':<6} | {'L1 only':<9} | {'Pipeline'}")
+    print("-" * 70)
+    for cls, stats in summary["perClass"].items():
+        l1_accuracy = f"{stats['l1Accuracy']:.2f}%"
+        print(f"{cls:<20} | {stats['total']:<6} | {l1_accuracy:<9} | {stats['accuracy']:.2f}%")
+    print("-" * 70)
+    print(f"   🎯 L1 only accuracy:  {summary['l1Accuracy']:.2f}%")
+    print(f"   🎯 Pipeline accuracy: {summary['accuracy']:.2f}%")
+
+    print("\n" + "-" * 70)
+    print(f"{'Layer':<10} | {'Decided':<8} | {'Overrode L1':<12} | {'Fixed':<6} | {'Broke'}")
+    print("-" * 70)
+    for name, counter in summary["overrides"].items():
+        print(f"{name:<10} | {counter.get('decided', 0):<8} | {counter.get('overrides', 0):<12} | "
+              f"{counter.get('fixed', 0):<6} | {counter.get('broke', 0)}")
+
+    print("\n" + "-" * 70)
+    print(f"{'Stage':<12} | {'Mean (ms)':<10} | {'p50 (ms)':<10} | {'p95 (ms)'}")
+    print("-" * 70)
+    for stage, cost in summary["stageCost"].items():
+        print(f"{stage:<12} | {cost['meanMs']:<10.2f} | {cost['p50Ms']:<10.2f} | {cost['p95Ms']:.2f}")
+    print("-" * 70)
+    print(f"   ⚡ {len(records) / elapsed:.1f} images/s with {workers} workers ({elapsed:.1f}s)")
+
+    report = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "dataPath": str(data_path),
+        "workers": workers,
+        "shardSize": shard_size,
+        "seconds": elapsed,
+        **summary,
+        "records": records,
+    }
+
+    if save_report:
+        report_path = "pipeline_eval.json"
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to: {report_path}")
+
+    print(f"\n⏰ Finished: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return report
+
+
+def main():
+    """Main entry point."""
+
+    # === CONFIGURATION ===
+    CONFIG = {
+        "data_path": "../dataset_sample/val",   # Labeled images (class subfolders)
+        "workers": 2,                            # Worker processes
+        "shard_size": 16,                        # Consecutive images per session
+        "threads_per_worker": 1,                 # OpenCV/PyTorch threads per worker
+        "save_report": True,                     # Save pipeline_eval.json
+    }
+
+    try:
+        evaluate_pipeline(**CONFIG)
+    except FileNotFoundError as e:
+        print(f"\n❌ Error: {e}")
+        print("   Please check your data path.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+================================================================================
+DLEF Quantization Script
+DeepLens Engine for Focus - INT8 Post-Training Quantization
+
+Author: Nafis Aslam
+Project: DeepWork AI
+Institution: Universiti Sains Malaysia
+
+Description:
+    Produces an INT8 version of the YOLOv11n-cls classifier with ONNX Runtime
+    static post-training quantization:
+
+    1. Export best.pt to ONNX (FP32) unless best.onnx is newer than best.pt
+    2. Calibrate activation ranges on images from dataset_sample/train,
+       preprocessed exactly as the ONNX backend does at inference time
+    3. Quantize weights (per channel) and activations to INT8 (QDQ format)
+    4. Evaluate FP32 and INT8 with test.py (same per-class metrics)
+    5. Accept the INT8 artifact only if the accuracy drop is within budget
+    6. Report latency, model size and process RSS of both artifacts
+
+    A rejected artifact is deleted so it cannot be deployed by accident.
+    An accepted one is served with DLEF_CLASSIFIER_BACKEND=onnx and
+    DLEF_CLASSIFIER_ONNX_WEIGHTS=<path to best.int8.onnx>.
+
+Usage:
+    python quantize.py
+
+Output:
+    - File: ../backend/best.int8.onnx (if accepted)
+    - Console: test.py reports, accuracy gate, latency/size/RSS table
+    - File: quantize_report.json (saved in current directory)
+================================================================================
+"""
+
+import importlib.util
+import json
+import multiprocessing
+import os
+import queue as queue_module
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+MODEL_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = MODEL_DIR.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(MODEL_DIR))
+
+from frame_ingest import IMAGE_SUFFIXES, decode_frame  # noqa: E402
+from inference_backends import OnnxClassifier, preprocess  # noqa: E402
+from model_registry import current_rss_bytes  # noqa: E402
+
+from export_onnx import export_onnx, load_labeled_frames  # noqa: E402
+
+
+def _load_test_model():
+    """test_model from model/test.py, loaded by path (`import test` is the stdlib package)."""
+    spec = importlib.util.spec_from_file_location("dlef_model_test", MODEL_DIR / "test.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.test_model
+
+
+test_model = _load_test_model()
+
+
+def calibration_images(calib_path, per_class, seed=0):
+    """Pick up to per_class images from every class folder (deterministic)."""
+    rng = random.Random(seed)
+    images = []
+    for class_folder in sorted(Path(calib_path).iterdir()):
+        if not class_folder.is_dir() or class_folder.name.startswith('.'):
+            continue
+        files = [f for f in sorted(class_folder.glob("*")) if f.suffix.lower() in IMAGE_SUFFIXES]
+        rng.shuffle(files)
+        images.extend(files[:per_class])
+    return images
+
+
+def make_calibration_reader(images, input_name, img_size):
+    """CalibrationDataReader feeding one preprocessed image per call."""
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class DLEFCalibrationReader(CalibrationDataReader):
+        def __init__(self):
+            self._images = iter(images)
+
+        def get_next(self):
+            img_file = next(self._images, None)
+            if img_file is None:
+                return None
+            with open(img_file, "rb") as f:
+                frame = decode_frame(f.read())
+            return {input_name: preprocess([frame], img_size)}
+
+        def rewind(self):
+            self._images = iter(images)
+
+    return DLEFCalibrationReader()
+
+
+def quantize_int8(fp32_path, int8_path, images):
+    """Static INT8 quantization of an ONNX model calibrated on images."""
+    from onnxruntime.quantization import (
+        CalibrationMethod, QuantFormat, QuantType, quantize_static,
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    fp32 = OnnxClassifier(fp32_path)
+    prepared_path = str(int8_path) + ".prep.onnx"
+    quant_pre_process(str(fp32_path), prepared_path)
+    try:
+        quantize_static(
+            prepared_path,
+            str(int8_path),
+            make_calibration_reader(images, fp32.input_name, fp32.imgsz),
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            weight_type=QuantType.QInt8,
+            activation_type=QuantType.QUInt8,
+            calibrate_method=CalibrationMethod.MinMax,
+        )
+    finally:
+        os.remove(prepared_path)
+
+    # Carry the Ultralytics metadata (names, imgsz) over to the INT8 model
+    import onnx
+    source, target = onnx.load(str(fp32_path)), onnx.load(str(int8_path))
+    del target.metadata_props[:]
+    target.metadata_props.extend(source.metadata_props)
+    onnx.save(target, str(int8_path))
+
+
+def _measure_artifact(path, frames, repeats, queue):
+    """Child process: RSS growth from loading the model, then batch-1 latency."""
+    rss_before = current_rss_bytes()
+    classifier = OnnxClassifier(path)
+    classifier.predict(frames[:1])  # Warm-up (allocates the arena)
+    rss_after = current_rss_bytes()
+
+    latencies = []
+    for _ in range(repeats):
+        for frame in frames:
+            t0 = time.perf_counter()
+            classifier.predict([frame])
+            latencies.append((time.perf_counter() - t0) * 1000)
+    queue.put({
+        "bytes": os.path.getsize(path),
+        "rssDeltaBytes": rss_after - rss_before,
+        "p50Ms": float(np.percentile(latencies, 50)),
+        "p95Ms": float(np.percentile(latencies, 95)),
+        "framesPerSecond": 1000 / float(np.mean(latencies)),
+    })
+
+
+def measure_artifact(path, frames, repeats, timeout=600):
+    """
+    Load and time one artifact in a fresh process so RSS is not shared.
+
+    Raises:
+        RuntimeError: If the child dies without reporting (e.g. a crash in
+            ONNX Runtime) or runs past `timeout` seconds
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure_artifact, args=(str(path), frames, repeats, queue))
+    process.start()
+    deadline = time.monotonic() + timeout if timeout else None
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=1.0)
+        except queue_module.Empty:
+            if not process.is_alive():
+                # The result may have been flushed just before the exit
+                try:
+                    result = queue.get(timeout=1.0)
+                except queue_module.Empty:
+                    process.join()
+                    raise RuntimeError(
+                        f"Measuring {path}: process exited with code {process.exitcode} without a result"
+                    ) from None
+            elif deadline and time.monotonic() > deadline:
+                process.terminate()
+                process.join()
+                raise RuntimeError(f"Measuring {path}: timed out after {timeout:.0f} s")
+    process.join()
+    return result
+
+
+def quantize_model(
+    model_path="../backend/best.pt",
+    calib_path="../dataset_sample/train",
+    test_path="../dataset_sample/val",
+    calib_per_class=20,
+    max_accuracy_drop=1.0,
+    repeats=3,
+    save_report=True
+):
+    """
+    Quantize the DLEF classifier to INT8 and gate it on accuracy.
+
+    Args:
+        model_path (str): Path to trained model weights (.pt file)
+        calib_path (str): Calibration images (class subfolders)
+        test_path (str): Validation images (class subfolders)
+        calib_per_class (int): Calibration images drawn per class
+        max_accuracy_drop (float): Largest accepted drop in accuracy (points)
+        repeats (int): Latency passes over the validation images
+        save_report (bool): Write quantize_report.json
+
+    Returns:
+        dict: Accuracy of both artifacts, gate decision, latency/size/RSS
+    """
+    print("=" * 70)
+    print("🧮 DLEF - DeepLens Engine for Focus")
+    print("   INT8 Post-Training Quantization")
+    print("=" * 70)
+    print(f"\n⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🧠 Model: {model_path}")
+    print(f"📁 Calibration data: {calib_path}")
+    print(f"📁 Test data: {test_path}")
+    print(f"🎚️  Accuracy budget: {max_accuracy_drop:.2f} pts")
+
+    for path, what in ((model_path, "Model"), (calib_path, "Calibration data"), (test_path, "Test data")):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"❌ {what} not found: {path}")
+
+    # Re-export when best.pt changed since best.onnx was written, so a stale
+    # export can never be quantized and gated in place of the current model
+    fp32_path = Path(model_path).with_suffix(".onnx")
+    if not fp32_path.exists() or fp32_path.stat().st_mtime < Path(model_path).stat().st_mtime:
+        fp32_path = Path(export_onnx(model_path))
+    int8_path = fp32_path.with_name(fp32_path.stem + ".int8.onnx")
+
+    # Calibrate + quantize
+    images = calibration_images(calib_path, calib_per_class)
+    print(f"\n📦 Quantizing with {len(images)} calibration images...")
+    started = time.perf_counter()
+    quantize_int8(fp32_path, int8_path, images)
+    print(f"✅ Quantized in {time.perf_counter() - started:.1f}s: {int8_path}")
+
+    # Accuracy (same per-class report as test.py)
+    fp32_results = test_model(model_path=str(fp32_path), test_path=test_path, save_report=False)
+    int8_results = test_model(model_path=str(int8_path), test_path=test_path, save_report=False)
+    drop = fp32_results["accuracy"] - int8_results["accuracy"]
+    accepted = drop <= max_accuracy_drop
+
+    # Latency, size, RSS
+    frames = [frame for _, frame in load_labeled_frames(test_path)]
+    fp32_perf = measure_artifact(fp32_path, frames, repeats)
+    int8_perf = measure_artifact(int8_path, frames, repeats)
+
+    print("\n" + "=" * 70)
+    print("📌 QUANTIZATION SUMMARY")
+    print("=" * 70)
+    print(f"{'Artifact':<10} | {'Accuracy':<9} | {'Size (MB)':<10} | {'RSS (MB)':<9} | {'p50 (ms)':<9} | {'Frames/s'}")
+    print("-" * 70)
+    for name, results, perf in (("FP32", fp32_results, fp32_perf), ("INT8", int8_results, int8_perf)):
+        print(f"{name:<10} | {results['accuracy']:<8.2f}% | {perf['bytes'] / 1e6:<10.2f} | "
+              f"{perf['rssDeltaBytes'] / 1e6:<9.1f} | {perf['p50Ms']:<9.2f} | {perf['framesPerSecond']:.1f}")
+    print("-" * 70)
+    print(f"   📉 Accuracy drop: {drop:.2f} pts (budget {max_accuracy_drop:.2f})")
+    print(f"   📦 Size:          {int8_perf['bytes'] / fp32_perf['bytes']:.2f}x of FP32")
+    print(f"   ⚡ p50 latency:   {fp32_perf['p50Ms'] / int8_perf['p50Ms']:.2f}x speed-up")
+
+    if accepted:
+        print(f"\n✅ INT8 artifact accepted: {int8_path}")
+    else:
+        os.remove(int8_path)
+        print("\n❌ INT8 artifact rejected (accuracy drop over budget) and removed")
+
+    report = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "modelPath": str(model_path),
+        "calibPath": str(calib_path),
+        "calibImages": len(images),
+        "testPath": str(test_path),
+        "maxAccuracyDrop": max_accuracy_drop,
+        "accuracyDrop": drop,
+        "accepted": accepted,
+        "int8Path": str(int8_path) if accepted else None,
+        "fp32": dict(fp32_perf, accuracy=fp32_results["accuracy"]),
+        "int8": dict(int8_perf, accuracy=int8_results["accuracy"]),
+    }
+
+    if save_report:
+        report_path = "quantize_report.json"
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to: {report_path}")
+
+    print(f"\n⏰ Finished: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return report
+
+
+def main():
+    """Main entry point."""
+
+    # === CONFIGURATION ===
+    CONFIG = {
+        "model_path": "../backend/best.pt",         # Path to trained model
+        "calib_path": "../dataset_sample/train",    # Calibration images
+        "test_path": "../dataset_sample/val",       # Validation images
+        "calib_per_class": 20,                       # Calibration images per class
+        "max_accuracy_drop": 1.0,                    # Accuracy budget (points)
+        "repeats": 3,                                # Latency passes
+        "save_report": True,                         # Save quantize_report.json
+    }
+
+    try:
+        report = quantize_model(**CONFIG)
+        if not report["accepted"]:
+            sys.exit(1)
+    except FileNotFoundError as e:
+        print(f"\n❌ Error: {e}")
+        print("   Please check your file paths.")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,37 +11,182 @@ Description:
     This script evaluates the trained YOLOv11n-cls model on the validation set
     and generates a detailed classification report.
 
+    Images are read and decoded by a background thread pool while the model
+    runs batched inference. Predictions are cached by image content hash plus
+    model hash (test_cache.json), so a re-run only processes new or changed
+    images; entries of images no longer in the evaluated folder are dropped.
+
 Usage:
     python test.py
 
 Output:
-    - Console: Classification report with per-class metrics
+    - Console: Classification report with per-class metrics and throughput
     - File: test_report.txt (saved in current directory)
+    - File: test_cache.json (prediction cache, saved in current directory)
 ================================================================================
 """
 
+import hashlib
+import json
 import os
+import sys
+import time
 import warnings
-from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
+import cv2
+import numpy as np
 from ultralytics import YOLO
 from sklearn.metrics import classification_report, confusion_matrix
 
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+CACHED = object()  # Marks a prediction-cache hit in the decode pipeline
+
+
+def load_model(model_path):
+    """
+    Load a classifier as a batch predictor.
+
+    .pt weights run through Ultralytics; .onnx artifacts (see export_onnx.py,
+    quantize.py) run through the backend's ONNX Runtime backend, with the
+    same preprocessing the server uses.
+
+    Returns:
+        tuple: (predict_batch(frames) -> [(label, confidence) or None],
+                {class_id: class_name})
+    """
+    if str(model_path).endswith(".onnx"):
+        sys.path.insert(0, str(BACKEND_DIR))
+        from inference_backends import OnnxClassifier
+
+        classifier = OnnxClassifier(str(model_path))
+        return classifier.predict, classifier.names
+
+    model = YOLO(model_path)
+
+    def predict_batch(frames):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results = model(frames, verbose=False)
+        return [
+            (model.names[r.probs.top1], float(r.probs.top1conf)) if r.probs is not None else None
+            for r in results
+        ]
+
+    return predict_batch, model.names
+
+
+def file_hash(path):
+    """Short SHA-256 of a file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def prefetch(fn, items, workers, depth):
+    """Yield fn(item) for every item in order, with at most `depth` calls in flight."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= depth:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def predict_all(predict_batch, model_hash, img_files, batch_size=16, workers=4, cache_path=None):
+    """
+    Predict every image, decoding in background threads and batching inference.
+
+    Args:
+        predict_batch: Batch predictor from load_model()
+        model_hash (str): Hash of the model file (part of the cache key)
+        img_files (list): Image paths, in report order
+        batch_size (int): Images per forward pass
+        workers (int): Decode threads
+        cache_path (str): Prediction cache file, or None to disable caching
+
+    Returns:
+        tuple: (predictions in input order, number served from cache);
+        an image that cannot be decoded gets a None prediction
+    """
+    cache = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as f:
+            cache = json.load(f)
+    content_hashes = set()
+
+    def load(img_file):
+        with open(img_file, "rb") as f:
+            data = f.read()
+        content_hash = hashlib.sha256(data).hexdigest()[:16]
+        content_hashes.add(content_hash)
+        key = f"{model_hash}:{content_hash}"
+        if key in cache:
+            return key, CACHED
+        # Same decode as Ultralytics' loader (cv2.imread), without a second read;
+        # None for an undecodable file
+        return key, cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    predictions = [None] * len(img_files)
+    cached = 0
+    batch_index, batch_frames, batch_keys = [], [], []
+
+    def flush():
+        for i, key, prediction in zip(batch_index, batch_keys, predict_batch(batch_frames)):
+            predictions[i] = prediction
+            cache[key] = list(prediction) if prediction is not None else None
+        batch_index.clear()
+        batch_frames.clear()
+        batch_keys.clear()
+
+    for i, (key, frame) in enumerate(prefetch(load, img_files, workers, depth=2 * batch_size)):
+        if frame is CACHED:
+            predictions[i] = tuple(cache[key]) if cache[key] is not None else None
+            cached += 1
+            continue
+        if frame is None:
+            # Not cached, so a decoder that can read it is retried next run
+            predictions[i] = None
+            continue
+        batch_index.append(i)
+        batch_frames.append(frame)
+        batch_keys.append(key)
+        if len(batch_frames) == batch_size:
+            flush()
+    if batch_frames:
+        flush()
+
+    if cache_path:
+        # Keep only images that are still in the evaluated folder (any model)
+        cache = {key: value for key, value in cache.items() if key.split(":", 1)[1] in content_hashes}
+        with open(cache_path, "w") as f:
+            json.dump(cache, f)
+    return predictions, cached
+
 
 def test_model(
     model_path="../backend/best.pt",
     test_path="../dataset/val",
-    save_report=True
+    save_report=True,
+    batch_size=16,
+    workers=4,
+    cache_path="test_cache.json"
 ):
     """
     Evaluate trained DLEF model on validation/test set.
     
     Args:
-        model_path (str): Path to trained model weights (.pt file)
+        model_path (str): Path to trained model weights (.pt or .onnx file)
         test_path (str): Path to validation data with class subfolders
         save_report (bool): Whether to save report to file
+        batch_size (int): Images per forward pass
+        workers (int): Background decode threads
+        cache_path (str): Prediction cache file (None disables the cache)
     
     Returns:
         dict: Evaluation results including accuracy and per-class metrics
@@ -63,10 +208,10 @@ def test_model(
     
     # Load model
     print("\n📦 Loading model...")
-    model = YOLO(model_path)
+    predict_batch, names = load_model(model_path)
     
     # Get class names from model
-    class_names = list(model.names.values())
+    class_names = list(names.values())
     print(f"🏷️  Classes: {class_names}")
     
     # Initialize tracking
@@ -88,59 +233,60 @@ def test_model(
     )
     print(f"🖼️  Total test images: {total_images}")
     
+    # Collect images in report order
+    samples = [
+        (class_folder.name, img_file)
+        for class_folder in sorted(test_base.iterdir())
+        if class_folder.is_dir() and not class_folder.name.startswith('.')
+        for img_file in sorted(class_folder.glob("*"))
+        if img_file.suffix.lower() in [".jpg", ".jpeg", ".png"]
+    ]
+    
+    # Batched inference with background decoding
+    started = time.perf_counter()
+    predictions, cached = predict_all(
+        predict_batch, file_hash(model_path), [img_file for _, img_file in samples],
+        batch_size=batch_size, workers=workers, cache_path=cache_path,
+    )
+    elapsed = time.perf_counter() - started
+    throughput = len(samples) / elapsed if elapsed else 0.0
+    
     # Prediction loop
     print("\n" + "-" * 70)
     print(f"{'Image':<45} | {'True':<12} | {'Pred':<12} | {'Conf':<6} | {'✓/✗'}")
     print("-" * 70)
     
     processed = 0
-    for class_folder in sorted(test_base.iterdir()):
-        if not class_folder.is_dir() or class_folder.name.startswith('.'):
-            continue
-        
-        true_label = class_folder.name
+    for (true_label, img_file), prediction in zip(samples, predictions):
+        processed += 1
+        classwise_stats[true_label]["total"] += 1
         
-        for img_file in sorted(class_folder.glob("*")):
-            if img_file.suffix.lower() not in [".jpg", ".jpeg", ".png"]:
-                continue
+        if prediction is not None:
+            pred_label, confidence = prediction
             
-            processed += 1
-            classwise_stats[true_label]["total"] += 1
+            y_true.append(true_label)
+            y_pred.append(pred_label)
+            y_conf.append(confidence)
+            classwise_stats[true_label]["confidences"].append(confidence)
             
-            # Run inference
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                results = model(str(img_file), verbose=False)
-            
-            probs = results[0].probs
-            if probs is not None:
-                pred_class_id = probs.top1
-                confidence = float(probs.top1conf)
-                pred_label = model.names[pred_class_id]
-                
-                y_true.append(true_label)
-                y_pred.append(pred_label)
-                y_conf.append(confidence)
-                classwise_stats[true_label]["confidences"].append(confidence)
-                
-                # Check correctness
-                is_correct = pred_label.lower() == true_label.lower()
-                if is_correct:
-                    classwise_stats[true_label]["correct"] += 1
-                    status = "✅"
-                else:
-                    classwise_stats[true_label]["incorrect"] += 1
-                    status = "❌"
-                
-                # Print result (truncate long filenames)
-                fname = img_file.name[:42] + "..." if len(img_file.name) > 45 else img_file.name
-                print(f"{fname:<45} | {true_label:<12} | {pred_label:<12} | {confidence:.2f}  | {status}")
+            # Check correctness
+            is_correct = pred_label.lower() == true_label.lower()
+            if is_correct:
+                classwise_stats[true_label]["correct"] += 1
+                status = "✅"
             else:
-                y_true.append(true_label)
-                y_pred.append("None")
-                y_conf.append(0.0)
                 classwise_stats[true_label]["incorrect"] += 1
-                print(f"{img_file.name:<45} | {true_label:<12} | {'None':<12} | 0.00  | ❌")
+                status = "❌"
+            
+            # Print result (truncate long filenames)
+            fname = img_file.name[:42] + "..." if len(img_file.name) > 45 else img_file.name
+            print(f"{fname:<45} | {true_label:<12} | {pred_label:<12} | {confidence:.2f}  | {status}")
+        else:
+            y_true.append(true_label)
+            y_pred.append("None")
+            y_conf.append(0.0)
+            classwise_stats[true_label]["incorrect"] += 1
+            print(f"{img_file.name:<45} | {true_label:<12} | {'None':<12} | 0.00  | ❌")
     
     print("-" * 70)
     
@@ -160,6 +306,7 @@ def test_model(
     print(f"   🖼️  Total Images Tested:   {total}")
     print(f"   🎯 Overall Accuracy:      {accuracy:.2f}%")
     print(f"   📊 Average Confidence:    {avg_confidence:.2f}")
+    print(f"   ⚡ Throughput:            {throughput:.1f} images/s ({cached} cached, {elapsed:.2f}s)")
     
     # Class-wise accuracy table
     print("\n" + "-" * 70)
@@ -251,6 +398,8 @@ def test_model(
         "correct": correct,
         "incorrect": incorrect,
         "avg_confidence": avg_confidence,
+        "throughput": throughput,
+        "cached": cached,
         "classwise_stats": dict(classwise_stats),
         "y_true": y_true,
         "y_pred": y_pred,